@@ -0,0 +1,205 @@
+"""JujuSpell daemon keeping connections to controllers between CLI invocations.
+
+The daemon owns the connect manager, so ssh tunnels and logged-in controllers are
+reused by all commands sent to it. The commands are sent over Unix socket, the
+request and each result are single lines of JSON.
+
+Request:
+    {"command": "juju_spell.commands.status.StatusCommand",
+     "controllers": ["<uuid>", ...], "args": {<parsed CLI arguments>}}
+
+Response:
+    {"result": {<result of controller>}}
+    ...
+    {"error": "<error message>"}  # only if the request failed
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Optional, Type
+
+from juju_spell.assignment.runner import RESULT_TYPE, stream
+from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.config import Config
+from juju_spell.connections import connect_manager
+from juju_spell.exceptions import JujuSpellError
+from juju_spell.serializer import dumps
+from juju_spell.settings import DAEMON_SOCKET_PATH, DEFAULT_DAEMON_READ_LIMIT
+
+logger = logging.getLogger(__name__)
+
+COMMANDS_PACKAGE = "juju_spell.commands."
+
+
+def _dump_message(
+    message: Dict[str, Any], drop_empty: bool = False, drop_unknown: bool = False
+) -> bytes:
+    """Dump message to single line of JSON."""
+    return dumps(message, True, drop_empty, drop_unknown).encode() + b"\n"
+
+
+def _get_command(path: str) -> Type[BaseJujuCommand]:
+    """Get Juju command class from its path."""
+    module_name, _, class_name = path.rpartition(".")
+    if not module_name.startswith(COMMANDS_PACKAGE):
+        raise JujuSpellError(f"command `{path}` is not JujuSpell command")
+
+    command = getattr(importlib.import_module(module_name), class_name, None)
+    if not isinstance(command, type) or not issubclass(command, BaseJujuCommand):
+        raise JujuSpellError(f"command `{path}` is not JujuSpell command")
+
+    return command
+
+
+def is_daemon_running(socket_path: Path = DAEMON_SOCKET_PATH) -> bool:
+    """Check if daemon is listening on socket."""
+    if not socket_path.exists():
+        return False
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as unix_socket:
+        try:
+            unix_socket.connect(str(socket_path))
+        except OSError:
+            return False
+
+    return True
+
+
+class Daemon:
+    """Daemon serving JujuSpell commands over Unix socket.
+
+    Example:
+    ```python
+    daemon = Daemon(config)
+    await daemon.serve()  # serve until cancelled or stopped
+    ```
+    """
+
+    def __init__(self, config: Config, socket_path: Path = DAEMON_SOCKET_PATH):
+        """Initialize daemon with config used to look up the controllers."""
+        self.config = config
+        self.socket_path = socket_path
+        self._stopped: Optional[asyncio.Event] = None
+
+    def _get_config(self, controllers_uuids: List[str]) -> Config:
+        """Get config only with requested controllers."""
+        controllers = {
+            str(controller.uuid): controller for controller in self.config.controllers
+        }
+        unknown = [uuid for uuid in controllers_uuids if uuid not in controllers]
+        if unknown:
+            raise JujuSpellError(
+                f"controllers {', '.join(unknown)} are not known to daemon, restart "
+                "the daemon to load the new config"
+            )
+
+        return Config(
+            controllers=[controllers[uuid] for uuid in controllers_uuids],
+            connection=self.config.connection,
+        )
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle single request."""
+        try:
+            request = json.loads(await reader.readline())
+            command = _get_command(request["command"])
+            config = self._get_config(request["controllers"])
+            parsed_args = argparse.Namespace(**request["args"])
+            logger.info("daemon running %s command", command.__name__)
+            results = stream(config, command(), parsed_args, clean=False)
+            try:
+                async for result in results:
+                    # NOTE: the fields are dropped here, since the client gets
+                    # only dicts without juju `Type` objects
+                    writer.write(
+                        _dump_message(
+                            {"result": result},
+                            getattr(parsed_args, "drop_empty", False),
+                            getattr(parsed_args, "drop_unknown", False),
+                        )
+                    )
+                    await writer.drain()
+            finally:
+                await results.aclose()  # cancel controllers if client disconnected
+        except ConnectionError:
+            logger.info("daemon client disconnected")
+        except Exception as error:
+            logger.exception("daemon request failed")
+            writer.write(_dump_message({"error": str(error)}))
+        finally:
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+                writer.close()
+
+    def stop(self) -> None:
+        """Stop serving requests."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def serve(self) -> None:
+        """Serve requests until daemon is stopped.
+
+        All connections are closed when daemon stops.
+        """
+        if is_daemon_running(self.socket_path):
+            raise JujuSpellError(f"daemon is already running on {self.socket_path}")
+
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()  # remove socket left by killed daemon
+
+        server = await asyncio.start_unix_server(
+            self._handle, str(self.socket_path), limit=DEFAULT_DAEMON_READ_LIMIT
+        )
+        os.chmod(self.socket_path, 0o600)
+        logger.info("daemon is listening on %s", self.socket_path)
+        self._stopped = asyncio.Event()
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            await connect_manager.clean()
+            with contextlib.suppress(FileNotFoundError):
+                self.socket_path.unlink()
+
+            logger.info("daemon was stopped")
+
+
+async def request(
+    config: Config,
+    command: Type[BaseJujuCommand],
+    parsed_args: argparse.Namespace,
+    socket_path: Path = DAEMON_SOCKET_PATH,
+) -> AsyncGenerator[RESULT_TYPE, None]:
+    """Run command by daemon and yield result of each controller.
+
+    The results are yielded as soon as the daemon sends them, so the order of
+    results depends on run_type and on the time spent on controllers.
+    """
+    reader, writer = await asyncio.open_unix_connection(
+        str(socket_path), limit=DEFAULT_DAEMON_READ_LIMIT
+    )
+    try:
+        message = {
+            "command": f"{command.__module__}.{command.__qualname__}",
+            "controllers": [str(controller.uuid) for controller in config.controllers],
+            "args": vars(parsed_args),
+        }
+        writer.write(_dump_message(message))
+        await writer.drain()
+        async for line in reader:
+            response = json.loads(line)
+            if "error" in response:
+                raise JujuSpellError(f"daemon failed with error: {response['error']}")
+
+            yield response["result"]
+    finally:
+        writer.close()
@@ -5,32 +5,239 @@ Provides different ways to run the Juju command:
     - Batch: 20 commands in 5 parallel
     - Parallel: 20 in parallel
     - Serial: 20 commands in 1 parallel
+
+Each way is implemented as an async generator yielding results as soon as the
+controller is done, so results can be collected (`run`) or streamed (`stream`).
 """
+import asyncio
 import logging
 from argparse import Namespace
-from dataclasses import asdict
-from typing import Any, Dict, List
+from dataclasses import asdict, replace
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from juju_spell.commands.base import BaseJujuCommand, Result
 from juju_spell.config import Config, Controller
 from juju_spell.connections import connect_manager, get_controller
+from juju_spell.exceptions import JujuSpellError
+from juju_spell.projection import compile_projection
+from juju_spell.settings import DEFAULT_BATCH_SIZE, DEFAULT_MAX_PARALLEL
+from juju_spell.timings import start_timings, timed
 
 logger = logging.getLogger(__name__)
 
 RESULT_TYPE = Dict[str, Dict[str, Any]]
 RESULTS_TYPE = List[RESULT_TYPE]
+INDEXED_RESULTS_TYPE = AsyncGenerator[Tuple[int, RESULT_TYPE], None]
+
 
+def get_result(
+    controller_config: Controller,
+    output: Result,
+    timings: Optional[Dict[str, float]] = None,
+) -> RESULT_TYPE:
+    """Get command result.
 
-def get_result(controller_config: Controller, output: Result) -> RESULT_TYPE:
-    """Get command result."""
-    return {
-        "context": {
-            "uuid": controller_config.uuid,
-            "name": controller_config.name,
-            "customer": controller_config.customer,
-        },
-        **asdict(output),
+    The timings of phases in seconds are added to context, if they were measured.
+    """
+    context = {
+        "uuid": controller_config.uuid,
+        "name": controller_config.name,
+        "customer": controller_config.customer,
     }
+    if timings is not None:
+        context["timings"] = timings
+
+    return {"context": context, **asdict(output)}
+
+
+def _start_timings(parsed_args: Namespace) -> Optional[Dict[str, float]]:
+    """Start timings of controller, if they were requested by `--timings`."""
+    if not getattr(parsed_args, "timings", False):
+        return None
+
+    return start_timings()
+
+
+def project(output: Result, parsed_args: Namespace) -> Result:
+    """Project output of command to fields selected by `--fields`.
+
+    The projection is applied as soon as the command returns, so only the selected
+    fields of output are kept until all controllers are done.
+    """
+    fields = getattr(parsed_args, "fields", None)
+    if not fields or output.output is None:
+        return output
+
+    return replace(output, output=compile_projection(fields)(output.output))
+
+
+async def _run_controller(
+    controller_config: Controller,
+    command: BaseJujuCommand,
+    parsed_args: Namespace,
+    port_range: range,
+) -> RESULT_TYPE:
+    """Run command on single controller.
+
+    Any failure, including failed connection to controller, is returned as
+    unsuccessful result, so it does not affect other controllers.
+    """
+    timings = _start_timings(parsed_args)
+    with timed("total"):
+        try:
+            controller = await get_controller(controller_config, port_range)
+        except Exception as error:
+            logger.exception("%s connection failed", controller_config.uuid)
+            output = Result(False, output=None, error=error)
+        else:
+            # NOTE: the kwargs must be copied, since parsed_args are shared between
+            # tasks
+            command_kwargs = {
+                **vars(parsed_args),
+                "controller_config": controller_config,
+            }
+            output = await command.run(controller=controller, **command_kwargs)
+            output = project(output, parsed_args)
+
+    return get_result(controller_config, output, timings)
+
+
+def _get_max_parallel(config: Config, parsed_args: Namespace) -> int:
+    """Get maximum number of controllers running at the same time."""
+    max_parallel = getattr(parsed_args, "max_parallel", None)
+    if max_parallel is None:
+        max_parallel = config.connection.get("max-parallel", DEFAULT_MAX_PARALLEL)
+
+    return max_parallel
+
+
+def _is_failure_ratio_exceeded(
+    completed: int, failed: int, max_failure_ratio: Optional[float]
+) -> bool:
+    """Check if ratio of failed controllers exceeded the limit."""
+    if max_failure_ratio is None or completed == 0:
+        return False
+
+    return failed / completed > max_failure_ratio
+
+
+async def _collect(results: INDEXED_RESULTS_TYPE, size: int) -> RESULTS_TYPE:
+    """Collect indexed results to list ordered by index."""
+    ordered_results: List[Optional[RESULT_TYPE]] = [None] * size
+    async for index, result in results:
+        ordered_results[index] = result
+
+    return ordered_results  # type: ignore
+
+
+async def _iter_serial(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> INDEXED_RESULTS_TYPE:
+    """Run controller target command serially and yield indexed results."""
+    port_range = config.connection.get("port-range")
+    for index, controller_config in enumerate(config.controllers):
+        timings = _start_timings(parsed_args)
+        with timed("total"):
+            controller = await get_controller(controller_config, port_range)
+            logger.debug("%s running in serial", controller.controller_uuid)
+            command_kwargs = {
+                **vars(parsed_args),
+                "controller_config": controller_config,
+            }
+            output = await command.run(controller=controller, **command_kwargs)
+            output = project(output, parsed_args)
+
+        yield index, get_result(controller_config, output, timings)
+
+
+async def _iter_parallel(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> INDEXED_RESULTS_TYPE:
+    """Run controller target command in parallel and yield indexed results."""
+    port_range = config.connection.get("port-range")
+    max_parallel = _get_max_parallel(config, parsed_args)
+    semaphore = asyncio.Semaphore(max_parallel)
+    logger.debug("running in parallel with limit %d", max_parallel)
+
+    async def _run_bounded(
+        index: int, controller_config: Controller
+    ) -> Tuple[int, RESULT_TYPE]:
+        async with semaphore:
+            logger.debug("%s running in parallel", controller_config.uuid)
+            result = await _run_controller(
+                controller_config, command, parsed_args, port_range
+            )
+            return index, result
+
+    tasks = [
+        asyncio.create_task(_run_bounded(index, controller_config))
+        for index, controller_config in enumerate(config.controllers)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _iter_batch(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> INDEXED_RESULTS_TYPE:
+    """Run controller target command in batches and yield indexed results."""
+    port_range = config.connection.get("port-range")
+    batch_size = getattr(parsed_args, "batch_size", None) or DEFAULT_BATCH_SIZE
+    max_failure_ratio = getattr(parsed_args, "max_failure_ratio", None)
+    logger.debug("running in batch with size %d", batch_size)
+
+    controllers = iter(enumerate(config.controllers))
+    pending: Dict[asyncio.Task, int] = {}
+    completed, failed = 0, 0
+    stopped = False
+
+    try:
+        while True:
+            while not stopped and len(pending) < batch_size:
+                index, controller_config = next(controllers, (None, None))
+                if controller_config is None:
+                    break
+
+                logger.debug("%s running in batch", controller_config.uuid)
+                task = asyncio.create_task(
+                    _run_controller(controller_config, command, parsed_args, port_range)
+                )
+                pending[task] = index
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                completed += 1
+                failed += 0 if result["success"] else 1
+                yield pending.pop(task), result
+
+            if not stopped and _is_failure_ratio_exceeded(
+                completed, failed, max_failure_ratio
+            ):
+                logger.warning(
+                    (
+                        "%d of %d controllers failed, which is more than %.2f ratio, "
+                        "no other controllers will be started"
+                    ),
+                    failed,
+                    completed,
+                    max_failure_ratio,
+                )
+                stopped = True
+    finally:
+        for task in pending:
+            task.cancel()
+
+    for index, controller_config in controllers:
+        error = JujuSpellError("skipped, the maximum failure ratio was exceeded")
+        yield index, get_result(controller_config, Result(False, error=error))
 
 
 async def run_parallel(
@@ -38,9 +245,18 @@ async def run_parallel(
 ) -> RESULTS_TYPE:
     """Run controller target command in parallel.
 
-    THIS FUNCTION IS NOT YET SUPPORTED.
+    The number of controllers running at the same time is limited by
+    `--max-parallel` argument or by `max-parallel` in connection configuration.
+
+    Parameters:
+        config(Config): application configuration
+        command(BaseJujuCommand): command to run
+        parsed_args(Namespace): Namespace from CLI
+    Returns:
+        results(Dict): Controller dict with result in same order as controllers.
     """
-    raise NotImplementedError("running in parallel is not yet supported")
+    results = _iter_parallel(config, command, parsed_args)
+    return await _collect(results, len(config.controllers))
 
 
 async def run_serial(
@@ -55,18 +271,8 @@ async def run_serial(
     Returns:
         results(Dict): Controller dict with result.
     """
-    results: RESULTS_TYPE = []
-    port_range = config.connection.get("port-range")
-    for controller_config in config.controllers:
-        controller = await get_controller(controller_config, port_range)
-        logger.debug("%s running in serial", controller.controller_uuid)
-        command_kwargs = vars(parsed_args)
-        command_kwargs["controller_config"] = controller_config
-        output = await command.run(controller=controller, **command_kwargs)
-        result = get_result(controller_config, output)
-        results.append(result)
-
-    return results
+    results = _iter_serial(config, command, parsed_args)
+    return await _collect(results, len(config.controllers))
 
 
 async def run_batch(
@@ -74,15 +280,30 @@ async def run_batch(
 ) -> RESULTS_TYPE:
     """Run controller target command in batches.
 
-    THIS FUNCTION IS NOT YET SUPPORTED.
+    The batch is a sliding window, which keeps `--batch-size` controllers in
+    flight and starts the next controller as soon as any of them is done. Before
+    the next controller is started, the ratio of failed controllers is checked and
+    if it's over `--max-failure-ratio`, no other controller is started. Controllers
+    which were not started are returned as unsuccessful results.
+
+    Parameters:
+        config(Config): application configuration
+        command(BaseJujuCommand): command to run
+        parsed_args(Namespace): Namespace from CLI
+    Returns:
+        results(Dict): Controller dict with result in same order as controllers.
     """
-    raise NotImplementedError("running in batches is not yet supported")
+    results = _iter_batch(config, command, parsed_args)
+    return await _collect(results, len(config.controllers))
 
 
 async def run(
     config: Config, command: BaseJujuCommand, parsed_args: Namespace
 ) -> RESULTS_TYPE:
     try:
+        connect_manager.register(
+            config.controllers, config.connection.get("ssh-control-persist")
+        )
         run_type = parsed_args.run_type
         logger.info("running with run_type: %s", run_type)
         if run_type == "parallel":
@@ -93,3 +314,35 @@ async def run(
         return await run_serial(config, command, parsed_args)
     finally:
         await connect_manager.clean()
+
+
+async def stream(
+    config: Config,
+    command: BaseJujuCommand,
+    parsed_args: Namespace,
+    clean: bool = True,
+) -> AsyncGenerator[RESULT_TYPE, None]:
+    """Run controller target command and yield result of each controller.
+
+    Unlike `run`, results are yielded as soon as the controller is done, so the
+    order of results depends on run_type and on the time spent on controllers.
+    If clean is False, connections are kept open to be used by next commands.
+    """
+    try:
+        connect_manager.register(
+            config.controllers, config.connection.get("ssh-control-persist")
+        )
+        run_type = parsed_args.run_type
+        logger.info("streaming with run_type: %s", run_type)
+        if run_type == "parallel":
+            results = _iter_parallel(config, command, parsed_args)
+        elif run_type == "batch":
+            results = _iter_batch(config, command, parsed_args)
+        else:
+            results = _iter_serial(config, command, parsed_args)
+
+        async for _, result in results:
+            yield result
+    finally:
+        if clean:
+            await connect_manager.clean()
@@ -0,0 +1,116 @@
+"""Cache of data loaded from controllers."""
+import dataclasses
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from juju_spell.settings import DEFAULT_MODELS_CACHE_TTL, JUJUSPELL_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedModel:
+    """Model listed in controller."""
+
+    name: str
+    uuid: str
+    owner: str
+
+
+def write_private_file(path: Path, data: bytes) -> None:
+    """Atomically write file readable only by the user."""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+
+        os.replace(tmp_path, path)  # mkstemp creates file with 0o600 mode
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ModelsCache:
+    """Cache of models listed in each controller.
+
+    The models are stored in `<cache_dir>/<controller-uuid>.json` and they are
+    valid for ttl seconds. The cache should be invalidated if the connection to
+    model failed, since the model could be removed.
+
+    Example:
+    ```python
+    models = models_cache.get(controller_uuid)
+    if models is None:
+        models = ...  # list models in controller
+        models_cache.set(controller_uuid, models)
+    ```
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = JUJUSPELL_CACHE_DIR / "models",
+        ttl: float = DEFAULT_MODELS_CACHE_TTL,
+    ):
+        """Initialize cache."""
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _get_path(self, controller_uuid: str) -> Path:
+        """Get path to cache file of controller."""
+        return self.cache_dir / f"{controller_uuid}.json"
+
+    def get(self, controller_uuid: str) -> Optional[Dict[str, CachedModel]]:
+        """Get cached models of controller by name.
+
+        Returns None if the cache does not exist or if it's expired.
+        """
+        try:
+            with open(self._get_path(controller_uuid), "r", encoding="utf8") as file:
+                cache = json.load(file)
+
+            if time.time() - cache["timestamp"] > self.ttl:
+                logger.debug("%s models cache expired", controller_uuid)
+                return None
+
+            models = [CachedModel(**model) for model in cache["models"]]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError) as error:
+            logger.warning("%s models cache is invalid: %s", controller_uuid, error)
+            return None
+
+        return {model.name: model for model in models}
+
+    def set(self, controller_uuid: str, models: Iterable[CachedModel]) -> None:
+        """Store models of controller."""
+        cache = {
+            "timestamp": time.time(),
+            "models": [dataclasses.asdict(model) for model in models],
+        }
+        try:
+            write_private_file(
+                self._get_path(controller_uuid), json.dumps(cache).encode()
+            )
+        except OSError as error:
+            logger.warning("%s models cache was not stored: %s", controller_uuid, error)
+
+    def invalidate(self, controller_uuid: str) -> None:
+        """Remove cached models of controller."""
+        try:
+            self._get_path(controller_uuid).unlink()
+            logger.debug("%s models cache was invalidated", controller_uuid)
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            logger.warning(
+                "%s models cache was not invalidated: %s", controller_uuid, error
+            )
+
+
+models_cache = ModelsCache()
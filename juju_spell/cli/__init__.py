@@ -14,19 +14,32 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-"""JujuSpell cli commands."""
-from .add_user import AddUserCMD
-from .grant import GrantCMD
-from .ping import PingCMD
-from .remove_user import RemoveUserCMD
-from .show_controller import ShowControllerInformationCMD
-from .status import StatusCMD
+"""JujuSpell cli commands.
+
+The commands are imported lazily, see `juju_spell.cli.registry`.
+"""
+import importlib
+from typing import Any
+
+from .registry import COMMANDS
 
 __all__ = [
     "AddUserCMD",
+    "DaemonCMD",
     "GrantCMD",
+    "ModelsCMD",
     "RemoveUserCMD",
     "PingCMD",
     "StatusCMD",
     "ShowControllerInformationCMD",
 ]
+
+_MODULES = {info.class_name: info.module for info in COMMANDS}
+
+
+def __getattr__(name: str) -> Any:
+    """Import command class on first access."""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(_MODULES[name]), name)
@@ -22,10 +22,10 @@ from typing import Any
 
 import craft_cli
 import yaml
-from craft_cli import emit
 from craft_cli.dispatcher import _CustomArgumentParser
 
 from juju_spell.cli.base import JujuWriteCMD
+from juju_spell.cli.utils import emit_debug
 from juju_spell.commands.add_user import AddUserCommand
 from juju_spell.settings import PERSONAL_CONFIG_PATH
 
@@ -91,6 +91,13 @@ class AddUserCMD(JujuWriteCMD):
         if not parsed_args.display_name:
             parsed_args.display_name = parsed_args.user
 
+    def execute(self, parsed_args: argparse.Namespace) -> Any:
+        """Execute command and return results to be printed by format_output.
+
+        The results are always printed as personal config, regardless of `--format`.
+        """
+        return self.get_results(parsed_args)
+
     @staticmethod
     def format_output(retval: Any) -> str:
         """Pretty formatter for output.
@@ -116,7 +123,7 @@ class AddUserCMD(JujuWriteCMD):
                 },
             ]
         """
-        emit.debug(f"formatting `{retval}`")
+        emit_debug("formatting `{}`", retval)
 
         controllers = []
 
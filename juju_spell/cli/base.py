@@ -17,21 +17,49 @@
 """JujuSpell base cli command."""
 import argparse
 import asyncio
-import json
 import os
 from abc import ABCMeta, abstractmethod
-from typing import Any, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 import yaml
 from craft_cli import BaseCommand, emit
 from craft_cli.dispatcher import _CustomArgumentParser
 
-from juju_spell.assignment.runner import run
-from juju_spell.cli.utils import confirm, parse_comma_separated_str, parse_filter
+from juju_spell.assignment.daemon import is_daemon_running
+from juju_spell.assignment.daemon import request as daemon_request
+from juju_spell.assignment.runner import run, stream
+from juju_spell.cli.formatters import FORMATTERS, Formatter, MessageStream
+from juju_spell.cli.utils import (
+    confirm,
+    emit_debug,
+    emit_trace,
+    parse_comma_separated_str,
+    parse_fields,
+    parse_filter,
+    parse_positive_int,
+    parse_ratio,
+)
 from juju_spell.commands.base import BaseJujuCommand
 from juju_spell.config import Config
 from juju_spell.exceptions import JujuSpellError
 from juju_spell.filter import get_filtered_config
+from juju_spell.serializer import dumps
+from juju_spell.settings import DEFAULT_BATCH_SIZE
+from juju_spell.timings import start_timings, summarize, timed
+
+
+async def _iterate(results: Iterable[Any]) -> AsyncGenerator[Any, None]:
+    """Iterate over results asynchronously."""
+    for result in results:
+        yield result
 
 
 class BaseCMD(BaseCommand, metaclass=ABCMeta):
@@ -57,9 +85,11 @@ class BaseCMD(BaseCommand, metaclass=ABCMeta):
             self.before(parsed_args)
             emit.trace(f"function 'before' was run for {self.name} command")
             retval = self.execute(parsed_args)
-            emit.trace(f"raw output of {self.name} command: {retval}")
-            message = self.format_output(retval)
-            emit.message(message)  # print the output
+            emit_trace("raw output of {} command: {}", self.name, retval)
+            if retval is not None:  # output could be already streamed
+                message = self.format_output(retval)
+                emit.message(message)  # print the output
+
             self.after(parsed_args)
             emit.trace(f"function 'after' was run for {self.name} command")
             return 0
@@ -71,10 +101,9 @@ class BaseCMD(BaseCommand, metaclass=ABCMeta):
     @staticmethod
     def format_output(retval: Any) -> str:
         """Pretty formatter for output."""
-        emit.debug(f"formatting `{retval}`")
+        emit_debug("formatting `{}`", retval)
         if isinstance(retval, (dict, list)):
-            # TODO: add support for table, yaml, ... format
-            return json.dumps(retval, default=vars, indent=1)
+            return dumps(retval)
 
         return str(retval)
 
@@ -134,7 +163,9 @@ class BaseJujuCMD(BaseCMD, metaclass=ABCMeta):
             default="",
             help=(
                 "Key-value pair comma separated string in double quotes e.g., "
-                '"a=1,2,3 b=4,5,6". '
+                '"a=1,2,3 b=4,5,6". Supported operators are `=` (any of), `!=` '
+                "(none of), `&=` (all of tags) and `<`, `<=`, `>`, `>=` for risk, "
+                'values could be glob patterns, e.g. "name=prod-* risk<=3".'
             ),
         )
         parser.add_argument(
@@ -142,18 +173,196 @@ class BaseJujuCMD(BaseCMD, metaclass=ABCMeta):
             type=parse_comma_separated_str,
             help="model filter",
         )
+        parser.add_argument(
+            "--format",
+            "--output",
+            dest="format",
+            type=str,
+            choices=list(FORMATTERS),
+            default="json",
+            help=(
+                "json and yaml print all results in order of controllers, ndjson, "
+                "table and csv print result of each controller as soon as the "
+                "controller is done"
+            ),
+        )
+        parser.add_argument(
+            "--drop-empty",
+            default=False,
+            action="store_true",
+            help="Drop fields with null or empty value from output.",
+        )
+        parser.add_argument(
+            "--drop-unknown",
+            default=False,
+            action="store_true",
+            help="Drop `unknown_fields` of juju objects from output.",
+        )
+        parser.add_argument(
+            "--fields",
+            type=parse_fields,
+            default=None,
+            help=(
+                "Comma separated paths to fields of output, which are kept in "
+                "results, `*` matches any key or item, e.g. "
+                '"*.applications.*.units.*.machine,*.model.name".'
+            ),
+        )
+        parser.add_argument(
+            "--timings",
+            default=False,
+            action="store_true",
+            help=(
+                "Print summary of time spent in each phase, e.g. connect or execute, "
+                "and the slowest controllers."
+            ),
+        )
+        parser.add_argument(
+            "--max-parallel",
+            type=parse_positive_int,
+            default=None,
+            help=(
+                "Maximum number of controllers running at the same time with "
+                "`--run-type parallel`. Default is taken from config."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=parse_positive_int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                "Number of controllers running at the same time with "
+                "`--run-type batch`."
+            ),
+        )
+        parser.add_argument(
+            "--max-failure-ratio",
+            type=parse_ratio,
+            default=None,
+            help=(
+                "Stop starting new controllers with `--run-type batch` if the ratio "
+                "of failed controllers is over this value, e.g. 0.2."
+            ),
+        )
 
-    def execute(self, parsed_args: argparse.Namespace) -> Any:
-        """Execute Juju Commands."""
+    def get_filtered_config(self, parsed_args: argparse.Namespace) -> Config:
+        """Check the Juju command and get config with filtered controllers."""
         if self.command is None or not issubclass(self.command, BaseJujuCommand):
             raise RuntimeError(f"command `{self.command}` is incorrect")
 
-        filtered_config = get_filtered_config(self.config, parsed_args.filter)
+        return get_filtered_config(self.config, parsed_args.filter)
+
+    def get_results(self, parsed_args: argparse.Namespace) -> List[Any]:
+        """Run Juju command and get results in the same order as controllers."""
+        filtered_config = self.get_filtered_config(parsed_args)
         loop = asyncio.get_event_loop()
+        if is_daemon_running():
+            emit.debug("command will be executed by JujuSpell daemon")
+            return loop.run_until_complete(
+                self.execute_by_daemon(filtered_config, parsed_args)
+            )
+
         task = loop.create_task(run(filtered_config, self.command(), parsed_args))
         loop.run_until_complete(asyncio.gather(task))
         return task.result()
 
+    def stream_results(
+        self, parsed_args: argparse.Namespace
+    ) -> AsyncGenerator[Any, None]:
+        """Run Juju command and yield result of each controller as soon as it's done."""
+        filtered_config = self.get_filtered_config(parsed_args)
+        if is_daemon_running():
+            emit.debug("command will be executed by JujuSpell daemon")
+            return daemon_request(filtered_config, self.command, parsed_args)
+
+        return stream(filtered_config, self.command(), parsed_args)
+
+    def execute(self, parsed_args: argparse.Namespace) -> Any:
+        """Execute Juju Commands and print results in format from `--format`.
+
+        The results are written one by one by formatter and printed in chunks, so
+        the whole output is never built in memory. The ordered formats, e.g. json,
+        are printed after all controllers are done, the others print result of each
+        controller as soon as it's done.
+        """
+        formatter_cls = FORMATTERS[getattr(parsed_args, "format", "json")]
+        if formatter_cls.ordered:
+            results = _iterate(self.get_results(parsed_args))
+        else:
+            results = self.stream_results(parsed_args)
+
+        timings: Optional[List[Tuple[str, Dict[str, float]]]] = None
+        if getattr(parsed_args, "timings", False):
+            timings = []
+
+        with MessageStream() as output:
+            formatter = formatter_cls(
+                output,
+                drop_empty=getattr(parsed_args, "drop_empty", False),
+                drop_unknown=getattr(parsed_args, "drop_unknown", False),
+            )
+            asyncio.get_event_loop().run_until_complete(
+                self.write_output(formatter, results, timings)
+            )
+
+        if timings is not None:
+            for line in summarize(timings):
+                emit.progress(line, permanent=True)
+
+        return None  # output is already printed
+
+    @staticmethod
+    async def write_output(
+        formatter: Formatter,
+        results: AsyncGenerator[Any, None],
+        timings: Optional[List[Tuple[str, Dict[str, float]]]] = None,
+    ) -> None:
+        """Write results by formatter and print each of them as soon as possible.
+
+        If timings is a list, the timings from context of each result together with
+        time of its serialization are appended to it. The results are closed even
+        if writing failed, e.g. with BrokenPipeError, so the connections are cleaned.
+        """
+        try:
+            formatter.start()
+            async for result in results:
+                if timings is None:
+                    formatter.write(result)
+                else:
+                    serialization_timings = start_timings()
+                    with timed("serialization"):
+                        formatter.write(result)
+
+                    context = result["context"]
+                    timings.append(
+                        (
+                            context["name"],
+                            {**context.get("timings", {}), **serialization_timings},
+                        )
+                    )
+
+                formatter.stream.flush()
+
+            formatter.end()
+        finally:
+            await results.aclose()  # cancel controllers and clean connections
+
+    async def execute_by_daemon(
+        self, config: Config, parsed_args: argparse.Namespace
+    ) -> List[Any]:
+        """Execute Juju command by JujuSpell daemon.
+
+        The results are returned in the same order as controllers.
+        """
+        results = {}
+        async for result in daemon_request(config, self.command, parsed_args):
+            results[result["context"]["uuid"]] = result
+
+        if len(results) != len(config.controllers):
+            raise JujuSpellError("daemon did not return results of all controllers")
+
+        return [results[str(controller.uuid)] for controller in config.controllers]
+
     def dry_run(self, parsed_args: argparse.Namespace) -> None:
         """Print the cmd, targets and execute doc."""
         super().dry_run(parsed_args)
@@ -0,0 +1,55 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2022 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""JujuSpell daemon command."""
+import argparse
+import asyncio
+import signal
+import textwrap
+
+from juju_spell.assignment.daemon import Daemon
+from juju_spell.cli.base import BaseCMD
+
+
+class DaemonCMD(BaseCMD):
+    """JujuSpell daemon command keeping connections to controllers."""
+
+    name = "daemon"
+    help_msg = "Run daemon keeping connections to controllers between commands"
+    overview = textwrap.dedent(
+        """
+        The daemon command runs JujuSpell daemon in foreground. While the daemon is
+        running, other JujuSpell commands are executed by the daemon and they reuse
+        the ssh tunnels and connections to controllers from previous commands.
+        The daemon is stopped by SIGINT (Ctrl+C) or SIGTERM and it closes all the
+        connections.
+
+        The configuration is loaded only when the daemon starts, so the daemon needs
+        to be restarted after the configuration was changed.
+
+        Example:
+        $ juju-spell daemon
+        """
+    )
+
+    def execute(self, parsed_args: argparse.Namespace) -> None:
+        """Run daemon until it's stopped."""
+        daemon = Daemon(self.config)
+        loop = asyncio.get_event_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, daemon.stop)
+
+        loop.run_until_complete(daemon.serve())
@@ -0,0 +1,296 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2022 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Output formatters of JujuSpell commands.
+
+Every formatter writes results one by one to a text stream, so the whole output
+is never built in memory. New formatter is added to `--format` choices by the
+`register_formatter` decorator.
+"""
+import csv
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Type
+
+import yaml
+from craft_cli import emit
+
+from juju_spell.serializer import dumps, to_primitive
+from juju_spell.settings import DEFAULT_OUTPUT_CHUNK_SIZE, DEFAULT_TABLE_COLUMN_WIDTH
+
+# the dumper implemented in C is faster, but it's available only with libyaml
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+ELLIPSIS = "…"  # end of truncated table cell
+DEFAULT_COLUMNS = (
+    "context.name",
+    "context.customer",
+    "context.uuid",
+    "success",
+    "error",
+    "output",
+)
+
+
+class MessageStream:
+    """Text stream printing written text by emit messages.
+
+    The text is buffered and printed in chunks of whole lines, so neither the
+    whole output is kept in memory nor emit is called for every line.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_OUTPUT_CHUNK_SIZE) -> None:
+        """Initialize MessageStream."""
+        self.chunk_size = chunk_size
+        self._buffer: List[str] = []
+        self._size = 0
+
+    def __enter__(self) -> "MessageStream":
+        """Open stream."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Print rest of the text even if writing failed."""
+        self.close()
+
+    def write(self, text: str) -> int:
+        """Write text, which is printed once the chunk size is reached."""
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+        return len(text)
+
+    def flush(self) -> None:
+        """Print all complete lines."""
+        lines, separator, rest = "".join(self._buffer).rpartition("\n")
+        if separator:
+            emit.message(lines)  # the last new line is added by emit
+
+        self._buffer = [rest] if rest else []
+        self._size = len(rest)
+
+    def close(self) -> None:
+        """Print rest of the text."""
+        self.flush()
+        if self._buffer:
+            emit.message("".join(self._buffer))
+            self._buffer, self._size = [], 0
+
+
+class Formatter(metaclass=ABCMeta):
+    """Base formatter writing results one by one to the stream."""
+
+    name: str
+    # results must be written in the same order as controllers, otherwise each
+    # result is written as soon as the controller is done
+    ordered: bool = False
+
+    def __init__(
+        self, stream: TextIO, drop_empty: bool = False, drop_unknown: bool = False
+    ) -> None:
+        """Initialize formatter.
+
+        Args:
+            stream: text stream to which the results are written
+            drop_empty: drop fields of objects with None or empty value
+            drop_unknown: drop `unknown_fields` of juju `Type` objects
+        """
+        self.stream = stream
+        self.drop_empty = drop_empty
+        self.drop_unknown = drop_unknown
+        self.count = 0  # number of written results
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        """Serialize object to JSON with dropped fields."""
+        return dumps(obj, compact, self.drop_empty, self.drop_unknown)
+
+    def to_primitive(self, obj: Any) -> Any:
+        """Convert object to primitive types with dropped fields."""
+        return to_primitive(obj, self.drop_empty, self.drop_unknown)
+
+    def start(self) -> None:
+        """Write beginning of the output."""
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Write single result."""
+        self._write(result)
+        self.count += 1
+
+    def end(self) -> None:
+        """Write end of the output."""
+
+    @abstractmethod
+    def _write(self, result: Dict[str, Any]) -> None:  # pragma: no cover
+        """Write single result to the stream."""
+
+
+FORMATTERS: Dict[str, Type[Formatter]] = {}
+
+
+def register_formatter(formatter: Type[Formatter]) -> Type[Formatter]:
+    """Register formatter under its name, it's used as class decorator."""
+    FORMATTERS[formatter.name] = formatter
+    return formatter
+
+
+@register_formatter
+class JsonFormatter(Formatter):
+    """JSON list of all results in the same order as controllers."""
+
+    name = "json"
+    ordered = True
+
+    def start(self) -> None:
+        self.stream.write("[")
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        # same as items of list dumped with indent
+        self.stream.write("," if self.count else "")
+        self.stream.write("\n " + self.dumps(result).replace("\n", "\n "))
+
+    def end(self) -> None:
+        self.stream.write("\n]" if self.count else "]")
+
+
+@register_formatter
+class NdjsonFormatter(Formatter):
+    """Each result on separate line as soon as the controller is done."""
+
+    name = "ndjson"
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self.stream.write(self.dumps(result, compact=True) + "\n")
+
+
+@register_formatter
+class YamlFormatter(Formatter):
+    """YAML list of all results in the same order as controllers."""
+
+    name = "yaml"
+    ordered = True
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        yaml.dump(
+            [self.to_primitive(result)],
+            self.stream,
+            Dumper=_YAML_DUMPER,
+            default_flow_style=False,
+            sort_keys=False,
+        )
+
+    def end(self) -> None:
+        if not self.count:
+            self.stream.write("[]\n")
+
+
+def _get_value(record: Any, path: str) -> Any:
+    """Get value of record by dotted path, e.g. `context.name`."""
+    for key in path.split("."):
+        if not isinstance(record, dict):
+            return None
+
+        record = record.get(key)
+
+    return record
+
+
+def _format_cell(value: Any) -> str:
+    """Format value of table or CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value, compact=True)
+
+    return str(value)
+
+
+def _truncate(text: str, width: int) -> str:
+    """Truncate text to width with ellipsis."""
+    if len(text) <= width:
+        return text
+
+    return text[: width - 1] + ELLIPSIS
+
+
+class TabularFormatter(Formatter, metaclass=ABCMeta):
+    """Base formatter writing each result as single row."""
+
+    columns: Sequence[str] = DEFAULT_COLUMNS
+
+    def get_cells(self, result: Dict[str, Any]) -> List[str]:
+        """Get cells of result row."""
+        record = self.to_primitive(result)
+        return [_format_cell(_get_value(record, column)) for column in self.columns]
+
+
+@register_formatter
+class TableFormatter(TabularFormatter):
+    """Table with row for each controller written as soon as it's done.
+
+    The widths of columns are taken from the header and the first row, at most
+    DEFAULT_TABLE_COLUMN_WIDTH, and longer values are truncated with ellipsis, so
+    the rows stay aligned.
+    """
+
+    name = "table"
+
+    def __init__(self, stream: TextIO, **kwargs: bool) -> None:
+        """Initialize TableFormatter."""
+        super().__init__(stream, **kwargs)
+        self._widths: Optional[List[int]] = None
+
+    def _write_row(self, cells: Sequence[str]) -> None:
+        """Write row of cells aligned to column widths."""
+        assert self._widths is not None
+        aligned = [
+            _truncate(cell.replace("\n", " "), width).ljust(width)
+            for cell, width in zip(cells, self._widths)
+        ]
+        self.stream.write("  ".join(aligned).rstrip() + "\n")
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        cells = self.get_cells(result)
+        if self._widths is None:
+            self._widths = [
+                min(max(len(column), len(cell)), DEFAULT_TABLE_COLUMN_WIDTH)
+                for column, cell in zip(self.columns, cells)
+            ]
+            self._write_row(self.columns)
+
+        self._write_row(cells)
+
+    def end(self) -> None:
+        if self._widths is None:  # only header
+            self._widths = [len(column) for column in self.columns]
+            self._write_row(self.columns)
+
+
+@register_formatter
+class CsvFormatter(TabularFormatter):
+    """CSV with row for each controller written as soon as it's done."""
+
+    name = "csv"
+
+    def __init__(self, stream: TextIO, **kwargs: bool) -> None:
+        """Initialize CsvFormatter."""
+        super().__init__(stream, **kwargs)
+        self._writer = csv.writer(stream, lineterminator="\n")
+
+    def start(self) -> None:
+        self._writer.writerow(self.columns)
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self._writer.writerow(self.get_cells(result))
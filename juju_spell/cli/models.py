@@ -0,0 +1,81 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2022 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""JujuSpell juju models command."""
+import textwrap
+
+from craft_cli.dispatcher import _CustomArgumentParser
+
+from juju_spell.cli.base import JujuReadCMD
+from juju_spell.commands.models import ModelsCommand
+
+
+class ModelsCMD(JujuReadCMD):
+    """JujuSpell juju models command."""
+
+    name = "models"
+    help_msg = "Gets the summary of selected models"
+    overview = textwrap.dedent(
+        """
+        The models command shows the summary of selected models, e.g. life, status,
+        agent version and number of machines, applications and units.
+
+        The summaries are collected by the controller for all models at once, so it
+        does not need to connect to each model. Use `--unhealthy` to show only models
+        which are not alive and available.
+
+        Example:
+        $ juju-spell models --unhealthy
+        [
+         {
+          "context": {
+           "uuid": "e9fe93a8-b705-4067-8f30-6eec183eeb4f",
+           "name": "Controller1",
+           "customer": "Gandalf"
+          },
+          "success": true,
+          "output": {
+           "openstack": {
+            "name": "openstack",
+            "uuid": "4b8a5a2c-9b1f-4d5c-8f4e-0c1d2e3f4a5b",
+            "owner": "admin",
+            "life": "alive",
+            "status": "busy",
+            "status_message": "migrating",
+            "agent_version": "2.9.37",
+            "machine_count": 12,
+            "application_count": 25,
+            "unit_count": 80,
+            "error": null
+           }
+          },
+          "error": null
+         }
+        ]
+        """
+    )
+    command = ModelsCommand
+
+    def fill_parser(self, parser: _CustomArgumentParser) -> None:
+        """Add arguments specific to the models command."""
+        super().fill_parser(parser)
+        parser.add_argument(
+            "--unhealthy",
+            action="store_true",
+            default=False,
+            help="Show only models which are not alive and available",
+        )
@@ -0,0 +1,160 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2022 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Static registry of JujuSpell CLI commands.
+
+The command modules import libjuju and the whole business logic, so they are
+imported only when the command is really needed, e.g. to run it or to show its
+help. The general help is built only from the registry.
+"""
+import dataclasses
+import importlib
+from typing import Any, Dict, List, Type
+
+from craft_cli import BaseCommand
+
+READ_ONLY = "ReadOnly"
+READ_WRITE = "ReadWrite"
+OTHER = "Other"
+GROUPS = [READ_ONLY, READ_WRITE, OTHER]
+
+
+@dataclasses.dataclass(frozen=True)
+class CommandInfo:
+    """Information about CLI command needed without importing it."""
+
+    name: str
+    help_msg: str
+    group: str
+    module: str
+    class_name: str
+
+
+COMMANDS = [
+    CommandInfo(
+        "models",
+        "Gets the summary of selected models",
+        READ_ONLY,
+        "juju_spell.cli.models",
+        "ModelsCMD",
+    ),
+    CommandInfo(
+        "ping",
+        "Check connection to controller(s)",
+        READ_ONLY,
+        "juju_spell.cli.ping",
+        "PingCMD",
+    ),
+    CommandInfo(
+        "show-controller",
+        "Show controller information",
+        READ_ONLY,
+        "juju_spell.cli.show_controller",
+        "ShowControllerInformationCMD",
+    ),
+    CommandInfo(
+        "status",
+        "Gets the status of selected model",
+        READ_ONLY,
+        "juju_spell.cli.status",
+        "StatusCMD",
+    ),
+    CommandInfo(
+        "add-user",
+        "add juju user to remote controller",
+        READ_WRITE,
+        "juju_spell.cli.add_user",
+        "AddUserCMD",
+    ),
+    CommandInfo(
+        "grant",
+        "add juju user to remote controller",
+        READ_WRITE,
+        "juju_spell.cli.grant",
+        "GrantCMD",
+    ),
+    CommandInfo(
+        "remove-user",
+        "remove juju user to remote controller",
+        READ_WRITE,
+        "juju_spell.cli.remove_user",
+        "RemoveUserCMD",
+    ),
+    CommandInfo(
+        "daemon",
+        "Run daemon keeping connections to controllers between commands",
+        OTHER,
+        "juju_spell.cli.daemon",
+        "DaemonCMD",
+    ),
+]
+
+
+def load_command(info: CommandInfo) -> Type[BaseCommand]:
+    """Import command class."""
+    module = importlib.import_module(info.module)
+    return getattr(module, info.class_name)
+
+
+class LazyCommandType(type):
+    """Type of lazy command, which imports the real command when it's used.
+
+    The lazy command has all attributes needed by craft-cli to build the general
+    help. Creating its instance creates instance of the real command and the
+    instances of real command are instances of the lazy one.
+    """
+
+    info: CommandInfo
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> BaseCommand:
+        """Create instance of real command."""
+        return cls.load()(*args, **kwargs)
+
+    def __instancecheck__(cls, instance: Any) -> bool:
+        """Check if instance is instance of real command.
+
+        The real command is not imported if the instance has different name.
+        """
+        return getattr(instance, "name", None) == cls.info.name and isinstance(
+            instance, cls.load()
+        )
+
+    def load(cls) -> Type[BaseCommand]:
+        """Import real command."""
+        return load_command(cls.info)
+
+
+def get_lazy_command(info: CommandInfo) -> Type[BaseCommand]:
+    """Get lazy command for command defined in registry."""
+    attributes = {
+        "info": info,
+        "name": info.name,
+        "help_msg": info.help_msg,
+        "overview": None,
+        "common": False,
+        "hidden": False,
+    }
+    return LazyCommandType(info.class_name, (), attributes)  # type: ignore
+
+
+def get_lazy_commands() -> Dict[str, List[Type[BaseCommand]]]:
+    """Get lazy commands by group."""
+    groups: Dict[str, List[Type[BaseCommand]]] = {group: [] for group in GROUPS}
+    for info in COMMANDS:
+        groups[info.group].append(get_lazy_command(info))
+
+    return groups
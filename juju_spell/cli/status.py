@@ -20,7 +20,9 @@ import textwrap
 from craft_cli.dispatcher import _CustomArgumentParser
 
 from juju_spell.cli.base import JujuReadCMD
+from juju_spell.cli.utils import parse_comma_separated_str, parse_positive_int
 from juju_spell.commands.status import StatusCommand
+from juju_spell.settings import DEFAULT_MODEL_PARALLEL
 
 
 class StatusCMD(JujuReadCMD):
@@ -32,6 +34,11 @@ class StatusCMD(JujuReadCMD):
         """
         The status command shows the status of the selected model.
 
+        Applications, units and machines can be filtered with `--apps`, `--units`
+        and `--machines` patterns, which are evaluated by the controller. The
+        'relations', 'offers' and 'remote-applications' sections are shown only if
+        they were requested.
+
         Example:
         $ juju-spell status
         [
@@ -56,14 +63,42 @@ class StatusCMD(JujuReadCMD):
     def fill_parser(self, parser: _CustomArgumentParser) -> None:
         """Add arguments specific to the export-login command."""
         super().fill_parser(parser)
+        parser.add_argument(
+            "--apps",
+            type=parse_comma_separated_str,
+            help="Show only applications matching patterns, e.g. nova-*,keystone",
+        )
+        parser.add_argument(
+            "--units",
+            type=parse_comma_separated_str,
+            help="Show only units matching patterns, e.g. nova-compute/0,ceph-osd/*",
+        )
+        parser.add_argument(
+            "--machines",
+            type=parse_comma_separated_str,
+            help="Show only machines matching patterns, e.g. 0,1/lxd/*",
+        )
         parser.add_argument(
             "--relations",
+            action="store_true",
             default=False,
             help="Show 'relations' section",
         )
+        parser.add_argument(
+            "--offers",
+            action="store_true",
+            default=False,
+            help="Show 'offers' and 'remote-applications' sections",
+        )
         parser.add_argument(
             "--storage",
             action="store_true",
             default=False,
             help="Show 'storage' section",
         )
+        parser.add_argument(
+            "--model-parallel",
+            type=parse_positive_int,
+            default=DEFAULT_MODEL_PARALLEL,
+            help="Maximum number of models in single controller queried at once.",
+        )
@@ -15,17 +15,18 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Unilities."""
-import re
 import sys
 import typing as t
 from argparse import ArgumentTypeError
 from gettext import gettext
 from typing import List
 
-from craft_cli import emit
+from craft_cli import EmitterMode, emit
 
 from juju_spell.exceptions import Abort, JujuSpellError
-from juju_spell.filter import FILTER_EXPRESSION_REGEX
+from juju_spell.filter import parse_filter_expression
+from juju_spell.projection import parse_fields_expression
+from juju_spell.utils import Preview
 
 visible_prompt_func: t.Callable[[str], str] = input
 
@@ -91,9 +92,75 @@ def parse_comma_separated_str(comma_separated_str: str) -> List[str]:
     return [obj.strip() for obj in result if obj]
 
 
+def parse_positive_int(value: str) -> int:
+    """Type check for positive integer argument."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid int value: {value}") from None
+
+    if number <= 0:
+        raise ArgumentTypeError(f"value must be a positive integer: {value}")
+
+    return number
+
+
+def parse_ratio(value: str) -> float:
+    """Type check for ratio argument, which must be in interval [0, 1]."""
+    try:
+        ratio = float(value)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid float value: {value}") from None
+
+    if not 0 <= ratio <= 1:
+        raise ArgumentTypeError(f"value must be in interval [0, 1]: {value}")
+
+    return ratio
+
+
 def parse_filter(value: str) -> str:
-    """Type check for argument filter."""
-    if not (re.findall(FILTER_EXPRESSION_REGEX, value) or len(value) == 0):
+    """Type check for argument filter.
+
+    The expression is parsed here, so invalid conditions are reported before
+    any controller is selected.
+    """
+    try:
+        conditions = parse_filter_expression(value)
+    except ValueError as error:
+        raise ArgumentTypeError(f"Argument filter format wrong: {error}") from error
+
+    if not conditions and len(value) != 0:
         raise ArgumentTypeError(f"Argument filter format wrong: {value}")
 
     return value
+
+
+def parse_fields(value: str) -> str:
+    """Type check for argument fields.
+
+    The expression is compiled later by runner, here it's only validated.
+    """
+    try:
+        parse_fields_expression(value)
+    except ValueError as error:
+        raise ArgumentTypeError(f"Argument fields format wrong: {error}") from error
+
+    return value
+
+
+def emit_debug(template: str, *args: t.Any) -> None:
+    """Emit debug message with size-capped previews of arguments.
+
+    The debug messages are always written to the log file, so the arguments are
+    rendered only as previews, e.g. `emit_debug("output: {}", output)`.
+    """
+    emit.debug(template.format(*(Preview(arg) for arg in args)))
+
+
+def emit_trace(template: str, *args: t.Any) -> None:
+    """Emit trace message with previews of arguments only in trace mode.
+
+    The message is not even rendered if it would not be shown or logged.
+    """
+    if emit.get_mode() == EmitterMode.TRACE:
+        emit.trace(template.format(*(Preview(arg) for arg in args)))
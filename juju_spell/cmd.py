@@ -1,7 +1,6 @@
 """Module combinates all the commands."""
 import argparse
 import contextlib
-import inspect
 import logging
 import os
 import sys
@@ -17,9 +16,8 @@ from craft_cli import (
     emit,
 )
 
-from juju_spell import cli, utils
-from juju_spell.cli.base import JujuReadCMD, JujuWriteCMD
-from juju_spell.config import load_config
+from juju_spell import utils
+from juju_spell.cli.registry import get_lazy_commands
 from juju_spell.exceptions import JujuSpellError
 from juju_spell.settings import (
     APP_NAME,
@@ -40,20 +38,15 @@ GLOBAL_ARGS = [
 ]
 
 
-def get_all_subclasses(cls):
-    all_classes = inspect.getmembers(cli, inspect.isclass)
-    return [obj for _, obj in all_classes if issubclass(obj, cls) and obj != cls]
-
-
 def get_command_groups():
-    ro_commands = get_all_subclasses(JujuReadCMD)
-    rw_commands = get_all_subclasses(JujuWriteCMD)
-    command_groups = [
-        CommandGroup("ReadOnly", ro_commands),
-        CommandGroup("ReadWrite", rw_commands),
-    ]
+    """Get command groups from static registry.
 
-    return command_groups
+    The commands are imported only when they are needed, so `--help` or
+    `--version` does not import libjuju.
+    """
+    return [
+        CommandGroup(group, commands) for group, commands in get_lazy_commands().items()
+    ]
 
 
 def get_verbosity() -> EmitterMode:
@@ -138,6 +131,9 @@ def _run_dispatcher(dispatcher: Dispatcher) -> None:
         print(CROSS_FINGERS, file=sys.stdout)
 
     global_args = dispatcher.pre_parse_args(sys.argv[1:])
+    # imported here, since it's not needed for help
+    from juju_spell.config import load_config
+
     if global_args.get("config"):
         config = load_config(global_args["config"])
     else:
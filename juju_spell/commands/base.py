@@ -15,14 +15,64 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """JujuSpell base juju command."""
+import asyncio
 import dataclasses
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, AsyncGenerator, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
+from juju import tag
+from juju.client import client
 from juju.controller import Controller
 from juju.model import Model
 
+from juju_spell.cache import CachedModel, models_cache
+from juju_spell.settings import DEFAULT_MODEL_PARALLEL
+from juju_spell.timings import timed
+
+logger = logging.getLogger(__name__)
+
+
+async def list_models(controller: Controller) -> List[CachedModel]:
+    """List models in controller accessible by the current user."""
+    facade = client.ModelManagerFacade.from_connection(controller.connection())
+    user = tag.user(controller.get_current_username())
+    response = await facade.ListModels(tag=user)
+    return [
+        CachedModel(
+            name=user_model.model.name,
+            uuid=user_model.model.uuid,
+            owner=tag.untag("user-", user_model.model.owner_tag),
+        )
+        for user_model in response.user_models
+    ]
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelSummary:
+    """Summary of model collected by controller without connecting to model."""
+
+    name: str
+    uuid: str
+    owner: Optional[str] = None
+    life: Optional[str] = None
+    status: Optional[str] = None
+    status_message: Optional[str] = None
+    agent_version: Optional[str] = None
+    machine_count: Optional[int] = None
+    application_count: Optional[int] = None
+    unit_count: Optional[int] = None
+    error: Optional[str] = None
+
 
 @dataclasses.dataclass(frozen=True)
 class Result:
@@ -36,25 +86,179 @@ class Result:
 class BaseJujuCommand(metaclass=ABCMeta):
     """Base Juju commands."""
 
+    # connect models without AllWatcher, see `connect_model`
+    lightweight_models: bool = False
+
     def __init__(self):
         """Init for command."""
         self.name = getattr(self.__class__, "__name__", "unknown")
         self.logger = logging.getLogger(self.name)
 
-    @staticmethod
     async def get_filtered_models(
-        controller: Controller, models: Optional[List[str]] = None
+        self, controller: Controller, models: Optional[List[str]] = None
     ) -> AsyncGenerator[Tuple[str, Model], None]:
         """Get filtered models for controller.
 
         If models is None, then all models for controller will be returned.
         """
-        all_models = await controller.get_models()
-        for model_name in all_models:
-            if not models or model_name in models:
-                model = await controller.get_model(model_name)
-                yield model_name, model
-                await model.disconnect()
+        model_uuids = await self.get_filtered_model_uuids(controller, models)
+        for model_name, model_uuid in model_uuids.items():
+            model = await self.connect_model(controller, model_uuid)
+            yield model_name, model
+            await model.disconnect()
+
+    @staticmethod
+    async def get_filtered_model_uuids(
+        controller: Controller, models: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """Get filtered names and uuids of models in controller sorted by name.
+
+        If models is None, then all models in controller will be returned. The
+        models are listed from models cache and the controller is asked only if the
+        cache is expired or if any of requested models is not in cache.
+        """
+        controller_uuid = controller.controller_uuid
+        cached_models = models_cache.get(controller_uuid)
+        if cached_models is None or any(
+            name not in cached_models for name in models or []
+        ):
+            cached_models = {
+                model.name: model for model in await list_models(controller)
+            }
+            models_cache.set(controller_uuid, cached_models.values())
+        else:
+            logger.debug("%s using models from cache", controller_uuid)
+
+        return {
+            name: cached_models[name].uuid
+            for name in sorted(cached_models)
+            if not models or name in models
+        }
+
+    async def connect_model(self, controller: Controller, model_uuid: str) -> Model:
+        """Connect to model directly by its uuid.
+
+        If lightweight_models is True, only the model API connection is opened
+        without starting the AllWatcher, which downloads whole state of model. Such
+        model can be used only to call facades, e.g. `model.get_status()`, and
+        entities like `model.applications` are always empty.
+
+        The models cache of controller is invalidated if the connection failed,
+        since the model could be removed.
+        """
+        model = Model()
+        connect_params = {
+            **controller.connection().connect_params(),
+            "uuid": model_uuid,
+        }
+        try:
+            if self.lightweight_models:
+                await model._connector.connect(**connect_params)
+            else:
+                await model._connect_direct(**connect_params)  # starts AllWatcher
+
+            return model
+        except Exception:
+            models_cache.invalidate(controller.controller_uuid)
+            raise
+
+    async def get_model_summaries(
+        self, controller: Controller, models: Optional[List[str]] = None
+    ) -> Dict[str, ModelSummary]:
+        """Get summaries of filtered models in controller sorted by model name.
+
+        The summaries are collected by two bulk calls to controller, ModelInfo and
+        ModelStatus with tags of all models, so no model is connected. Failure of
+        single model is reported in its summary and the models cache is invalidated,
+        since the model could be removed.
+        """
+        model_uuids = await self.get_filtered_model_uuids(controller, models)
+        if not model_uuids:
+            return {}
+
+        entities = [client.Entity(tag.model(uuid)) for uuid in model_uuids.values()]
+        connection = controller.connection()
+        model_manager_facade = client.ModelManagerFacade.from_connection(connection)
+        controller_facade = client.ControllerFacade.from_connection(connection)
+        info_results, status_results = await asyncio.gather(
+            model_manager_facade.ModelInfo(entities=entities),
+            controller_facade.ModelStatus(entities=entities),
+        )
+
+        summaries = {}
+        for name, uuid, info_result, status in zip(
+            model_uuids,
+            model_uuids.values(),
+            info_results.results,
+            status_results.models,
+        ):
+            summary: Dict[str, Any] = {"name": name, "uuid": uuid}
+            errors = [
+                error.message
+                for error in (info_result.error, status.error)
+                if error is not None
+            ]
+            if info_result.error is None:
+                info = info_result.result
+                summary.update(
+                    owner=tag.untag("user-", info.owner_tag),
+                    life=info.life,
+                    status=info.status.status if info.status else None,
+                    status_message=info.status.info if info.status else None,
+                    agent_version=info.agent_version,
+                )
+            if status.error is None:
+                summary.update(
+                    machine_count=status.hosted_machine_count,
+                    application_count=status.application_count,
+                    unit_count=status.unit_count,
+                )
+
+            summaries[name] = ModelSummary(**summary, error="; ".join(errors) or None)
+
+        if any(summary.error for summary in summaries.values()):
+            models_cache.invalidate(controller.controller_uuid)
+
+        return summaries
+
+    async def run_on_models(
+        self,
+        controller: Controller,
+        func: Callable[[str, Model], Awaitable[Any]],
+        models: Optional[List[str]] = None,
+        model_parallel: int = DEFAULT_MODEL_PARALLEL,
+    ) -> Dict[str, Any]:
+        """Run function on filtered models concurrently.
+
+        At most model_parallel models are connected at the same time and each model
+        is disconnected as soon as the function is done. If function fails for any
+        model, the others are cancelled and the error is raised.
+
+        Returns:
+            Dict with output of function for each model sorted by model name.
+        """
+        semaphore = asyncio.Semaphore(model_parallel)
+
+        async def _run_on_model(model_name: str, model_uuid: str) -> Any:
+            async with semaphore:
+                model = await self.connect_model(controller, model_uuid)
+                try:
+                    return await func(model_name, model)
+                finally:
+                    await model.disconnect()
+
+        model_uuids = await self.get_filtered_model_uuids(controller, models)
+        tasks = [
+            asyncio.ensure_future(_run_on_model(name, uuid))
+            for name, uuid in model_uuids.items()
+        ]
+        try:
+            outputs = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return dict(zip(model_uuids, outputs))
 
     async def run(self, controller: Controller, **kwargs) -> Result:
         """Execute Juju command.
@@ -63,7 +267,9 @@ class BaseJujuCommand(metaclass=ABCMeta):
         """
         self.logger.info("%s running %s command", controller.controller_uuid, self.name)
         try:
-            output = await self.execute(controller, **kwargs)
+            with timed("execute"):
+                output = await self.execute(controller, **kwargs)
+
             if not isinstance(output, Result):
                 output = Result(True, output=output)
 
@@ -0,0 +1,47 @@
+from typing import Dict, List, Optional
+
+from juju.controller import Controller
+
+from juju_spell.commands.base import BaseJujuCommand, ModelSummary
+from juju_spell.utils import Preview
+
+HEALTHY_MODEL_STATUS = "available"
+
+
+def is_healthy(summary: ModelSummary) -> bool:
+    """Check if model is alive, available and its summary was collected."""
+    return (
+        summary.error is None
+        and summary.life == "alive"
+        and summary.status == HEALTHY_MODEL_STATUS
+    )
+
+
+class ModelsCommand(BaseJujuCommand):
+    """Command to show summaries of models."""
+
+    async def execute(
+        self,
+        controller: Controller,
+        models: Optional[List[str]] = None,
+        unhealthy: bool = False,
+        **kwargs,
+    ) -> Dict[str, ModelSummary]:
+        """Get summaries of selected models in controller.
+
+        The summaries are collected by single bulk call to controller, so no model
+        is connected. With unhealthy only models which are not alive and available
+        are returned.
+        """
+        summaries = await self.get_model_summaries(controller, models)
+        if unhealthy:
+            summaries = {
+                name: summary
+                for name, summary in summaries.items()
+                if not is_healthy(summary)
+            }
+
+        self.logger.debug(
+            "%s models summaries: %s", controller.controller_uuid, Preview(summaries)
+        )
+        return summaries
@@ -2,6 +2,7 @@ from juju.client._definitions import ControllerAPIInfoResults
 from juju.controller import Controller
 
 from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.utils import Preview
 
 
 class ShowControllerCommand(BaseJujuCommand):
@@ -15,5 +16,5 @@ class ShowControllerCommand(BaseJujuCommand):
         Changed name because this has to override base_command.
         """
         info = await controller.info()
-        self.logger.debug("%s info: %s", controller.controller_uuid, info)
+        self.logger.debug("%s info: %s", controller.controller_uuid, Preview(info))
         return info
@@ -1,24 +1,97 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from juju.client import client
 from juju.client._definitions import FullStatus
 from juju.controller import Controller
+from juju.errors import JujuError
+from juju.model import Model
 
 from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.settings import DEFAULT_MODEL_PARALLEL
+from juju_spell.utils import Preview
+
+# optional sections of FullStatus, which are dropped if they were not requested
+OPTIONAL_SECTIONS = {
+    "relations": ["relations"],
+    "offers": ["offers", "remote_applications"],
+}
+
+
+def get_status_patterns(
+    apps: Optional[List[str]] = None,
+    units: Optional[List[str]] = None,
+    machines: Optional[List[str]] = None,
+) -> Optional[List[str]]:
+    """Get patterns filtering status on the controller side.
+
+    Returns None if no pattern was defined, so the whole status is returned.
+    """
+    patterns = [*(apps or []), *(units or []), *(machines or [])]
+    return patterns or None
+
+
+def drop_sections(status: FullStatus, **requested: bool) -> FullStatus:
+    """Drop optional sections of status, which were not requested."""
+    for section, attributes in OPTIONAL_SECTIONS.items():
+        if not requested.get(section):
+            for attribute in attributes:
+                setattr(status, attribute, None)
+
+    return status
+
+
+async def get_storage(model: Model) -> List[Any]:
+    """Get storage details of model."""
+    storage_facade = client.StorageFacade.from_connection(model.connection())
+    response = await storage_facade.ListStorageDetails(filters=[client.StorageFilter()])
+    result = response.results[0]
+    if result.error is not None:
+        raise JujuError(result.error.message)
+
+    return result.result or []
 
 
 class StatusCommand(BaseJujuCommand):
     """Command to show status for models."""
 
+    lightweight_models = True
+
     async def execute(
-        self, controller: Controller, models: Optional[List[str]] = None, **kwargs
+        self,
+        controller: Controller,
+        models: Optional[List[str]] = None,
+        model_parallel: int = DEFAULT_MODEL_PARALLEL,
+        apps: Optional[List[str]] = None,
+        units: Optional[List[str]] = None,
+        machines: Optional[List[str]] = None,
+        relations: bool = False,
+        offers: bool = False,
+        storage: bool = False,
+        **kwargs,
     ) -> Dict[str, FullStatus]:
-        """Get status for selected models in controller."""
-        output = {}
-        async for name, model in self.get_filtered_models(controller, models):
-            status = await model.get_status()
+        """Get status for selected models in controller.
+
+        The status of models is collected concurrently, at most model_parallel
+        models at the same time. Applications, units and machines are filtered by
+        the controller and sections which were not requested are dropped as soon as
+        the status is received.
+        """
+        patterns = get_status_patterns(apps, units, machines)
+
+        async def _get_status(name: str, model: Model) -> FullStatus:
+            status = await model.get_status(filters=patterns)
+            drop_sections(status, relations=relations, offers=offers)
+            if storage:
+                status.storage = await get_storage(model)
+
             self.logger.debug(
-                "%s model %s status: %s", controller.controller_uuid, name, status
+                "%s model %s status: %s",
+                controller.controller_uuid,
+                name,
+                Preview(status),
             )
-            output[name] = status
+            return status
 
-        return output
+        return await self.run_on_models(
+            controller, _get_status, models, model_parallel or DEFAULT_MODEL_PARALLEL
+        )
@@ -1,17 +1,26 @@
 """Configuration loader."""
 import dataclasses
+import hashlib
 import logging
+import os
+import pickle
 import re
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import confuse
 import yaml
 from confuse import ConfigError, RootView
 
+from juju_spell.cache import write_private_file
 from juju_spell.exceptions import JujuSpellError
-from juju_spell.settings import DEFAULT_PORT_RANGE
+from juju_spell.settings import (
+    APP_VERSION,
+    CONFIG_CACHE_PATH,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_PORT_RANGE,
+)
 from juju_spell.utils import merge_list_of_dict_by_key
 
 logger = logging.getLogger(__name__)
@@ -54,6 +63,8 @@ PORT_RANGE = (
     r"((6553[0-5])|(655[0-2][0-9])|(65[0-4][0-9]{2})|(6[0-4][0-9]{3})|"
     r"([1-5][0-9]{4})|([0-5]{0,5})|([0-9]{1,4}))$"
 )
+# controller attributes with inverted index in Config
+INDEXED_KEYS = ("customer", "owner", "tags", "risk", "name", "uuid")
 
 
 class String(confuse.Template):
@@ -83,6 +94,18 @@ class PortRange(String):
         return range(int(start_port), int(end_port))
 
 
+class PositiveInteger(confuse.Integer):
+    """A template used to validate positive integer."""
+
+    def convert(self, value: Any, view: confuse.ConfigView) -> int:
+        """Check that the value is integer greater than zero."""
+        value = super().convert(value, view)
+        if value <= 0:
+            self.fail("must be a positive integer", view, True)
+
+        return value
+
+
 class ControllerDict(confuse.MappingTemplate):
     """Controller template."""
 
@@ -112,6 +135,10 @@ JUJUSPELL_CONFIG_TEMPLATE = confuse.MappingTemplate(
                         default=DEFAULT_PORT_RANGE,
                     )
                 ),
+                "max-parallel": confuse.Optional(
+                    PositiveInteger(default=DEFAULT_MAX_PARALLEL)
+                ),
+                "ssh-control-persist": confuse.Optional(PositiveInteger()),
             }
         ),
         "controllers": confuse.Sequence(
@@ -193,10 +220,64 @@ class Controller:
     connection: Optional[Connection] = None
 
 
+def get_index_values(value: Any) -> Set[str]:
+    """Get values of controller attribute as they are stored in index."""
+    if not value:
+        return set()
+
+    if isinstance(value, list):
+        return {str(item) for item in value}
+
+    return {str(value)}
+
+
 @dataclasses.dataclass
 class Config:
     controllers: List[Controller]
     connection: Optional[Dict[str, Any]] = None
+    # inverted indexes {key: {value: [position of controller, ...]}}
+    _indexes: Dict[str, Dict[str, List[int]]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_controllers: Optional[List[Controller]] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _indexed_size: int = dataclasses.field(
+        default=0, init=False, repr=False, compare=False
+    )
+
+    def _is_indexed(self) -> bool:
+        """Check if indexes were built for current controllers."""
+        return (
+            self._indexed_controllers is self.controllers
+            and self._indexed_size == len(self.controllers)
+        )
+
+    def build_indexes(self) -> None:
+        """Build inverted indexes of controllers for all indexed keys."""
+        indexes: Dict[str, Dict[str, List[int]]] = {key: {} for key in INDEXED_KEYS}
+        for position, controller in enumerate(self.controllers):
+            for key, index in indexes.items():
+                for value in get_index_values(getattr(controller, key, None)):
+                    index.setdefault(value, []).append(position)
+
+        self._indexes = indexes
+        self._indexed_controllers = self.controllers
+        self._indexed_size = len(self.controllers)
+
+    def get_index(self, key: str) -> Dict[str, List[int]]:
+        """Get inverted index of controller positions by value of attribute.
+
+        The indexes are built lazily and they are built again if the controllers
+        were replaced or their number changed.
+        """
+        if key not in INDEXED_KEYS:
+            raise KeyError(f"controllers are not indexed by {key}")
+
+        if not self._is_indexed():
+            self.build_indexes()
+
+        return self._indexes[key]
 
 
 def _validate_config(source: Dict[str, Any]) -> Config:
@@ -244,15 +325,88 @@ def load_config_file(path):
         raise JujuSpellError(f"permission denied to read config file {path}") from error
 
 
+def _get_config_hash(paths: List[Path]) -> Optional[str]:
+    """Get hash of config files content.
+
+    The JujuSpell version is part of the hash, so the config is validated again
+    after upgrade. Returns None if any file could not be read.
+    """
+    config_hash = hashlib.sha256(APP_VERSION.encode())
+    try:
+        for path in paths:
+            config_hash.update(str(path).encode() + b"\0")
+            config_hash.update(Path(path).read_bytes() + b"\0")
+    except OSError:
+        return None
+
+    return config_hash.hexdigest()
+
+
+def _load_compiled_config(config_hash: str) -> Optional[Config]:
+    """Load validated config stored for the same config files.
+
+    Only the cache file owned by current user is loaded, since it's unpickled.
+    Returns None if there is no valid compiled config for this hash.
+    """
+    try:
+        with open(CONFIG_CACHE_PATH, "rb") as file:
+            if os.fstat(file.fileno()).st_uid != os.getuid():
+                logger.warning("%s is not owned by user", CONFIG_CACHE_PATH)
+                return None
+
+            cached_hash, config = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as error:  # unpickling could raise almost anything
+        logger.warning("compiled config could not be loaded: %s", error)
+        return None
+
+    if cached_hash != config_hash or not isinstance(config, Config):
+        logger.debug("compiled config is outdated")
+        return None
+
+    return config
+
+
+def _store_compiled_config(config_hash: str, config: Config) -> None:
+    """Store validated config, so it could be loaded without validation."""
+    try:
+        data = pickle.dumps((config_hash, config), protocol=pickle.HIGHEST_PROTOCOL)
+        write_private_file(CONFIG_CACHE_PATH, data)
+        logger.debug("compiled config was stored to %s", CONFIG_CACHE_PATH)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as error:
+        logger.warning("compiled config could not be stored: %s", error)
+
+
 def load_config(
     config_path: Path, personal_config_path: Optional[Path] = None
 ) -> Config:
-    """Load ad validate yaml config file."""
-    source = load_config_file(config_path)
+    """Load ad validate yaml config file.
+
+    The validated config is stored in cache with hash of config files, so the
+    parsing and validation is skipped if the files did not change.
+    """
+    paths = [config_path]
     if personal_config_path and personal_config_path.exists():
+        paths.append(personal_config_path)
+
+    config_hash = _get_config_hash(paths)
+    if config_hash is not None:
+        config = _load_compiled_config(config_hash)
+        if config is not None:
+            logger.info("load compiled config from %s", CONFIG_CACHE_PATH)
+            return config
+
+    source = load_config_file(config_path)
+    if len(paths) > 1:
         personal_source = load_config_file(personal_config_path)
         # Merge personal and default config
         source = merge_configs(source, personal_source)
 
     config = _validate_config(source)
+    # the files could be changed while they were loaded
+    if config_hash is not None and config_hash == _get_config_hash(paths):
+        config.build_indexes()  # store indexes with compiled config
+        _store_compiled_config(config_hash, config)
+
     return config
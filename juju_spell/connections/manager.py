@@ -2,20 +2,27 @@ import asyncio
 import dataclasses
 import logging
 import time
-from typing import Dict, Union
+from typing import Dict, Iterable, Optional, Tuple, Union
 from uuid import UUID
 
 from juju import juju
 from juju.errors import JujuConnectionError
 
 from juju_spell.config import Controller
-from juju_spell.connections.network import BaseConnection, get_connection
+from juju_spell.connections.network import (
+    BaseConnection,
+    get_connection,
+    tunnel_registry,
+)
 from juju_spell.settings import (
     DEFAULT_CONNECTIN_TIMEOUT,
+    DEFAULT_DISCONNECT_TIMEOUT,
+    DEFAULT_MAX_HANDSHAKES,
     DEFAULT_PORT_RANGE,
     DEFAULT_RETRY_BACKOFF,
     DEFUALT_MAX_FRAME_SIZE,
 )
+from juju_spell.timings import timed
 
 logger = logging.getLogger(__name__)
 
@@ -39,37 +46,49 @@ async def controller_direct_connection(
     username: str,
     password: str,
     cacert: str,
+    connection_process: Optional[BaseConnection] = None,
 ):
     """Direct connection to controller without JUJU_DATA.
 
     This is a helper function for connecting to a controller with simple exponential
-    retry and with fix for missing controller_name and controller_uuid.
+    retry and with fix for missing controller_name and controller_uuid. The
+    connection process is checked between attempts, so the connection fails fast if
+    the tunnel died, and the connection is not retried if the connection process
+    already probed that endpoint accepts connections.
     """
+    retry_timeout = DEFAULT_CONNECTIN_TIMEOUT
+    if connection_process is not None and connection_process.probes_ready:
+        retry_timeout = 0  # the endpoint was ready, so it's unreachable behind it
+
     start = time.time()
     attempt: int = 0
     while True:
         try:
-            await controller._connector.connect(
-                endpoint=endpoint,
-                username=username,
-                password=password,
-                cacert=cacert,
-                retries=0,  # disable retires in connection
-                retry_backoff=0,
-            )
+            with timed("connect"):
+                await controller._connector.connect(
+                    endpoint=endpoint,
+                    username=username,
+                    password=password,
+                    cacert=cacert,
+                    retries=0,  # disable retires in connection
+                    retry_backoff=0,
+                )
             controller._connector.controller_uuid = uuid
             controller._connector.controller_name = name
             break
         except JujuConnectionError:
             # Note(rgildein): Connection will raise JujuConnectionError if endpoint
-            # is unreachable. This can happen, for example, when port forwarding is
-            # through a subprocess and the process has not yet started.
+            # is unreachable. This can happen, for example, when traffic is routed
+            # through sshuttle, which can not report that it's ready.
             logger.info("%s connection to controller %s failed", uuid, name)
-            wait = _get_wait_time(attempt, DEFAULT_RETRY_BACKOFF)
-            await asyncio.sleep(wait)
-            if time.time() - start >= DEFAULT_CONNECTIN_TIMEOUT:
+            if connection_process is not None:
+                connection_process.raise_for_exit()
+
+            if time.time() - start >= retry_timeout:
                 raise
 
+            wait = _get_wait_time(attempt, DEFAULT_RETRY_BACKOFF)
+            await asyncio.sleep(wait)
             attempt += 1
             continue
         except Exception as error:
@@ -112,10 +131,17 @@ class ConnectManager(object):
             controller = await connect_manager.get_controller(controller_config)
             ...
         ```
+
+    Concurrent calls for the same controller share one connection in progress and
+    the number of connections established at the same time is limited by
+    DEFAULT_MAX_HANDSHAKES, so parallel runs do not open multiple ssh tunnels to
+    the same controller or overload the jump hosts.
     """
 
     _manager = None
     _connections = {}
+    _connecting: Dict[UUID, "asyncio.Future[juju.Controller]"] = {}
+    _handshakes: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
 
     def __new__(cls):
         if getattr(cls, "_manager") is None:
@@ -128,42 +154,119 @@ class ConnectManager(object):
         """Return list of connections ."""
         return self._connections
 
+    @staticmethod
+    def register(
+        controller_configs: Iterable[Controller], control_persist: Optional[int] = None
+    ) -> None:
+        """Register controllers, which will be connected.
+
+        This allows controllers behind same destination and jumps to share a single
+        ssh tunnel. If control_persist is defined, the ssh master connection remains
+        open in background for that many seconds, so it can be used by later runs.
+        """
+        tunnel_registry.register(controller_configs, control_persist)
+
+    def _get_handshakes_semaphore(self) -> asyncio.Semaphore:
+        """Get semaphore limiting connections established at the same time.
+
+        The semaphore is created for each event loop, since it can not be shared
+        between loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._handshakes is None or self._handshakes[0] is not loop:
+            self.__class__._handshakes = loop, asyncio.Semaphore(DEFAULT_MAX_HANDSHAKES)
+
+        return self._handshakes[1]
+
+    def _forget_connecting(self, uuid: UUID, connecting: asyncio.Future) -> None:
+        """Remove finished connection in progress."""
+        if self._connecting.get(uuid) is connecting:
+            del self._connecting[uuid]
+
     async def _connect(
         self, controller_config: Controller, port_range: range, sshuttle: bool = False
     ) -> juju.Controller:
         """Prepare connection to Controller and return it."""
         logger.info("getting a new connection to controller %s", controller_config.name)
+        stale_connection = self.connections.pop(controller_config.name, None)
+        if stale_connection is not None:
+            # NOTE: the stale connection, e.g. with dropped websocket, is closed
+            # before it's replaced, so its ssh tunnel and ports are released
+            await self._close(stale_connection)
+
         controller = juju.Controller(max_frame_size=DEFUALT_MAX_FRAME_SIZE)
-        controller_endpoint, connection_process = get_connection(
-            controller_config, port_range, sshuttle
-        )
-        connection_process.connect()
-        self.connections[controller_config.name] = Connection(
-            controller, connection_process
-        )
-        await controller_direct_connection(
-            controller,
-            uuid=controller_config.uuid,
-            name=controller_config.name,
-            endpoint=controller_endpoint,
-            username=controller_config.user,
-            password=controller_config.password,
-            cacert=controller_config.ca_cert,
-        )
+        handshakes = self._get_handshakes_semaphore()
+        with timed("handshake_wait"):
+            await handshakes.acquire()
+
+        try:
+            with timed("port_allocation"):
+                controller_endpoint, connection_process = get_connection(
+                    controller_config, port_range, sshuttle
+                )
+
+            with timed("tunnel"):
+                connection_process.connect()
+                self.connections[controller_config.name] = Connection(
+                    controller, connection_process
+                )
+                # NOTE: login only after the tunnel accepts connections, or fail
+                # fast with the error of connection process if the tunnel died
+                await connection_process.wait_ready(DEFAULT_CONNECTIN_TIMEOUT)
+
+            await controller_direct_connection(
+                controller,
+                uuid=controller_config.uuid,
+                name=controller_config.name,
+                endpoint=controller_endpoint,
+                username=controller_config.user,
+                password=controller_config.password,
+                cacert=controller_config.ca_cert,
+                connection_process=connection_process,
+            )
+        finally:
+            handshakes.release()
+
         logger.info("controller %s was connected", controller.controller_name)
         return controller
 
-    async def clean(self):
-        """Close all connections."""
-        for name in self.connections.keys():
-            connection = self.connections[name]
-            await connection.controller.disconnect()  # disconnect controller
-            connection.connection_process.clean()  # clean connection process
-            logger.info(
-                "%s connection was closed", connection.controller.controller_uuid
+    @staticmethod
+    async def _close(connection: Connection) -> None:
+        """Close single connection.
+
+        Disconnecting of controller is limited by DEFAULT_DISCONNECT_TIMEOUT and the
+        connection process is cleaned in executor, since it's waiting for process to
+        be terminated.
+        """
+        uuid = connection.controller.controller_uuid
+        try:
+            await asyncio.wait_for(
+                connection.controller.disconnect(), DEFAULT_DISCONNECT_TIMEOUT
             )
+        except asyncio.TimeoutError:
+            logger.warning("%s disconnecting controller timed out", uuid)
+        except Exception as error:
+            logger.warning("%s disconnecting controller failed: %s", uuid, error)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, connection.connection_process.clean)
+        logger.info("%s connection was closed", uuid)
+
+    async def clean(self):
+        """Close all connections concurrently.
 
+        The connections in progress are cancelled and awaited first, so none of
+        them could be stored after the connections were closed.
+        """
+        connecting = list(self._connecting.values())
+        for future in connecting:
+            future.cancel()  # cancel connections in progress
+
+        self._connecting.clear()
+        await asyncio.gather(*connecting, return_exceptions=True)
+        connections = list(self.connections.values())
         self.connections.clear()
+        await asyncio.gather(*(self._close(connection) for connection in connections))
 
     async def get_controller(
         self,
@@ -183,7 +286,19 @@ class ConnectManager(object):
                 "%s using controller from cache", connection.controller.controller_uuid
             )
             return connection.controller
-        elif connection and reconnect:
-            await connection.controller.disconnect()
 
-        return await self._connect(controller_config, port_range, sshuttle)
+        connecting = self._connecting.get(controller_config.uuid)
+        if connecting is not None:
+            logger.info("%s waiting for connection in progress", controller_config.uuid)
+            return await asyncio.shield(connecting)
+
+        connecting = asyncio.ensure_future(
+            self._connect(controller_config, port_range, sshuttle)
+        )
+        self._connecting[controller_config.uuid] = connecting
+        connecting.add_done_callback(
+            lambda future: self._forget_connecting(controller_config.uuid, future)
+        )
+        # NOTE: shield the connection, so cancelling one caller does not cancel
+        # the connection for other callers waiting for the same controller
+        return await asyncio.shield(connecting)
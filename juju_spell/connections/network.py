@@ -1,42 +1,203 @@
 import abc
+import asyncio
+import atexit
+import fcntl
+import hashlib
 import logging
 import random
 import socket
 import subprocess
-from typing import List, Optional, Tuple
-
-from juju_spell.config import Controller
-from juju_spell.settings import DEFAULT_PORT_RANGE
+import threading
+import weakref
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Collection, Dict, Iterable, List, Optional, Tuple
+
+from juju_spell.config import Connection, Controller
+from juju_spell.exceptions import ConnectionProcessError
+from juju_spell.settings import (
+    DEFAULT_CONNECTIN_TIMEOUT,
+    DEFAULT_PORT_RANGE,
+    DEFAULT_READY_INTERVAL,
+    DEFAULT_TERMINATE_TIMEOUT,
+    JUJUSPELL_DATA,
+    JUJUSPELL_RUNTIME_DIR,
+)
 
 logger = logging.getLogger(__name__)
 
+# all subprocess connections, which need to be cleaned before exit
+_SUBPROCESS_CONNECTIONS: "weakref.WeakSet[BaseSubprocessConnection]" = weakref.WeakSet()
+
 
 def _is_port_free(port: int) -> bool:
-    """Check if port is free to use."""
-    tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = tcp.connect_ex(("localhost", port))
-    tcp.close()
-    return result != 0
+    """Check if port is free to use.
+
+    The port is free if it can be bound, which is both faster and more reliable than
+    trying to connect to it. The SO_REUSEADDR is used the same way as ssh does, so
+    ports in TIME_WAIT state are considered free.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
+        tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            tcp.bind(("localhost", port))
+        except OSError:
+            return False
+
+    return True
+
+
+class PortAllocator:
+    """Allocator of local ports used for port-forwarding.
+
+    The port is reserved in process until it's released, so parallel connections
+    never get the same port. Between JujuSpell processes the port is reserved by
+    lock file `<lock_dir>/<port>.lock` locked with flock, which is released by the
+    operating system even if the process was killed.
+
+    Example:
+    ```python
+    port = port_allocator.reserve(range(17071, 17170))
+    ...  # bind port, e.g. `ssh -L localhost:<port>:...`
+    port_allocator.release(port)
+    ```
+    """
+
+    def __init__(self, lock_dir: Path = JUJUSPELL_DATA / "ports"):
+        """Initialize allocator without reserved ports."""
+        self.lock_dir = lock_dir
+        self._reserved: Dict[int, Optional[IO]] = {}
+        self._lock = threading.Lock()  # ports are released from executor
+
+    def _lock_port(self, port: int) -> Tuple[bool, Optional[IO]]:
+        """Lock port for other processes.
+
+        Returns False if the port is locked by other process. If lock file could not
+        be created, the port is locked only in this process.
+        """
+        try:
+            self.lock_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            lock_file = open(self.lock_dir / f"{port}.lock", "a")
+        except OSError as error:
+            logger.debug("port %d could not be locked: %s", port, error)
+            return True, None
+
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False, None
+
+        return True, lock_file
+
+    @staticmethod
+    def _unlock_port(lock_file: Optional[IO]) -> None:
+        """Unlock port for other processes."""
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def reserve(self, port_range: range, exclude: Collection[int] = ()) -> int:
+        """Reserve free port from range.
+
+        The ports are checked from random position in range, so processes started
+        at the same time do not compete for the same ports.
+        """
+        if len(port_range) == 0:
+            raise ValueError(f"Could not find a free port in range {port_range}")
+
+        offset = random.randrange(len(port_range))
+        with self._lock:
+            for index in range(len(port_range)):
+                port = port_range[(offset + index) % len(port_range)]
+                if port in exclude or port in self._reserved:
+                    continue
+
+                locked, lock_file = self._lock_port(port)
+                if not locked:
+                    continue
+
+                if not _is_port_free(port):
+                    self._unlock_port(lock_file)
+                    continue
+
+                self._reserved[port] = lock_file
+                logger.debug("free port %d was reserved", port)
+                return port
+
+        raise ValueError(f"Could not find a free port in range {port_range}")
+
+    def release(self, port: int) -> None:
+        """Release reserved port."""
+        with self._lock:
+            if port not in self._reserved:
+                return
+
+            self._unlock_port(self._reserved.pop(port))
+            logger.debug("port %d was released", port)
 
 
-def get_free_tcp_port(port_range: range) -> int:
+port_allocator = PortAllocator()
+
+
+def get_free_tcp_port(port_range: range, exclude: Collection[int] = ()) -> int:
     """Get free TCP port from range.
 
     This function will return free port on local system. This port will be used to
-    port-forward remote controller to localhost:<port>.
+    port-forward remote controller to localhost:<port>. Ports in exclude are
+    skipped. The port is reserved until it's released by `port_allocator.release`.
+    """
+    return port_allocator.reserve(port_range, exclude)
+
+
+def _split_local_target(local_target: str) -> Tuple[str, int]:
+    """Split local target to host and port, the host is optional."""
+    host, _, port = local_target.rpartition(":")
+    return host or "localhost", int(port)
+
+
+async def _is_target_ready(host: str, port: int) -> bool:
+    """Check if target accepts connections."""
+    try:
+        _, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return False
+
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+
+async def _wait_for_local_target(
+    connection: "BaseSubprocessConnection", local_target: str, timeout: float
+) -> None:
+    """Wait until local target accepts connections.
+
+    The connection process is checked before each probe, so failure is raised with
+    the error of process as soon as the process exits.
     """
-    list_of_ports = list(port_range)
-    random.shuffle(list_of_ports)  # randomly shuffle list of ports
+    host, port = _split_local_target(local_target)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        connection.raise_for_exit()
+        if await _is_target_ready(host, port):
+            logger.debug("local target %s is ready", local_target)
+            return
 
-    for port in list_of_ports:
-        if _is_port_free(port):
-            logger.debug("free port %d was found", port)
-            return port
+        if loop.time() >= deadline:
+            raise ConnectionProcessError(
+                f"local target {local_target} was not ready in {timeout}s"
+            )
 
-    raise ValueError(f"Could not find a free port in range {port_range}")
+        await asyncio.sleep(DEFAULT_READY_INTERVAL)
 
 
 class BaseConnection(metaclass=abc.ABCMeta):
+    # the `wait_ready` probes that endpoint accepts connections, so connecting to
+    # the endpoint does not need to be retried
+    probes_ready: bool = False
+
     @property
     @abc.abstractmethod
     def is_connected(self) -> bool:  # pragma: no cover
@@ -56,6 +217,16 @@ class BaseConnection(metaclass=abc.ABCMeta):
         """Clean/terminate/close connection."""
         ...
 
+    async def wait_ready(self, timeout: float = DEFAULT_CONNECTIN_TIMEOUT) -> None:
+        """Wait until connection is ready to be used.
+
+        Raise ConnectionProcessError if connection failed or if it was not ready
+        within timeout.
+        """
+
+    def raise_for_exit(self) -> None:
+        """Raise ConnectionProcessError if connection failed."""
+
 
 class EmptyConnection(BaseConnection):
     """Empty connection for controller with direct access."""
@@ -79,6 +250,7 @@ class BaseSubprocessConnection(BaseConnection):
     def __init__(self):
         """Define empty process."""
         self.process: Optional[subprocess.Popen] = None
+        _SUBPROCESS_CONNECTIONS.add(self)
 
     @property
     def is_connected(self) -> bool:
@@ -91,13 +263,44 @@ class BaseSubprocessConnection(BaseConnection):
     def connect(self) -> None:
         raise NotImplementedError
 
+    def raise_for_exit(self) -> None:
+        """Raise ConnectionProcessError with process error if process exited."""
+        if self.process is None or self.process.poll() is None:
+            return
+
+        stderr = self.process.stderr.read() if self.process.stderr else b""
+        error = stderr.decode(errors="replace").strip() if stderr else "no error output"
+        raise ConnectionProcessError(
+            f"connection process exited with code {self.process.returncode}: {error}"
+        )
+
+    async def wait_ready(self, timeout: float = DEFAULT_CONNECTIN_TIMEOUT) -> None:
+        """Check that process did not exit."""
+        self.raise_for_exit()
+
     def clean(self) -> None:
-        """Terminate connection subprocess."""
-        if self.process is not None:
-            self.process.terminate()
+        """Terminate connection subprocess.
+
+        The process is terminated and if it does not exit within
+        DEFAULT_TERMINATE_TIMEOUT, it will be killed.
+        """
+        if self.process is None:
+            return
+
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=DEFAULT_TERMINATE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning(
+                "process %s was not terminated, killing it", self.process.pid
+            )
+            self.process.kill()
+            self.process.wait()
 
 
 class SshPortForwardSubprocess(BaseSubprocessConnection):
+    probes_ready = True
+
     def __init__(
         self,
         local_target: str,
@@ -119,7 +322,8 @@ class SshPortForwardSubprocess(BaseSubprocessConnection):
         ```
         is equivalent to
         ```bash
-        ssh -N -L localhost:17071:10.1.1.99:17070 -J bastion gandalf@customer
+        ssh -o ExitOnForwardFailure=yes -N -L localhost:17071:10.1.1.99:17070 \
+            -J bastion gandalf@customer
         ```
         and it will port-forward the `10.1.1.99:17070` to `localhost:17071`.
 
@@ -137,29 +341,294 @@ class SshPortForwardSubprocess(BaseSubprocessConnection):
         self.remote_target = remote_target
         self.destination = destination
         self.jumps = jumps
+        self.forwards: List[Tuple[str, str]] = [(local_target, remote_target)]
+
+    def _get_ssh_options(self) -> List[str]:
+        """Get additional ssh options.
+
+        The ssh exits if any port-forward could not be created, e.g. local port is
+        already used, so it's not reported as ready.
+        """
+        return ["-o", "ExitOnForwardFailure=yes"]
+
+    def add_forward(self, local_target: str, remote_target: str) -> None:
+        """Add another port-forward to the same ssh tunnel.
+
+        :param local_target: bind_address:port to which remote target will be
+                             port-forwarded
+        :param remote_target: remote host and port, which will be port-forwarded
+        """
+        if self.process is not None:
+            raise RuntimeError("port-forward can not be added to running ssh tunnel")
+
+        self.forwards.append((local_target, remote_target))
+
+    def is_running(self) -> bool:
+        """Return True if ssh tunnel is running."""
+        return self.process is not None and self.process.poll() is None
 
     def connect(self) -> None:
         """Create ssh tunnel."""
-        logger.info(
-            "port forwarding %s to %s via %s",
-            self.remote_target,
-            self.local_target,
-            self.destination,
+        for local_target, remote_target in self.forwards:
+            logger.info(
+                "port forwarding %s to %s via %s",
+                remote_target,
+                local_target,
+                self.destination,
+            )
+
+        cmd = ["ssh", self.destination, *self._get_ssh_options(), "-N"]
+        for local_target, remote_target in self.forwards:
+            cmd.extend(["-L", f"{local_target}:{remote_target}"])
+
+        if self.jumps:
+            cmd.append(" ".join(f"-J {jump}" for jump in self.jumps))
+
+        logger.debug("cmd `%s` will be executed", cmd)
+        self.process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
-        cmd = [
-            "ssh",
-            self.destination,
-            "-N",
-            "-L",
-            f"{self.local_target}:{self.remote_target}",
+
+    async def wait_ready(
+        self,
+        timeout: float = DEFAULT_CONNECTIN_TIMEOUT,
+        local_target: Optional[str] = None,
+    ) -> None:
+        """Wait until port-forward accepts connections.
+
+        :param local_target: local target of port-forward, the first one is used if
+                             it's not defined
+        """
+        await _wait_for_local_target(self, local_target or self.forwards[0][0], timeout)
+
+
+class SshControlMasterPortForward(SshPortForwardSubprocess):
+    def __init__(
+        self,
+        local_target: str,
+        remote_target: str,
+        destination: str,
+        jumps: Optional[List[str]] = None,
+        control_persist: int = 600,
+    ):
+        """Configure ssh port-forward through persistent master connection.
+
+        Example:
+        Call this object as follows
+        ```python
+        connection = SshControlMasterPortForward(
+            "localhost:17071", "10.1.1.99:17070", "gandalf@customer", ["bastion"]
+        )
+        connection.connect()
+        await connection.wait_ready()
+        ...
+        connection.clean()
+        ```
+        is equivalent to
+        ```bash
+        ssh gandalf@customer -S <control-path> -O check || \
+            ssh gandalf@customer -S <control-path> -o ControlMaster=yes \
+                -o ControlPersist=600 -f -N -J bastion
+        ssh gandalf@customer -S <control-path> -O forward \
+            -L localhost:17071:10.1.1.99:17070
+        ...
+        ssh gandalf@customer -S <control-path> -O cancel \
+            -L localhost:17071:10.1.1.99:17070
+        ```
+        The master connection is started only if it does not exist yet or if it
+        died. The ssh client forks the master to background after authentication
+        and exits, and the master stays in background for `control_persist` seconds
+        after the last port-forward was canceled, so other controllers and later
+        JujuSpell runs can use it without ssh handshake.
+
+        :param control_persist: how long (in seconds) the master connection remains
+                                open in the background
+        """
+        super().__init__(local_target, remote_target, destination, jumps)
+        self.control_persist = control_persist
+        self._added_forwards: List[Tuple[str, str]] = []
+        self._ready_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def control_path(self) -> Path:
+        """Path to control socket of master connection.
+
+        The path is hashed, because the length of socket path is limited.
+        """
+        target = " ".join([self.destination, *(self.jumps or [])])
+        name = hashlib.sha1(target.encode()).hexdigest()[:16]
+        return JUJUSPELL_RUNTIME_DIR / name
+
+    def _get_ssh_options(self) -> List[str]:
+        """Get ssh options to start master connection in background."""
+        return [
+            "-S",
+            str(self.control_path),
+            "-o",
+            "ControlMaster=yes",
+            "-o",
+            f"ControlPersist={self.control_persist}",
+            "-f",
         ]
+
+    async def _control(self, command: str, *args: str) -> Tuple[int, str]:
+        """Send control command, e.g. `check` or `forward`, to master connection.
+
+        The command is run without blocking event loop and its exit code and error
+        output are returned.
+
+        raises: asyncio.TimeoutError if command did not finish in time
+        """
+        cmd = ["ssh", self.destination, "-S", str(self.control_path), "-O", command]
+        cmd.extend(args)
+        logger.debug("cmd `%s` will be executed", cmd)
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(
+                process.communicate(), DEFAULT_TERMINATE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+
+        assert process.returncode is not None
+        return process.returncode, stderr.decode(errors="replace").strip()
+
+    async def is_master_running(self) -> bool:
+        """Return True if master connection is running."""
+        try:
+            returncode, _ = await self._control("check")
+        except asyncio.TimeoutError:
+            return False
+
+        return returncode == 0
+
+    def is_running(self) -> bool:
+        """Return True unless master connection failed to start.
+
+        The ssh client, which started master, exits with code 0 once the master is
+        in background, so its exit code does not tell if the tunnel is running.
+        The master is checked and restarted if needed in `wait_ready`, so it's not
+        checked here on event loop.
+        """
+        return self.process is None or self.process.poll() in (None, 0)
+
+    def raise_for_exit(self) -> None:
+        """Raise ConnectionProcessError if master connection could not be started."""
+        if self.process is not None and self.process.poll() not in (None, 0):
+            super().raise_for_exit()
+
+    def connect(self) -> None:
+        """Prepare directory for control socket of master connection.
+
+        The master connection is started, if it's not running yet, in `wait_ready`,
+        so the `ssh -O check` does not block event loop.
+        """
+        JUJUSPELL_RUNTIME_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    async def _start_master(self, deadline: float) -> None:
+        """Start master connection in background and wait until it's ready."""
+        # NOTE: the control socket of killed master is not removed and ssh would
+        # not start new master with existing socket
+        self.control_path.unlink(missing_ok=True)
+        logger.info("starting ssh master connection via %s", self.destination)
+        cmd = ["ssh", self.destination, *self._get_ssh_options(), "-N"]
         if self.jumps:
-            cmd.append(" ".join(f"-J {jump}" for jump in self.jumps))
+            cmd.extend(["-J", ",".join(self.jumps)])
 
         logger.debug("cmd `%s` will be executed", cmd)
         self.process = subprocess.Popen(
             cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
+        self._added_forwards.clear()  # new master has no port-forwards
+        loop = asyncio.get_running_loop()
+        while self.process.poll() is None:
+            if loop.time() >= deadline:
+                raise ConnectionProcessError(
+                    f"ssh master connection via {self.destination} was not ready"
+                )
+
+            await asyncio.sleep(DEFAULT_READY_INTERVAL)
+
+        self.raise_for_exit()
+
+    async def _add_forwards(self) -> None:
+        """Add port-forwards to master connection, which were not added yet."""
+        for local_target, remote_target in self.forwards:
+            if (local_target, remote_target) in self._added_forwards:
+                continue
+
+            logger.info(
+                "port forwarding %s to %s via %s",
+                remote_target,
+                local_target,
+                self.destination,
+            )
+            forward = f"{local_target}:{remote_target}"
+            try:
+                returncode, error = await self._control("forward", "-L", forward)
+            except asyncio.TimeoutError as timeout_error:
+                raise ConnectionProcessError(
+                    f"port-forward {forward} timed out"
+                ) from timeout_error
+
+            if returncode != 0:
+                raise ConnectionProcessError(
+                    f"port-forward {forward} failed: {error or 'no error output'}"
+                )
+
+            self._added_forwards.append((local_target, remote_target))
+
+    async def wait_ready(
+        self,
+        timeout: float = DEFAULT_CONNECTIN_TIMEOUT,
+        local_target: Optional[str] = None,
+    ) -> None:
+        """Start master connection if needed and add port-forwards to it.
+
+        The controllers sharing the tunnel wait for each other, so the master is
+        started and port-forwards are added only once.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if self._ready_lock is None:
+            self._ready_lock = asyncio.Lock()
+
+        async with self._ready_lock:
+            if await self.is_master_running():
+                logger.info("using ssh master connection via %s", self.destination)
+            else:
+                await self._start_master(deadline)
+
+            await self._add_forwards()
+
+        await super().wait_ready(max(deadline - loop.time(), 0), local_target)
+
+    def clean(self) -> None:
+        """Cancel port-forwards in master connection and terminate client process.
+
+        It's called from executor, so the commands are run synchronously.
+        """
+        for local_target, remote_target in self._added_forwards:
+            cmd = ["ssh", self.destination, "-S", str(self.control_path)]
+            cmd.extend(["-O", "cancel", "-L", f"{local_target}:{remote_target}"])
+            logger.debug("cmd `%s` will be executed", cmd)
+            try:
+                subprocess.run(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=DEFAULT_TERMINATE_TIMEOUT,
+                    check=False,
+                )
+            except subprocess.TimeoutExpired:
+                logger.warning("canceling port-forward %s timed out", local_target)
+
+        self._added_forwards.clear()
+        super().clean()
 
 
 class SshuttleSubprocess(BaseSubprocessConnection):
@@ -210,6 +679,222 @@ class SshuttleSubprocess(BaseSubprocessConnection):
         )
 
 
+class SharedSshPortForward(BaseConnection):
+    """Port-forward of single controller through ssh tunnel shared with others."""
+
+    probes_ready = True
+
+    def __init__(
+        self,
+        registry: "SshTunnelRegistry",
+        tunnel: SshPortForwardSubprocess,
+        local_target: str,
+        port: int,
+    ):
+        """Initialize port-forward, which is part of the shared tunnel."""
+        self.registry = registry
+        self.tunnel = tunnel
+        self.local_target = local_target
+        self.port = port
+
+    @property
+    def is_connected(self) -> bool:
+        return self.tunnel.is_connected
+
+    def connect(self) -> None:
+        """Start the shared ssh tunnel, if it's not running yet."""
+        self.registry.acquire(self)
+
+    async def wait_ready(self, timeout: float = DEFAULT_CONNECTIN_TIMEOUT) -> None:
+        """Wait until port-forward of this controller accepts connections."""
+        await self.tunnel.wait_ready(timeout, self.local_target)
+
+    def raise_for_exit(self) -> None:
+        """Raise ConnectionProcessError if the shared ssh tunnel failed."""
+        self.tunnel.raise_for_exit()
+
+    def clean(self) -> None:
+        """Terminate the shared ssh tunnel, if no other controller is using it."""
+        self.registry.release(self)
+
+
+class SshTunnelRegistry:
+    """Registry of ssh tunnels shared by controllers.
+
+    Controllers behind the same destination and jumps are port-forwarded through
+    single ssh process with multiple `-L` options, so the ssh handshake is done only
+    once per site instead of once per controller. The tunnel is created for the first
+    controller of the group and contains port-forwards for all registered controllers
+    from the same group, which do not have port-forward yet.
+
+    Example:
+    ```python
+    tunnel_registry.register(controller_configs)
+    forward = tunnel_registry.get_forward(controller_config, port_range)
+    forward.connect()  # start ssh tunnel or use already running one
+    ...
+    forward.clean()  # terminate ssh tunnel if no one else is using it
+    ```
+    """
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._peers: Dict[Tuple[str, Tuple[str, ...]], List[Controller]] = defaultdict(
+            list
+        )
+        self._forwards: Dict[str, SharedSshPortForward] = {}
+        self._users: Dict[SshPortForwardSubprocess, int] = {}
+        self.control_persist: Optional[int] = None
+        self._lock = threading.Lock()  # port-forwards are released from executor
+
+    @staticmethod
+    def _get_key(connection: Connection) -> Tuple[str, Tuple[str, ...]]:
+        """Get key of tunnel group."""
+        return connection.destination, tuple(connection.jumps or [])
+
+    def register(
+        self,
+        controller_configs: Iterable[Controller],
+        control_persist: Optional[int] = None,
+    ) -> None:
+        """Register controllers, which could share ssh tunnel.
+
+        If control_persist is defined, new tunnels are created through persistent
+        ssh master connection, see SshControlMasterPortForward.
+        """
+        self.control_persist = control_persist
+        for controller_config in controller_configs:
+            if controller_config.connection is None:
+                continue
+
+            peers = self._peers[self._get_key(controller_config.connection)]
+            if all(peer.uuid != controller_config.uuid for peer in peers):
+                peers.append(controller_config)
+
+    def _drop_tunnel(self, tunnel: SshPortForwardSubprocess) -> None:
+        """Remove all port-forwards of tunnel from registry and release their ports.
+
+        The registry lock must be held by caller.
+        """
+        self._users.pop(tunnel, None)
+        for uuid, forward in list(self._forwards.items()):
+            if forward.tunnel is tunnel:
+                del self._forwards[uuid]
+                port_allocator.release(forward.port)
+
+    def _create_tunnel(
+        self, local_target: str, remote_target: str, destination: str, jumps: List[str]
+    ) -> SshPortForwardSubprocess:
+        """Create new ssh tunnel."""
+        if self.control_persist is not None:
+            return SshControlMasterPortForward(
+                local_target,
+                remote_target,
+                destination,
+                jumps or None,
+                control_persist=self.control_persist,
+            )
+
+        return SshPortForwardSubprocess(
+            local_target, remote_target, destination, jumps or None
+        )
+
+    def get_forward(
+        self, controller_config: Controller, port_range: range = DEFAULT_PORT_RANGE
+    ) -> SharedSshPortForward:
+        """Get port-forward for controller."""
+        with self._lock:
+            return self._get_forward(controller_config, port_range)
+
+    def _get_forward(
+        self, controller_config: Controller, port_range: range
+    ) -> SharedSshPortForward:
+        """Get port-forward for controller with registry lock held."""
+        assert controller_config.connection is not None, "controller without ssh"
+        forward = self._forwards.get(controller_config.uuid)
+        if forward is not None and forward.tunnel in self._users:
+            if not forward.tunnel.is_running():  # ssh tunnel died
+                self._drop_tunnel(forward.tunnel)
+                forward = None
+
+        if forward is not None:
+            logger.debug("%s using shared ssh tunnel", controller_config.uuid)
+            return forward
+
+        key = self._get_key(controller_config.connection)
+        peers = [
+            peer
+            for peer in self._peers.get(key, [])
+            if peer.uuid != controller_config.uuid and peer.uuid not in self._forwards
+        ]
+        port = get_free_tcp_port(port_range)
+        destination, jumps = key
+        tunnel = self._create_tunnel(
+            f"localhost:{port}", controller_config.endpoint, destination, list(jumps)
+        )
+        self._forwards[controller_config.uuid] = SharedSshPortForward(
+            self, tunnel, f"localhost:{port}", port
+        )
+        for peer in peers:
+            try:
+                port = get_free_tcp_port(port_range)
+            except ValueError:
+                logger.warning("no free port left for other controllers in tunnel")
+                break
+
+            tunnel.add_forward(f"localhost:{port}", peer.endpoint)
+            self._forwards[peer.uuid] = SharedSshPortForward(
+                self, tunnel, f"localhost:{port}", port
+            )
+
+        logger.info(
+            "%s ssh tunnel via %s has %d port-forwards",
+            controller_config.uuid,
+            destination,
+            len(tunnel.forwards),
+        )
+        return self._forwards[controller_config.uuid]
+
+    def acquire(self, forward: SharedSshPortForward) -> None:
+        """Start tunnel of port-forward if it's not running and count its users."""
+        with self._lock:
+            if forward.tunnel not in self._users:
+                forward.tunnel.connect()
+
+            self._users[forward.tunnel] = self._users.get(forward.tunnel, 0) + 1
+
+    def release(self, forward: SharedSshPortForward) -> None:
+        """Terminate tunnel of port-forward if no one else is using it.
+
+        The port-forwards of all controllers are released concurrently from
+        executor, so only the bookkeeping is done with registry lock held and the
+        tunnel is terminated by the last user outside of it.
+        """
+        with self._lock:
+            users = self._users.get(forward.tunnel, 0) - 1
+            if users > 0:
+                self._users[forward.tunnel] = users
+                return
+
+            # the tunnel is not running if it was already dropped, e.g. it died
+            running = forward.tunnel in self._users
+            self._drop_tunnel(forward.tunnel)
+
+        if running:
+            forward.tunnel.clean()
+
+
+tunnel_registry = SshTunnelRegistry()
+
+
+@atexit.register
+def _clean_subprocess_connections() -> None:
+    """Clean all subprocess connections, so no process is left behind."""
+    for connection in list(_SUBPROCESS_CONNECTIONS):
+        if connection.process is not None and connection.process.poll() is None:
+            connection.clean()
+
+
 def get_connection(
     controller_config: Controller,
     port_range: range = DEFAULT_PORT_RANGE,
@@ -220,14 +905,8 @@ def get_connection(
     process = EmptyConnection()  # controller has direct access
 
     if controller_config.connection and not sshuttle:
-        port = get_free_tcp_port(port_range)
-        controller_endpoint = f"localhost:{port}"
-        process = SshPortForwardSubprocess(
-            controller_endpoint,
-            controller_config.endpoint,
-            controller_config.connection.destination,
-            controller_config.connection.jumps,
-        )
+        process = tunnel_registry.get_forward(controller_config, port_range)
+        controller_endpoint = process.local_target
     elif controller_config.connection and sshuttle:
         process = SshuttleSubprocess(
             controller_config.connection.subnets,
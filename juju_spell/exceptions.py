@@ -23,3 +23,7 @@ class JujuSpellError(Exception):
 
 class Abort(JujuSpellError):
     """An internal signalling exception that signals JujuSpell to abort."""
+
+
+class ConnectionProcessError(JujuSpellError):
+    """Connection process (ssh tunnel, sshuttle, ...) failed or is not ready."""
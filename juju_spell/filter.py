@@ -1,60 +1,207 @@
-"""Filter logic."""
+"""Filter logic.
+
+The filter expression is a space separated list of conditions, all of them must
+match the controller:
+
+    key=v1,v2      value of key is any of v1, v2 (for tags any of tags is v1 or v2)
+    key!=v1,v2     value of key is none of v1, v2 (for tags no tag is v1 or v2)
+    tags&=v1,v2    controller has all of the tags v1 and v2
+    risk<=3        value of key is lower or equal than 3 (also <, >= and >)
+
+The values of `=`, `!=` and `&=` conditions could be glob patterns, e.g.
+`name=prod-*`.
+"""
+import fnmatch
+import operator
 import re
 import typing as t
-from dataclasses import asdict
+from dataclasses import dataclass
 
-from .config import Config, Controller
+from .config import INDEXED_KEYS, Config, Controller
 
-# --filter "a=v1,v2,v3 b=v4,v5,v6"
-FILTER_EXPRESSION_REGEX = r"([A-Za-z]+)=([^=]+)(?:\s|$)"
+# --filter "a=v1,v2,v3 b!=v4 risk<=3"
+FILTER_CONDITION_REGEX = r"([A-Za-z_]+)(!=|&=|<=|>=|=|<|>)(.+)"
+_FILTER_CONDITION_PATTERN = re.compile(FILTER_CONDITION_REGEX)
+# conditions are separated by whitespaces followed by next key and operator
+_FILTER_SEPARATOR_PATTERN = re.compile(r"\s+(?=[A-Za-z_]+(?:!=|&=|<|>|=))")
+GLOB_CHARACTERS = frozenset("*?[")
+COMPARISON_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+NUMERIC_KEYS = ("risk",)  # keys supporting comparison operators
+LIST_KEYS = ("tags",)  # keys supporting all-of operator
 
 
-def make_controllers_filter(filter_expression):
-    """Build filter func to config's controller.
+@dataclass(frozen=True)
+class Condition:
+    """Single condition of filter expression."""
 
-    If the filter_str is "a=v1,v2,v3 b=v4,v5,v6"
-    This will iterate over keys [a,b] to check the value
-    inside controller match the values list a in [v1,v2,v3]
-    and b in [v4,v5,v6].
+    key: str
+    operator: str
+    values: t.FrozenSet[str]
+
+    @property
+    def has_globs(self) -> bool:
+        """Check if any value is glob pattern."""
+        return any(not GLOB_CHARACTERS.isdisjoint(value) for value in self.values)
+
+
+def parse_filter_expression(filter_expression: str) -> t.List[Condition]:
+    """Parse filter expression to list of conditions.
+
+    The "a=v1,v2,v3 b!=v4 risk<=3" expression is parsed to
+    [Condition("a", "=", {"v1", "v2", "v3"}), Condition("b", "!=", {"v4"}),
+    Condition("risk", "<=", {"3"})].
+
+    raises: ValueError if expression is not valid
     """
+    conditions = []
+    for term in _FILTER_SEPARATOR_PATTERN.split(filter_expression.strip()):
+        if not term:
+            continue
+
+        match = _FILTER_CONDITION_PATTERN.fullmatch(term)
+        if match is None:
+            raise ValueError(f"invalid condition `{term}`")
+
+        key, operator_, values = match.groups()
+        if operator_ in COMPARISON_OPERATORS:
+            if key not in NUMERIC_KEYS:
+                raise ValueError(f"`{operator_}` is not supported for `{key}`")
+            if not values.strip().isdigit():
+                raise ValueError(f"`{term}` must be compared to integer")
+        if operator_ == "&=" and key not in LIST_KEYS:
+            raise ValueError(f"`{operator_}` is not supported for `{key}`")
+
+        conditions.append(Condition(key, operator_, frozenset(values.split(","))))
+
+    return conditions
+
+
+def _get_strings(value: t.Any) -> t.Sequence[str]:
+    """Get controller attribute as strings."""
+    if not value:
+        return ()
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return (value,)
+    return (str(value),)  # e.g. risk, same as in index
+
+
+def _compile_values(values: t.Iterable[str]) -> t.Callable[[str], bool]:
+    """Compile values or glob patterns to function matching single string."""
+    values = frozenset(values)
+    if GLOB_CHARACTERS.isdisjoint("".join(values)):
+        return values.__contains__
+
+    pattern = re.compile("|".join(fnmatch.translate(value) for value in values))
+    return lambda value: pattern.match(value) is not None
+
+
+def _compile_condition(condition: Condition) -> t.Callable[[Controller], bool]:
+    """Compile condition to predicate over controller attribute."""
+    key = condition.key
+    if condition.operator in COMPARISON_OPERATORS:
+        compare = COMPARISON_OPERATORS[condition.operator]
+        (limit,) = (int(value) for value in condition.values)
+
+        def _compare(controller: Controller) -> bool:
+            target_val = getattr(controller, key, None)
+            return target_val is not None and compare(target_val, limit)
+
+        return _compare
 
-    def serialize(values):
-        if isinstance(values, str):
-            return set(values.split(","))
-        if isinstance(values, list):
-            return set(values)
-        return values
+    if condition.operator == "&=":
+        matches = [_compile_values([value]) for value in condition.values]
 
-    def filter(controller: Controller):
+        def _all_of(controller: Controller) -> bool:
+            targets = _get_strings(getattr(controller, key, None))
+            return all(any(map(match, targets)) for match in matches)
+
+        return _all_of
+
+    match = _compile_values(condition.values)
+    if condition.operator == "!=":
+        return lambda controller: not any(
+            map(match, _get_strings(getattr(controller, key, None)))
+        )
+
+    return lambda controller: any(
+        map(match, _get_strings(getattr(controller, key, None)))
+    )
+
+
+def _make_filter(conditions: t.List[Condition]) -> t.Callable[[Controller], bool]:
+    """Build filter func from parsed conditions."""
+    predicates = [_compile_condition(condition) for condition in conditions]
+
+    def filter(controller: Controller) -> bool:
         """Filter controllers."""
-        controller_asdict = asdict(controller)
-        for key, values in re.findall(
-            FILTER_EXPRESSION_REGEX,
-            filter_expression,
-        ):
-            target_val: t.Union[t.List[str], str] = controller_asdict.get(key)
-            if not target_val:
-                return False
-            if (
-                isinstance(target_val, list)
-                and len(serialize(target_val) & serialize(values)) <= 0
-            ):
-                return False
-            if isinstance(target_val, str) and asdict(controller).get(
-                key
-            ) not in serialize(values):
+        for predicate in predicates:
+            if not predicate(controller):
                 return False
         return True
 
     return filter
 
 
+def make_controllers_filter(filter_expression: str) -> t.Callable[[Controller], bool]:
+    """Build filter func to config's controller.
+
+    If the filter_str is "a=v1,v2,v3 b=v4,v5,v6"
+    This will iterate over keys [a,b] to check the value
+    inside controller match the values list a in [v1,v2,v3]
+    and b in [v4,v5,v6].
+
+    The expression is parsed only once and the controller attributes are accessed
+    directly, so filtering does not copy the controllers.
+    """
+    return _make_filter(parse_filter_expression(filter_expression))
+
+
+def _is_indexed(condition: Condition) -> bool:
+    """Check if condition could be resolved by config indexes."""
+    return (
+        condition.key in INDEXED_KEYS
+        and condition.operator in ("=", "&=")
+        and not condition.has_globs
+    )
+
+
 def get_filtered_config(config: Config, filter_expression: str) -> Config:
+    """Filter controllers in config.
+
+    The `=` and `&=` conditions on indexed keys without globs are resolved by
+    intersection of config indexes, so only the remaining conditions are checked for
+    each selected controller.
+    """
     if filter_expression == "":
         return config
 
-    controller_filter = make_controllers_filter(filter_expression)
-    config.controllers = list(filter(controller_filter, config.controllers))
+    conditions = parse_filter_expression(filter_expression)
+    positions: t.Optional[t.Set[int]] = None
+    for condition in filter(_is_indexed, conditions):
+        index = config.get_index(condition.key)
+        postings = [set(index.get(value, ())) for value in condition.values]
+        if condition.operator == "&=":
+            matched = set.intersection(*postings)
+        else:
+            matched = set.union(*postings)
+
+        positions = matched if positions is None else positions & matched
+
+    controllers = config.controllers
+    if positions is not None:
+        controllers = [controllers[position] for position in sorted(positions)]
+
+    controller_filter = _make_filter(
+        [condition for condition in conditions if not _is_indexed(condition)]
+    )
+    config.controllers = list(filter(controller_filter, controllers))
     if len(config.controllers) <= 0:
         raise ValueError("No match controller")
 
@@ -0,0 +1,134 @@
+"""Projection of command outputs to selected fields.
+
+The fields expression is a comma separated list of dotted paths to fields of
+command output, where `*` matches any key of dict or any item of list, e.g.
+
+    applications.*.units.*.workload_status.status,applications.*.units.*.machine
+
+The juju `Type` objects and dataclasses are projected to dicts with selected
+fields only. Missing fields are skipped, values without any of the fields are
+skipped too and such output is projected to None.
+"""
+import functools
+import re
+import typing as t
+
+FIELD_PATH_REGEX = r"[^.,\s]+(?:\.[^.,\s]+)*"
+_FIELD_PATH_PATTERN = re.compile(FIELD_PATH_REGEX)
+WILDCARD = "*"
+_MISSING = object()
+
+# tree of paths, where empty tree selects the whole value
+_Tree = t.Dict[str, "_Tree"]
+
+
+def parse_fields_expression(fields_expression: str) -> t.List[t.Tuple[str, ...]]:
+    """Parse fields expression to list of paths.
+
+    The "a.*.b,c" expression is parsed to [("a", "*", "b"), ("c",)].
+
+    raises: ValueError if expression is not valid
+    """
+    paths = []
+    for field in fields_expression.split(","):
+        field = field.strip()
+        if not _FIELD_PATH_PATTERN.fullmatch(field):
+            raise ValueError(f"invalid field `{field}`")
+
+        paths.append(tuple(field.split(".")))
+
+    return paths
+
+
+def _merge(tree: _Tree, other: _Tree) -> _Tree:
+    """Merge two trees of paths."""
+    if not tree or not other:
+        return {}  # the whole value is selected by one of them
+
+    merged = dict(tree)
+    for key, subtree in other.items():
+        merged[key] = _merge(merged[key], subtree) if key in merged else subtree
+
+    return merged
+
+
+def _build_tree(paths: t.Iterable[t.Tuple[str, ...]]) -> _Tree:
+    """Build tree of paths."""
+    tree: t.Optional[_Tree] = None
+    for path in paths:
+        path_tree: _Tree = {}
+        for key in reversed(path):
+            path_tree = {key: path_tree}
+
+        tree = path_tree if tree is None else _merge(tree, path_tree)
+
+    return tree or {}
+
+
+def _get_attributes(value: t.Any) -> t.Optional[t.Dict[str, t.Any]]:
+    """Get fields of dict, juju `Type` or dataclass."""
+    if isinstance(value, dict):
+        return value
+
+    return getattr(value, "__dict__", None)
+
+
+def _compile(tree: _Tree) -> t.Callable[[t.Any], t.Any]:
+    """Compile tree of paths to function selecting fields of value."""
+    if not tree:
+        return lambda value: value
+
+    wildcard = None
+    if WILDCARD in tree:
+        wildcard = _compile(tree[WILDCARD])
+        # the fields selected by name are also selected by wildcard
+        tree = {key: _merge(subtree, tree[WILDCARD]) for key, subtree in tree.items()}
+
+    selectors = {key: _compile(subtree) for key, subtree in tree.items()}
+
+    def _select(value: t.Any) -> t.Any:
+        if isinstance(value, (list, tuple)):
+            if wildcard is None:
+                return _MISSING
+
+            items = [item for item in map(wildcard, value) if item is not _MISSING]
+            return items if items or not value else _MISSING
+
+        attributes = _get_attributes(value)
+        if attributes is None:
+            return _MISSING
+
+        if wildcard is None:
+            pairs = (
+                (key, selector(attributes[key]))
+                for key, selector in selectors.items()
+                if key in attributes
+            )
+        else:
+            pairs = (
+                (key, selectors.get(key, wildcard)(item))
+                for key, item in attributes.items()
+            )
+
+        # value without any of selected fields is missing, but empty value is kept
+        selected = {key: item for key, item in pairs if item is not _MISSING}
+        return selected if selected or not attributes else _MISSING
+
+    return _select
+
+
+@functools.lru_cache(maxsize=None)
+def compile_projection(fields_expression: str) -> t.Callable[[t.Any], t.Any]:
+    """Compile fields expression to function projecting output.
+
+    The expression is parsed and compiled only once, so the function could be
+    applied to output of each controller.
+    """
+    select = _compile(_build_tree(parse_fields_expression(fields_expression)))
+
+    def projection(output: t.Any) -> t.Any:
+        """Project output to selected fields."""
+        projected = select(output)
+        return None if projected is _MISSING else projected
+
+    return projection
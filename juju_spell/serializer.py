@@ -0,0 +1,132 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2022 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Serializer of command outputs to JSON.
+
+The juju `Type` objects, e.g. `FullStatus`, are serialized by the list of their
+fields, which is taken from the `_toSchema` mapping of the class only once, so
+libjuju does not need to be imported here. The attributes set on objects by
+commands, e.g. `storage` of status, are serialized after the fields.
+"""
+import contextlib
+import dataclasses
+import json
+from typing import Any, Callable, Dict, Tuple
+
+UNKNOWN_FIELDS = "unknown_fields"  # extra fields of juju `Type` objects
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+_EMPTY_TYPES = (str, list, dict)  # types of values dropped if empty
+_FIELDS: Dict[Tuple[type, bool], Tuple[str, ...]] = {}
+
+
+def _get_fields(cls: type, drop_unknown: bool) -> Tuple[str, ...]:
+    """Get cached fields of juju `Type` or dataclass."""
+    key = (cls, drop_unknown)
+    fields = _FIELDS.get(key)
+    if fields is None:
+        if hasattr(cls, "_toSchema"):  # juju `Type`
+            fields = tuple(cls._toSchema)
+            if not drop_unknown:
+                fields += (UNKNOWN_FIELDS,)
+        elif dataclasses.is_dataclass(cls):
+            fields = tuple(field.name for field in dataclasses.fields(cls))
+        else:
+            fields = ()
+
+        _FIELDS[key] = fields
+
+    return fields
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects, which are not juju `Type`, dataclass or primitive."""
+    if isinstance(obj, Exception):
+        return f"{obj.__class__.__name__}: {obj}"
+
+    with contextlib.suppress(TypeError):
+        return vars(obj)
+
+    return str(obj)
+
+
+def _make_converter(drop_empty: bool, drop_unknown: bool) -> Callable[[Any], Any]:
+    """Make function converting single object to dict or other JSON type."""
+
+    def _convert(obj: Any) -> Any:
+        fields = _get_fields(type(obj), drop_unknown)
+        if not fields:
+            return _default(obj)
+        if not drop_empty and not drop_unknown:
+            return obj.__dict__  # all fields without copying, same as vars
+
+        attributes = obj.__dict__
+        all_fields = _get_fields(type(obj), False)
+        if len(attributes) > len(all_fields):  # attributes set by command
+            fields += tuple(name for name in attributes if name not in all_fields)
+
+        if not drop_empty:
+            return {field: attributes[field] for field in fields}
+
+        # drop None and empty values, but keep False and zero
+        return {
+            field: value
+            for field in fields
+            if (value := attributes[field])
+            or not (value is None or isinstance(value, _EMPTY_TYPES))
+        }
+
+    return _convert
+
+
+def to_primitive(obj: Any, drop_empty: bool = False, drop_unknown: bool = False) -> Any:
+    """Convert object to dicts, lists and primitive types.
+
+    Args:
+        obj: object to convert, e.g. list of results with juju `FullStatus`
+        drop_empty: drop fields of objects with None or empty value
+        drop_unknown: drop `unknown_fields` of juju `Type` objects
+    """
+    convert = _make_converter(drop_empty, drop_unknown)
+
+    def _walk(value: Any) -> Any:
+        if isinstance(value, _PRIMITIVE_TYPES):
+            return value
+        if isinstance(value, dict):
+            return {key: _walk(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_walk(item) for item in value]
+
+        return _walk(convert(value))
+
+    return _walk(obj)
+
+
+def dumps(
+    obj: Any,
+    compact: bool = False,
+    drop_empty: bool = False,
+    drop_unknown: bool = False,
+) -> str:
+    """Serialize object to JSON.
+
+    The compact output is a single line produced directly by the C encoder, which
+    calls the converter only for objects. The indented output is slow for objects,
+    so the whole object is converted to primitive types first.
+    """
+    if compact:
+        return json.dumps(obj, default=_make_converter(drop_empty, drop_unknown))
+
+    return json.dumps(to_primitive(obj, drop_empty, drop_unknown), indent=1)
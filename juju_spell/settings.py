@@ -17,6 +17,16 @@ JUJUSPELL_DATA = pathlib.Path(
     )
 )
 
+JUJUSPELL_RUNTIME_DIR = pathlib.Path(
+    os.environ.get("JUJUSPELL_RUNTIME_DIR", pathlib.Path(JUJUSPELL_DATA / "run"))
+)
+
+DAEMON_SOCKET_PATH = JUJUSPELL_RUNTIME_DIR / "daemon.sock"
+JUJUSPELL_CACHE_DIR = pathlib.Path(
+    os.environ.get("JUJUSPELL_CACHE_DIR", pathlib.Path(JUJUSPELL_DATA / "cache"))
+)
+CONFIG_CACHE_PATH = JUJUSPELL_CACHE_DIR / "config.pickle"
+
 CONFIG_PATH = os.environ.get(
     "JUJUSPELL_CONFIG",
     pathlib.Path(JUJUSPELL_DATA / "config.yaml"),
@@ -25,9 +35,21 @@ PERSONAL_CONFIG_PATH = os.environ.get(
     "JUJUSPELL_PERSONAL_CONFIG", pathlib.Path(JUJUSPELL_DATA / "config.personal.yaml")
 )
 DEFAULT_PORT_RANGE = range(17071, 17170)
+DEFAULT_MAX_PARALLEL = 10  # controllers
+DEFAULT_BATCH_SIZE = 5  # controllers
+DEFAULT_MODEL_PARALLEL = 5  # models in single controller
 DEFAULT_RETRY_BACKOFF = 1.5  # seconds
 DEFAULT_CONNECTIN_TIMEOUT = 60  # seconds
 DEFUALT_MAX_FRAME_SIZE = 6**24
+DEFAULT_MAX_HANDSHAKES = 8  # connections established at the same time
+DEFAULT_DISCONNECT_TIMEOUT = 10  # seconds
+DEFAULT_TERMINATE_TIMEOUT = 5  # seconds
+DEFAULT_READY_INTERVAL = 0.05  # seconds
+DEFAULT_DAEMON_READ_LIMIT = 256 * 2**20  # bytes
+DEFAULT_MODELS_CACHE_TTL = 600  # seconds
+DEFAULT_PREVIEW_SIZE = 2048  # characters of object logged
+DEFAULT_OUTPUT_CHUNK_SIZE = 2**16  # characters of output printed at once
+DEFAULT_TABLE_COLUMN_WIDTH = 40  # characters
 
 
 CROSS_FINGERS = """
@@ -0,0 +1,102 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2022 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Timings of phases of running command on controller.
+
+The runner starts new timings for each controller and the phases are measured by
+`timed` wherever they are run, e.g. in connect manager. The timings are stored in
+context variable, so the connection task started for controller writes to the
+timings of the same controller.
+"""
+import contextlib
+import math
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# phases in order in which they are run
+PHASES = (
+    "handshake_wait",  # waiting for other connections to be established
+    "port_allocation",  # reserving local port for ssh port-forward
+    "tunnel",  # starting ssh tunnel and waiting until it accepts connections
+    "connect",  # websocket and TLS connect and login, sum of all attempts
+    "execute",  # execution of command
+    "total",  # whole run on controller including connection
+    "serialization",  # formatting of result
+)
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "juju_spell_timings", default=None
+)
+
+
+def start_timings() -> Dict[str, float]:
+    """Start new timings in current context and return them."""
+    timings: Dict[str, float] = {}
+    _timings.set(timings)
+    return timings
+
+
+@contextlib.contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Measure phase and add its duration to current timings, if there are any."""
+    timings = _timings.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            elapsed = time.perf_counter() - start
+            timings[phase] = round(timings.get(phase, 0) + elapsed, 3)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Get percentile of sorted values by nearest-rank method."""
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def summarize(
+    timings: Iterable[Tuple[str, Dict[str, float]]], slowest: int = 5
+) -> List[str]:
+    """Summarize timings of controllers to lines of text.
+
+    The summary contains p50, p95 and max of each phase over all controllers and
+    the slowest controllers by total time.
+    """
+    timings = list(timings)
+    phases = [
+        phase
+        for phase in PHASES
+        if any(phase in controller_timings for _, controller_timings in timings)
+    ]
+    lines = [f"{'phase':<16}{'p50':>9}{'p95':>9}{'max':>9}"]
+    for phase in phases:
+        values = sorted(
+            controller_timings[phase]
+            for _, controller_timings in timings
+            if phase in controller_timings
+        )
+        lines.append(
+            f"{phase:<16}{percentile(values, 50):>9.3f}{percentile(values, 95):>9.3f}"
+            f"{values[-1]:>9.3f}"
+        )
+
+    by_total = sorted(timings, key=lambda item: item[1].get("total", 0), reverse=True)
+    lines.append("slowest controllers (total time in seconds):")
+    for name, controller_timings in by_total[:slowest]:
+        lines.append(f"  {name}: {controller_timings.get('total', 0):.3f}")
+
+    return lines
@@ -15,9 +15,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Utilities for JujuSpell."""
+import reprlib
 import secrets
 from collections import defaultdict
-from typing import Dict, Iterable, List
+from itertools import islice
+from typing import Any, Dict, Iterable, List
+
+from juju_spell.settings import DEFAULT_PREVIEW_SIZE
 
 
 def strtobool(value: str) -> bool:
@@ -96,3 +100,79 @@ def merge_list_of_dict_by_key(key: str, lists: List[List[Dict]]):
 def random_password(length: int = 30):
     """Generate random password."""
     return secrets.token_urlsafe(length)
+
+
+class _PreviewRepr(reprlib.Repr):
+    """Repr with limited number of items and depth, which does not render the rest.
+
+    Objects with attributes, e.g. libjuju types or dataclasses, are rendered as
+    `Name({attributes})` with the same limits.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.maxlevel = 4
+        self.maxdict = self.maxlist = self.maxtuple = self.maxset = 10
+        self.maxstring = self.maxother = 100
+
+    def repr_dict(self, obj: Dict, level: int) -> str:
+        """Render dictionary without sorting all its keys."""
+        if not obj:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+
+        items = [
+            f"{self.repr1(key, level - 1)}: {self.repr1(value, level - 1)}"
+            for key, value in islice(obj.items(), self.maxdict)
+        ]
+        if len(obj) > self.maxdict:
+            items.append("...")
+
+        return "{" + ", ".join(items) + "}"
+
+    def repr_instance(self, obj: Any, level: int) -> str:
+        """Render object by its attributes."""
+        attributes = getattr(obj, "__dict__", None)
+        if not isinstance(attributes, dict):
+            return super().repr_instance(obj, level)
+
+        return f"{type(obj).__name__}({self.repr_dict(attributes, level)})"
+
+
+_preview_repr = _PreviewRepr()
+
+
+class Preview:
+    """Lazy size-capped text of object for logs.
+
+    The text is rendered only if the message is really formatted and only limited
+    part of object is rendered, so logging huge outputs, e.g. status of model, costs
+    the same as logging small ones.
+
+    Example:
+    ```python
+    logger.debug("status: %s", Preview(status))
+    ```
+    """
+
+    __slots__ = ("obj", "size")
+
+    def __init__(self, obj: Any, size: int = DEFAULT_PREVIEW_SIZE):
+        """Initialize preview of object."""
+        self.obj = obj
+        self.size = size
+
+    def __str__(self) -> str:
+        """Render preview of object."""
+        if isinstance(self.obj, str):
+            text = self.obj[: self.size + 1]
+        else:
+            text = _preview_repr.repr(self.obj)
+
+        if len(text) > self.size:
+            return f"{text[:self.size]}...<truncated>"
+
+        return text
+
+    __repr__ = __str__
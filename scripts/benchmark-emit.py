@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark of logging command outputs of growing size in BRIEF mode.
+
+The cost of logging the output should stay flat regardless of its size, since
+only size-capped previews are rendered.
+
+Usage: PYTHONPATH=. ./scripts/benchmark-emit.py [--units 100 1000 10000]
+"""
+import argparse
+import logging
+import pathlib
+import tempfile
+import timeit
+
+from craft_cli import EmitterMode, emit
+from juju.client._definitions import (
+    ApplicationStatus,
+    DetailedStatus,
+    FullStatus,
+    UnitStatus,
+)
+
+from juju_spell.cli.utils import emit_debug, emit_trace
+from juju_spell.utils import Preview
+
+logger = logging.getLogger("benchmark")
+
+
+def get_status(units):
+    """Get synthetic status with given number of units."""
+    applications = {}
+    for i in range(max(units // 10, 1)):
+        applications[f"app-{i}"] = ApplicationStatus(
+            charm=f"cs:app-{i}",
+            units={
+                f"app-{i}/{j}": UnitStatus(
+                    machine=str(j),
+                    public_address=f"10.0.{i % 256}.{j}",
+                    workload_status=DetailedStatus(status="active", info="ready"),
+                )
+                for j in range(10)
+            },
+        )
+
+    return [{"context": {"name": "controller"}, "output": FullStatus(applications)}]
+
+
+def log_eagerly(retval):
+    """Log output as the commands did before."""
+    emit.trace(f"raw output of status command: {retval}")
+    emit.debug(f"formatting `{retval}`")
+    logger.debug("model status: %s", retval)
+
+
+def log_lazily(retval):
+    """Log output with previews."""
+    emit_trace("raw output of {} command: {}", "status", retval)
+    emit_debug("formatting `{}`", retval)
+    logger.debug("model status: %s", Preview(retval))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.DEBUG)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = pathlib.Path(tmp_dir, "benchmark.log")
+        emit.init(EmitterMode.BRIEF, "benchmark", "benchmark", log_filepath=log_path)
+        try:
+            for units in args.units:
+                retval = get_status(units)
+                for name, func in [("eager", log_eagerly), ("lazy", log_lazily)]:
+                    best = min(
+                        timeit.repeat(
+                            lambda: func(retval), number=1, repeat=args.repeat
+                        )
+                    )
+                    print(f"{units:>7} units {name:>6}: {best * 1000:8.2f} ms")
+        finally:
+            emit.ended_ok()
+
+
+if __name__ == "__main__":
+    main()
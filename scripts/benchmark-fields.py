@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark of memory retained by results with and without `--fields`.
+
+Each controller returns its own synthetic FullStatus, which is released as soon
+as the result is created, as it would be after the connection is closed.
+
+Usage: PYTHONPATH=. ./scripts/benchmark-fields.py [--controllers 50 --units 1000]
+"""
+import argparse
+import time
+import tracemalloc
+from argparse import Namespace
+
+from juju.client._definitions import (
+    ApplicationStatus,
+    DetailedStatus,
+    FullStatus,
+    UnitStatus,
+)
+
+from juju_spell.assignment.runner import get_result, project
+from juju_spell.commands.base import Result
+from juju_spell.config import Controller
+
+FIELDS = (
+    "applications.*.units.*.workload_status.status,"
+    "applications.*.units.*.workload_version,applications.*.units.*.machine"
+)
+
+
+def get_status(units):
+    """Get synthetic status with given number of units."""
+    return FullStatus(
+        applications={
+            f"app-{i}": ApplicationStatus(
+                charm=f"cs:app-{i}",
+                units={
+                    f"app-{i}/{j}": UnitStatus(
+                        machine=str(j),
+                        public_address=f"10.0.{i % 256}.{j}",
+                        workload_version="1.0",
+                        workload_status=DetailedStatus(status="active", info="ready"),
+                    )
+                    for j in range(10)
+                },
+            )
+            for i in range(max(units // 10, 1))
+        }
+    )
+
+
+def collect(controllers, units, fields):
+    """Collect results of controllers as runner does."""
+    parsed_args = Namespace(fields=fields)
+    results = []
+    for i in range(controllers):
+        controller = Controller(
+            uuid=f"uuid-{i}",
+            name=f"controller-{i}",
+            customer="customer",
+            owner="owner",
+            endpoint="localhost:17070",
+            ca_cert="ca-cert",
+            user="user",
+            password="password",
+            model_mapping={},
+        )
+        output = Result(True, output=get_status(units))
+        results.append(get_result(controller, project(output, parsed_args)))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--controllers", type=int, default=50)
+    parser.add_argument("--units", type=int, default=1000)
+    args = parser.parse_args()
+
+    for name, fields in [("all fields", None), ("--fields", FIELDS)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = collect(args.controllers, args.units, fields)
+        elapsed = time.perf_counter() - start
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del results
+        print(f"{name:>10}: {elapsed:6.2f} s {retained / 2**20:8.1f} MiB retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of filtering large inventory of controllers.
+
+Usage: PYTHONPATH=. ./scripts/benchmark-filter.py [-n 100000] [-f "customer=c1"]
+"""
+import argparse
+import dataclasses
+import timeit
+import uuid
+
+from juju_spell.config import Config, Connection, Controller
+from juju_spell.filter import get_filtered_config, make_controllers_filter
+
+CA_CERT = "-----BEGIN CERTIFICATE-----\n{}\n-----END CERTIFICATE-----".format(
+    "A" * 1500
+)
+
+
+def get_controllers(number):
+    """Get synthetic controllers."""
+    return [
+        Controller(
+            uuid=uuid.uuid4(),
+            name=f"controller-{i}",
+            customer=f"customer-{i % 100}",
+            owner=f"owner-{i % 10}",
+            endpoint=f"10.0.{i // 256 % 256}.{i % 256}:17070",
+            ca_cert=CA_CERT,
+            user="admin",
+            password="password",
+            model_mapping={"lma": "lma", "default": "production"},
+            tags=[f"tag-{i % 7}", f"tag-{i % 11}"],
+            risk=i % 5 + 1,
+            connection=Connection(destination=f"bastion-{i % 100}"),
+        )
+        for i in range(number)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=100_000)
+    parser.add_argument("-f", "--filter", default="customer=customer-1 tags=tag-3")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    controllers = get_controllers(args.number)
+    config = Config(controllers=controllers)
+    predicate = make_controllers_filter(args.filter)
+
+    def _filter():
+        config.controllers = controllers  # get_filtered_config replaces them
+        get_filtered_config(config, args.filter)
+
+    def _predicate():
+        # linear scan of all controllers without indexes
+        list(filter(predicate, controllers))
+
+    def _asdict():
+        # the cost of copying each controller, as the filter did before
+        for controller in controllers:
+            dataclasses.asdict(controller)
+
+    matched = list(filter(predicate, controllers))
+    print(f"{len(matched)} of {args.number} controllers match `{args.filter}`")
+    benchmarks = [
+        ("build indexes", config.build_indexes),
+        ("filter", _filter),
+        ("predicate", _predicate),
+        ("asdict only", _asdict),
+    ]
+    for name, func in benchmarks:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(
+            f"{name:>13}: {best * 1000:.1f} ms total, "
+            f"{best / args.number * 1e6:.3f} us per controller"
+        )
+
+
+if __name__ == "__main__":
+    main()
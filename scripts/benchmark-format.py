@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark of memory used by printing results in all output formats.
+
+The results of many controllers are written by formatters one by one, so the
+peak memory should not grow with the size of whole output. The status of each
+controller has the same synthetic FullStatus, so only the output is measured.
+
+Usage: PYTHONPATH=. ./scripts/benchmark-format.py [--controllers 400]
+"""
+import argparse
+import json
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+from craft_cli import EmitterMode, emit
+from juju.client._definitions import (
+    ApplicationStatus,
+    DetailedStatus,
+    FullStatus,
+    UnitStatus,
+)
+
+from juju_spell.cli.formatters import FORMATTERS, MessageStream
+
+
+def get_results(controllers, units):
+    """Get synthetic results of controllers sharing the same status."""
+    status = FullStatus(
+        applications={
+            f"app-{i}": ApplicationStatus(
+                charm=f"cs:app-{i}",
+                units={
+                    f"app-{i}/{j}": UnitStatus(
+                        machine=str(j),
+                        workload_status=DetailedStatus(status="active", info="ready"),
+                    )
+                    for j in range(10)
+                },
+            )
+            for i in range(max(units // 10, 1))
+        }
+    )
+    return [
+        {
+            "context": {"uuid": f"uuid-{i}", "name": f"controller-{i}"},
+            "success": True,
+            "output": status,
+            "error": None,
+        }
+        for i in range(controllers)
+    ]
+
+
+def print_at_once(results):
+    """Print results as the commands did before."""
+    emit.message(json.dumps(results, default=vars, indent=1))
+
+
+def print_by_formatter(results, name):
+    """Print results by formatter."""
+    with MessageStream() as output:
+        formatter = FORMATTERS[name](output)
+        formatter.start()
+        for result in results:
+            formatter.write(result)
+            output.flush()
+
+        formatter.end()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--controllers", type=int, default=400)
+    parser.add_argument("--units", type=int, default=100)
+    args = parser.parse_args()
+
+    results = get_results(args.controllers, args.units)
+    cases = [("json at once", print_at_once)] + [
+        (name, lambda results, name=name: print_by_formatter(results, name))
+        for name in FORMATTERS
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = pathlib.Path(tmp_dir, "benchmark.log")
+        emit.init(EmitterMode.QUIET, "benchmark", "benchmark", log_filepath=log_path)
+        try:
+            for name, func in cases:
+                start = time.perf_counter()
+                func(results)
+                elapsed = time.perf_counter() - start
+                tracemalloc.start()  # slows down the printing, so it's run again
+                func(results)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{name:>12}: {elapsed:6.2f} s {peak / 2**20:8.1f} MiB peak")
+        finally:
+            emit.ended_ok()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Check import time of JujuSpell CLI against a budget.
+
+The `juju-spell --help` is run with `python -X importtime` and the cumulative
+import time of the slowest top-level imports is reported. The script fails if
+the total import time is over the budget.
+
+Usage: PYTHONPATH=. ./scripts/benchmark-import.py [--budget 150] [-- status --help]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# import time:     self [us] |   cumulative | imported package
+IMPORTTIME_REGEX = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def get_import_times(args, repeat):
+    """Get best cumulative import time of each top-level module in us."""
+    env = {**os.environ, "JUJUSPELL_VERBOSITY_LEVEL": "quiet"}
+    best = {}
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "juju_spell", *args],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        if process.returncode != 0:
+            errors = [
+                line
+                for line in process.stderr.splitlines()
+                if not line.startswith("import time:")
+            ]
+            sys.exit(
+                f"`juju-spell {' '.join(args)}` failed with code "
+                f"{process.returncode}:\n"
+                + "\n".join(errors)
+            )
+
+        times = {}
+        for line in process.stderr.splitlines():
+            match = IMPORTTIME_REGEX.match(line)
+            if match and len(match.group(3)) == 1:  # top-level import
+                times[match.group(4)] = int(match.group(2))
+
+        for module, cumulative in times.items():
+            best[module] = min(best.get(module, cumulative), cumulative)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=150, help="milliseconds")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-t", "--top", type=int, default=10)
+    parser.add_argument("args", nargs="*", default=["--help"])
+    args = parser.parse_args()
+
+    times = get_import_times(args.args, args.repeat)
+    total = sum(times.values()) / 1000
+    for module, cumulative in sorted(times.items(), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(f"{cumulative / 1000:8.1f} ms  {module}")
+
+    print(f"{total:8.1f} ms  total (budget {args.budget:.0f} ms)")
+    if total > args.budget:
+        print("import time is over budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark of serializing juju status to JSON.
+
+Compares `json.dumps(..., default=vars)`, which was used to format the outputs,
+with JujuSpell serializer on synthetic FullStatus with 5,000 units.
+
+Usage: PYTHONPATH=. ./scripts/benchmark-serializer.py [--units 5000]
+"""
+import argparse
+import json
+import timeit
+
+from juju.client._definitions import (
+    ApplicationStatus,
+    DetailedStatus,
+    FullStatus,
+    MachineStatus,
+    UnitStatus,
+)
+
+from juju_spell.serializer import dumps
+
+
+def get_status(units):
+    """Get synthetic status with given number of units."""
+    applications = {}
+    for i in range(max(units // 10, 1)):
+        applications[f"app-{i}"] = ApplicationStatus(
+            charm=f"cs:app-{i}",
+            status=DetailedStatus(status="active", info="ready"),
+            units={
+                f"app-{i}/{j}": UnitStatus(
+                    machine=str(j),
+                    public_address=f"10.0.{i % 256}.{j}",
+                    agent_status=DetailedStatus(status="idle"),
+                    workload_status=DetailedStatus(status="active", info="ready"),
+                )
+                for j in range(10)
+            },
+        )
+
+    machines = {
+        str(j): MachineStatus(id_=str(j), dns_name=f"10.0.0.{j}") for j in range(10)
+    }
+    status = FullStatus(applications=applications, machines=machines)
+    return [{"context": {"name": "controller"}, "success": True, "output": status}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, default=5000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    retval = get_status(args.units)
+    cases = [
+        ("vars indent", lambda: json.dumps(retval, default=vars, indent=1)),
+        ("serializer indent", lambda: dumps(retval)),
+        (
+            "serializer indent, no empty/unknown",
+            lambda: dumps(retval, drop_empty=True, drop_unknown=True),
+        ),
+        ("vars compact", lambda: json.dumps(retval, default=vars)),
+        ("serializer compact", lambda: dumps(retval, compact=True)),
+        (
+            "serializer compact, no empty/unknown",
+            lambda: dumps(retval, compact=True, drop_empty=True, drop_unknown=True),
+        ),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        size = len(func())
+        print(f"{name:>36}: {best * 1000:8.2f} ms {size:>10} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2023 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import pytest
+
+from juju_spell.config import Config, Controller
+
+
+@pytest.fixture
+def runner_config(test_config_dict):
+    """Return config with controllers objects."""
+    controllers = [
+        Controller(**{**controller, "connection": None})
+        for controller in test_config_dict["controllers"]
+    ]
+    return Config(controllers, connection={"port-range": range(17071, 17170)})
@@ -0,0 +1,165 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2023 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for assignment.daemon."""
+import asyncio
+from argparse import Namespace
+from unittest import mock
+from unittest.mock import AsyncMock
+
+import pytest
+from juju.client._definitions import DetailedStatus
+
+from juju_spell.assignment.daemon import (
+    Daemon,
+    _get_command,
+    is_daemon_running,
+    request,
+)
+from juju_spell.commands.ping import PingCommand
+from juju_spell.exceptions import JujuSpellError
+
+
+def test_get_command():
+    """Test getting command from path."""
+    assert _get_command("juju_spell.commands.ping.PingCommand") is PingCommand
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "os.system",
+        "juju_spell.commands.ping.logging",
+        "juju_spell.commands.ping.Controller",
+        "juju_spell.commands.ping.Unknown",
+    ],
+)
+def test_get_command_exception(path):
+    """Test getting command, which is not JujuSpell command."""
+    with pytest.raises(JujuSpellError):
+        _get_command(path)
+
+
+def test_is_daemon_running(tmp_path):
+    """Test checking daemon with missing or stale socket."""
+    socket_path = tmp_path / "daemon.sock"
+    assert is_daemon_running(socket_path) is False
+
+    socket_path.touch()  # socket left by killed daemon
+    assert is_daemon_running(socket_path) is False
+
+
+async def _start_daemon(daemon: Daemon) -> asyncio.Task:
+    """Start daemon and wait until it's listening."""
+    task = asyncio.create_task(daemon.serve())
+    while not is_daemon_running(daemon.socket_path):
+        await asyncio.sleep(0.01)
+
+    return task
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.daemon.connect_manager")
+@mock.patch("juju_spell.assignment.daemon.stream")
+async def test_daemon_request(
+    mock_stream, mock_connect_manager, runner_config, tmp_path
+):
+    """Test running command by daemon."""
+    mock_connect_manager.clean = AsyncMock()
+
+    async def _stream(config, command, parsed_args, clean):
+        for controller in config.controllers:
+            yield {"context": {"uuid": controller.uuid}, "error": ValueError("test")}
+
+    mock_stream.side_effect = _stream
+    daemon = Daemon(runner_config, tmp_path / "daemon.sock")
+    task = await _start_daemon(daemon)
+    parsed_args = Namespace(run_type="serial", models=["default"])
+
+    results = [
+        result
+        async for result in request(
+            runner_config, PingCommand, parsed_args, daemon.socket_path
+        )
+    ]
+
+    assert results == [
+        {"context": {"uuid": controller.uuid}, "error": "ValueError: test"}
+        for controller in runner_config.controllers
+    ]
+    config, command, daemon_parsed_args = mock_stream.call_args.args
+    assert config.controllers == runner_config.controllers
+    assert isinstance(command, PingCommand)
+    assert daemon_parsed_args == parsed_args
+    assert mock_stream.call_args.kwargs == {"clean": False}
+    assert oct(daemon.socket_path.stat().st_mode & 0o777) == oct(0o600)
+
+    # daemon is still running and it can not be started twice
+    with pytest.raises(JujuSpellError):
+        await Daemon(runner_config, daemon.socket_path).serve()
+
+    daemon.stop()
+    await task
+    mock_connect_manager.clean.assert_awaited_once()
+    assert not daemon.socket_path.exists()
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.daemon.connect_manager")
+@mock.patch("juju_spell.assignment.daemon.stream")
+async def test_daemon_request_drop_fields(
+    mock_stream, mock_connect_manager, runner_config, tmp_path
+):
+    """Test daemon drops empty and unknown fields of outputs."""
+    mock_connect_manager.clean = AsyncMock()
+
+    async def _stream(config, command, parsed_args, clean):
+        yield {"output": DetailedStatus(status="active", info="")}
+
+    mock_stream.side_effect = _stream
+    daemon = Daemon(runner_config, tmp_path / "daemon.sock")
+    task = await _start_daemon(daemon)
+    parsed_args = Namespace(drop_empty=True, drop_unknown=True)
+
+    results = [
+        result
+        async for result in request(
+            runner_config, PingCommand, parsed_args, daemon.socket_path
+        )
+    ]
+
+    assert results == [{"output": {"status": "active"}}]
+    daemon.stop()
+    await task
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.daemon.connect_manager")
+async def test_daemon_request_unknown_controller(
+    mock_connect_manager, runner_config, tmp_path
+):
+    """Test daemon reporting error for controller not in its config."""
+    mock_connect_manager.clean = AsyncMock()
+    daemon = Daemon(runner_config, tmp_path / "daemon.sock")
+    task = await _start_daemon(daemon)
+    config = mock.MagicMock()
+    config.controllers = [mock.MagicMock(uuid="unknown-uuid")]
+
+    with pytest.raises(JujuSpellError, match="unknown-uuid are not known to daemon"):
+        async for _ in request(config, PingCommand, Namespace(), daemon.socket_path):
+            pass  # pragma: no cover
+
+    daemon.stop()
+    await task
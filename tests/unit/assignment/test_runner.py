@@ -14,8 +14,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Tests for assignment.runner."""
+import asyncio
+from argparse import Namespace
 from unittest import mock
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -67,3 +69,265 @@ def test_get_result(controller_config, output, exp_result):
     """Test for get_result."""
     result = get_result(controller_config, output)
     assert result == exp_result
+
+
+def test_get_result_timings():
+    """Test get_result adds timings to context."""
+    result = get_result(MagicMock(), Result(True, None, None), {"total": 1.0})
+
+    assert result["context"]["timings"] == {"total": 1.0}
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_parallel(mock_get_controller, runner_config):
+    """Test running command in parallel keeps order of controllers."""
+    from juju_spell.assignment.runner import run_parallel
+
+    parsed_args = Namespace(max_parallel=2)
+    command = MagicMock()
+    command.run = AsyncMock(
+        side_effect=lambda controller, **kwargs: Result(
+            True, kwargs["controller_config"].name
+        )
+    )
+
+    results = await run_parallel(runner_config, command, parsed_args)
+
+    assert [result["output"] for result in results] == [
+        controller.name for controller in runner_config.controllers
+    ]
+    assert mock_get_controller.await_count == len(runner_config.controllers)
+    assert "controller_config" not in vars(parsed_args)
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_parallel_limit(mock_get_controller, runner_config):
+    """Test running command in parallel respect max-parallel limit."""
+    from juju_spell.assignment.runner import run_parallel
+
+    runner_config.controllers = runner_config.controllers * 5
+    runner_config.connection["max-parallel"] = 3
+    running, max_running = 0, 0
+
+    async def _run(controller, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(running, max_running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return Result(True)
+
+    command = MagicMock()
+    command.run = _run
+
+    results = await run_parallel(runner_config, command, Namespace(max_parallel=None))
+
+    assert len(results) == 10
+    assert max_running == 3
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_parallel_isolated_failure(mock_get_controller, runner_config):
+    """Test failed connection to one controller does not affect others."""
+    from juju_spell.assignment.runner import run_parallel
+
+    exp_error = ConnectionError("unreachable")
+    mock_get_controller.side_effect = [exp_error, MagicMock()]
+    command = MagicMock()
+    command.run = AsyncMock(return_value=Result(True, "accessible"))
+
+    results = await run_parallel(runner_config, command, Namespace(max_parallel=1))
+
+    assert results[0]["success"] is False
+    assert str(results[0]["error"]) == str(exp_error)
+    assert results[1]["success"] is True
+    command.run.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_batch_sliding_window(mock_get_controller, runner_config):
+    """Test slow controller does not block starting the others."""
+    from juju_spell.assignment.runner import run_batch
+
+    runner_config.controllers = runner_config.controllers * 3
+    started = []
+
+    async def _run(controller, controller_config, **kwargs):
+        index = len(started)
+        started.append(index)
+        # the first controller is slow, the others are fast
+        await asyncio.sleep(0.1 if index == 0 else 0.001)
+        # all the other controllers were started before the slow one finished
+        return Result(True, len(started) if index == 0 else None)
+
+    command = MagicMock()
+    command.run = _run
+    parsed_args = Namespace(batch_size=2, max_failure_ratio=None)
+
+    results = await run_batch(runner_config, command, parsed_args)
+
+    assert len(results) == 6
+    assert results[0]["output"] == 6
+    assert all(result["success"] for result in results)
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_batch_max_failure_ratio(mock_get_controller, runner_config):
+    """Test batch is stopped after exceeding the maximum failure ratio."""
+    from juju_spell.assignment.runner import run_batch
+
+    runner_config.controllers = runner_config.controllers * 5
+    command = MagicMock()
+    command.run = AsyncMock(return_value=Result(False, error=ValueError("failed")))
+    parsed_args = Namespace(batch_size=2, max_failure_ratio=0.5)
+
+    results = await run_batch(runner_config, command, parsed_args)
+
+    assert len(results) == 10
+    assert command.run.await_count == 2
+    assert not any(result["success"] for result in results)
+    assert "skipped" in str(results[-1]["error"])
+
+
+@pytest.mark.parametrize(
+    "completed, failed, max_failure_ratio, exp_result",
+    [
+        (0, 0, 0.0, False),
+        (10, 5, None, False),
+        (10, 2, 0.2, False),
+        (10, 3, 0.2, True),
+        (1, 1, 0.99, True),
+    ],
+)
+def test_is_failure_ratio_exceeded(completed, failed, max_failure_ratio, exp_result):
+    """Test check of failure ratio."""
+    from juju_spell.assignment.runner import _is_failure_ratio_exceeded
+
+    result = _is_failure_ratio_exceeded(completed, failed, max_failure_ratio)
+
+    assert result is exp_result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("run_type", ["serial", "parallel", "batch"])
+@mock.patch("juju_spell.assignment.runner.connect_manager")
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_stream(
+    mock_get_controller, mock_connect_manager, run_type, runner_config
+):
+    """Test streaming results as soon as controller is done."""
+    from juju_spell.assignment.runner import stream
+
+    mock_connect_manager.clean = AsyncMock()
+
+    async def _run(controller, controller_config, **kwargs):
+        # the first controller is the slowest one
+        if controller_config == runner_config.controllers[0]:
+            await asyncio.sleep(0.05)
+
+        return Result(True, controller_config.name)
+
+    command = MagicMock()
+    command.run = _run
+    parsed_args = Namespace(
+        run_type=run_type, max_parallel=2, batch_size=2, max_failure_ratio=None
+    )
+
+    results = [result async for result in stream(runner_config, command, parsed_args)]
+
+    exp_names = [controller.name for controller in runner_config.controllers]
+    if run_type != "serial":
+        exp_names.reverse()  # the slowest controller is the last one
+
+    assert [result["output"] for result in results] == exp_names
+    mock_connect_manager.clean.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "fields, output, exp_output",
+    [
+        (None, Result(True, {"a": 1, "b": 2}), Result(True, {"a": 1, "b": 2})),
+        ("a", Result(True, {"a": 1, "b": 2}), Result(True, {"a": 1})),
+        ("a", Result(False, error=ValueError()), Result(False, error=mock.ANY)),
+    ],
+)
+def test_project(fields, output, exp_output):
+    """Test projecting output of command to selected fields."""
+    from juju_spell.assignment.runner import project
+
+    assert project(output, Namespace(fields=fields)) == exp_output
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("run_type", ["serial", "parallel", "batch"])
+@mock.patch("juju_spell.assignment.runner.connect_manager")
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_fields(
+    mock_get_controller, mock_connect_manager, run_type, runner_config
+):
+    """Test results contain only fields selected by `--fields`."""
+    from juju_spell.assignment.runner import run
+
+    mock_connect_manager.clean = AsyncMock()
+    command = MagicMock()
+    command.run = AsyncMock(
+        side_effect=lambda controller, controller_config, **kwargs: Result(
+            True, {"name": controller_config.name, "models": [{"a": 1, "b": 2}]}
+        )
+    )
+    parsed_args = Namespace(
+        run_type=run_type,
+        max_parallel=2,
+        batch_size=2,
+        max_failure_ratio=None,
+        fields="models.*.b",
+    )
+
+    results = await run(runner_config, command, parsed_args)
+
+    assert [result["output"] for result in results] == [
+        {"models": [{"b": 2}]} for _ in runner_config.controllers
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timings", [True, False])
+@pytest.mark.parametrize("run_type", ["serial", "parallel", "batch"])
+@mock.patch("juju_spell.assignment.runner.connect_manager")
+@mock.patch("juju_spell.assignment.runner.get_controller")
+async def test_run_timings(
+    mock_get_controller, mock_connect_manager, run_type, timings, runner_config
+):
+    """Test context of each result contains timings only with `--timings`."""
+    from juju_spell.assignment.runner import run
+    from juju_spell.timings import timed
+
+    async def _run(controller, **kwargs):
+        with timed("execute"):
+            return Result(True, None)
+
+    mock_connect_manager.clean = AsyncMock()
+    command = MagicMock()
+    command.run = AsyncMock(side_effect=_run)
+    parsed_args = Namespace(
+        run_type=run_type,
+        max_parallel=2,
+        batch_size=2,
+        max_failure_ratio=None,
+        fields=None,
+        timings=timings,
+    )
+
+    results = await run(runner_config, command, parsed_args)
+
+    if timings:
+        assert [set(result["context"]["timings"]) for result in results] == [
+            {"execute", "total"} for _ in runner_config.controllers
+        ]
+    else:
+        assert all("timings" not in result["context"] for result in results)
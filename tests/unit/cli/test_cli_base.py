@@ -15,6 +15,8 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Tests for base cli functions."""
 import argparse
+import asyncio
+import json
 import os
 from unittest import mock
 from unittest.mock import MagicMock, patch
@@ -79,10 +81,18 @@ def test_base_cmd_format_output(output, exp_formatted_output, base_cmd):
     assert base_cmd.format_output(output) == exp_formatted_output
 
 
+@patch("juju_spell.cli.base.parse_ratio")
+@patch("juju_spell.cli.base.parse_positive_int")
+@patch("juju_spell.cli.base.parse_fields")
 @patch("juju_spell.cli.base.parse_filter")
 @patch("juju_spell.cli.base.parse_comma_separated_str")
 def test_base_juju_cmd_argument_has_calls(
-    mock_parse_comma_separated_str, mock_parse_filter, base_juju_cmd
+    mock_parse_comma_separated_str,
+    mock_parse_filter,
+    mock_parse_fields,
+    mock_parse_positive_int,
+    mock_parse_ratio,
+    base_juju_cmd,
 ):
     """Test add additional CLI arguments with BaseJujuCMD."""
     parser = MagicMock()
@@ -110,29 +120,104 @@ def test_base_juju_cmd_argument_has_calls(
                 default="",
                 help=(
                     "Key-value pair comma separated string in double quotes e.g., "
-                    '"a=1,2,3 b=4,5,6". '
+                    '"a=1,2,3 b=4,5,6". Supported operators are `=` (any of), `!=` '
+                    "(none of), `&=` (all of tags) and `<`, `<=`, `>`, `>=` for "
+                    'risk, values could be glob patterns, e.g. "name=prod-* '
+                    'risk<=3".'
                 ),
             ),
             mock.call(
                 "--models", type=mock_parse_comma_separated_str, help="model filter"
             ),
+            mock.call(
+                "--format",
+                "--output",
+                dest="format",
+                type=str,
+                choices=["json", "ndjson", "yaml", "table", "csv"],
+                default="json",
+                help=(
+                    "json and yaml print all results in order of controllers, "
+                    "ndjson, table and csv print result of each controller as soon "
+                    "as the controller is done"
+                ),
+            ),
+            mock.call(
+                "--drop-empty",
+                default=False,
+                action="store_true",
+                help="Drop fields with null or empty value from output.",
+            ),
+            mock.call(
+                "--drop-unknown",
+                default=False,
+                action="store_true",
+                help="Drop `unknown_fields` of juju objects from output.",
+            ),
+            mock.call(
+                "--fields",
+                type=mock_parse_fields,
+                default=None,
+                help=(
+                    "Comma separated paths to fields of output, which are kept in "
+                    "results, `*` matches any key or item, e.g. "
+                    '"*.applications.*.units.*.machine,*.model.name".'
+                ),
+            ),
+            mock.call(
+                "--timings",
+                default=False,
+                action="store_true",
+                help=(
+                    "Print summary of time spent in each phase, e.g. connect or "
+                    "execute, and the slowest controllers."
+                ),
+            ),
+            mock.call(
+                "--max-parallel",
+                type=mock_parse_positive_int,
+                default=None,
+                help=(
+                    "Maximum number of controllers running at the same time with "
+                    "`--run-type parallel`. Default is taken from config."
+                ),
+            ),
+            mock.call(
+                "--batch-size",
+                type=mock_parse_positive_int,
+                default=5,
+                help=(
+                    "Number of controllers running at the same time with "
+                    "`--run-type batch`."
+                ),
+            ),
+            mock.call(
+                "--max-failure-ratio",
+                type=mock_parse_ratio,
+                default=None,
+                help=(
+                    "Stop starting new controllers with `--run-type batch` if the "
+                    "ratio of failed controllers is over this value, e.g. 0.2."
+                ),
+            ),
         ]
     )
 
 
 @pytest.mark.asyncio
+@patch("juju_spell.cli.base.is_daemon_running", return_value=False)
 @patch("juju_spell.cli.base.run", new_callable=MagicMock)
 @patch("juju_spell.cli.base.asyncio")
 @patch("juju_spell.cli.base.get_filtered_config")
-async def test_base_juju_cmd_execute(
-    mock_get_filtered_config, mock_asyncio, _, base_juju_cmd
+async def test_base_juju_cmd_get_results(
+    mock_get_filtered_config, mock_asyncio, _, __, base_juju_cmd
 ):
-    """Test add additional CLI arguments with BaseJujuCMD."""
+    """Test getting results of Juju command with BaseJujuCMD."""
     parsed_args = argparse.Namespace(**{"filter": None})
     mock_asyncio.get_event_loop.return_value = loop = MagicMock()
     task = loop.create_task.return_value = MagicMock()
 
-    result = base_juju_cmd.execute(parsed_args)
+    result = base_juju_cmd.get_results(parsed_args)
 
     mock_get_filtered_config.assert_called_once_with(base_juju_cmd.config, None)
     mock_asyncio.get_event_loop.assert_called_once()
@@ -141,13 +226,198 @@ async def test_base_juju_cmd_execute(
     assert result == task.result.return_value
 
 
+@pytest.fixture
+def new_event_loop():
+    """Set new event loop as the current one."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(None)
+
+
+@pytest.mark.parametrize(
+    "output_format, exp_output",
+    [
+        (
+            "json",
+            json.dumps(
+                [{"context": {"uuid": f"uuid-{i}"}} for i in range(3)], indent=1
+            ),
+        ),
+        (
+            "yaml",
+            (
+                "- context:\n    uuid: uuid-0\n- context:\n    uuid: uuid-1\n"
+                "- context:\n    uuid: uuid-2"
+            ),
+        ),
+    ],
+)
+@patch("juju_spell.cli.base.is_daemon_running", return_value=False)
+@patch("juju_spell.cli.base.emit")
+@patch("juju_spell.cli.formatters.emit")
+@patch("juju_spell.cli.base.run")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute(
+    _,
+    mock_run,
+    mock_emit,
+    __,
+    ___,
+    output_format,
+    exp_output,
+    base_juju_cmd,
+    new_event_loop,
+):
+    """Test printing results in order of controllers with BaseJujuCMD."""
+    parsed_args = argparse.Namespace(**{"filter": None, "format": output_format})
+    mock_run.return_value = [{"context": {"uuid": f"uuid-{i}"}} for i in range(3)]
+
+    assert base_juju_cmd.execute(parsed_args) is None
+
+    printed = "\n".join(call.args[0] for call in mock_emit.message.call_args_list)
+    assert printed == exp_output
+
+
+@patch("juju_spell.cli.base.is_daemon_running", return_value=False)
+@patch("juju_spell.cli.formatters.emit")
+@patch("juju_spell.cli.base.stream")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute_ndjson(
+    _, mock_stream, mock_emit, __, base_juju_cmd, new_event_loop
+):
+    """Test streaming of results with BaseJujuCMD."""
+    parsed_args = argparse.Namespace(**{"filter": None, "format": "ndjson"})
+    results = [{"context": {"name": f"controller-{i}"}} for i in range(3)]
+
+    async def _stream(*args):
+        for result in results:
+            yield result
+
+    mock_stream.side_effect = _stream
+
+    assert base_juju_cmd.execute(parsed_args) is None
+
+    mock_emit.message.assert_has_calls(
+        [mock.call(json.dumps(result)) for result in results]
+    )
+
+
+@patch("juju_spell.cli.base.is_daemon_running", return_value=False)
+@patch("juju_spell.cli.formatters.emit")
+@patch("juju_spell.cli.base.stream")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute_broken_pipe(
+    _, mock_stream, mock_emit, __, base_juju_cmd, new_event_loop
+):
+    """Test results are closed if printing failed, e.g. with `| head`."""
+    parsed_args = argparse.Namespace(**{"filter": None, "format": "ndjson"})
+    mock_emit.message.side_effect = BrokenPipeError
+    closed = []
+
+    async def _stream(*args):
+        try:
+            for i in range(3):
+                yield {"context": {"name": f"controller-{i}"}}
+        finally:
+            closed.append(True)  # connections are cleaned here
+
+    mock_stream.side_effect = _stream
+
+    with pytest.raises(BrokenPipeError):
+        base_juju_cmd.execute(parsed_args)
+
+    assert closed == [True]
+
+
+@patch("juju_spell.cli.base.is_daemon_running", return_value=False)
+@patch("juju_spell.cli.base.emit")
+@patch("juju_spell.cli.formatters.emit")
+@patch("juju_spell.cli.base.run")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute_timings(
+    _, mock_run, __, mock_emit, ___, base_juju_cmd, new_event_loop
+):
+    """Test printing summary of timings with `--timings`."""
+    parsed_args = argparse.Namespace(
+        **{"filter": None, "format": "json", "timings": True}
+    )
+    mock_run.return_value = [
+        {"context": {"name": f"controller-{i}", "timings": {"total": float(i)}}}
+        for i in range(3)
+    ]
+
+    assert base_juju_cmd.execute(parsed_args) is None
+
+    summary = [call.args[0] for call in mock_emit.progress.call_args_list]
+    assert summary[0].split() == ["phase", "p50", "p95", "max"]
+    assert [line.split()[0] for line in summary[1:3]] == ["total", "serialization"]
+    assert summary[-3:] == [
+        "  controller-2: 2.000",
+        "  controller-1: 1.000",
+        "  controller-0: 0.000",
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+@patch("juju_spell.cli.base.is_daemon_running", return_value=True)
+@patch("juju_spell.cli.base.emit")
+@patch("juju_spell.cli.formatters.emit")
+@patch("juju_spell.cli.base.daemon_request")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute_by_daemon(
+    mock_get_filtered_config,
+    mock_daemon_request,
+    mock_emit,
+    _,
+    __,
+    output_format,
+    base_juju_cmd,
+    new_event_loop,
+):
+    """Test executing command by daemon with BaseJujuCMD."""
+    parsed_args = argparse.Namespace(**{"filter": None, "format": output_format})
+    controllers = [MagicMock(uuid=f"uuid-{i}") for i in range(3)]
+    mock_get_filtered_config.return_value.controllers = controllers
+    results = [{"context": {"uuid": f"uuid-{i}"}} for i in reversed(range(3))]
+
+    async def _request(*args):
+        for result in results:
+            yield result
+
+    mock_daemon_request.side_effect = _request
+
+    assert base_juju_cmd.execute(parsed_args) is None
+
+    mock_daemon_request.assert_called_once_with(
+        mock_get_filtered_config.return_value, base_juju_cmd.command, parsed_args
+    )
+    printed = "\n".join(call.args[0] for call in mock_emit.message.call_args_list)
+    if output_format == "ndjson":
+        assert printed == "\n".join(json.dumps(result) for result in results)
+    else:  # same order as controllers
+        assert json.loads(printed) == list(reversed(results))
+
+
+def test_base_cmd_run_streamed_output(base_cmd):
+    """Test run from BaseCMD does not print already streamed output."""
+    parsed_args = argparse.Namespace(**{"dry_run": False})
+    base_cmd.execute = MagicMock(return_value=None)
+    base_cmd.format_output = mock_format_output = MagicMock()
+
+    assert base_cmd.run(parsed_args) == 0
+
+    mock_format_output.assert_not_called()
+
+
 def test_base_juju_cmd_execute_exception(base_juju_cmd):
     """Test add additional CLI arguments with BaseJujuCMD."""
     parsed_args = argparse.Namespace(**{"filter": None})
     base_juju_cmd.command = None
 
     with pytest.raises(RuntimeError):
-        base_juju_cmd.execute(parsed_args)
+        base_juju_cmd.get_results(parsed_args)
 
 
 def _create_test_controller(name: str) -> Controller:
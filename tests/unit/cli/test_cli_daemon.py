@@ -0,0 +1,24 @@
+import argparse
+import signal
+from unittest import mock
+
+from juju_spell.cli.daemon import DaemonCMD
+
+
+@mock.patch("juju_spell.cli.daemon.asyncio")
+@mock.patch("juju_spell.cli.daemon.Daemon")
+def test_execute(mock_daemon, mock_asyncio):
+    """Test running daemon until it's stopped by signal."""
+    config = mock.MagicMock()
+    cmd = DaemonCMD(config)
+    loop = mock_asyncio.get_event_loop.return_value
+
+    assert cmd.execute(argparse.Namespace()) is None
+
+    mock_daemon.assert_called_once_with(config)
+    daemon = mock_daemon.return_value
+    loop.add_signal_handler.assert_has_calls(
+        [mock.call(signal.SIGINT, daemon.stop), mock.call(signal.SIGTERM, daemon.stop)]
+    )
+    daemon.serve.assert_called_once_with()
+    loop.run_until_complete.assert_called_once_with(daemon.serve.return_value)
@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+from unittest import mock
+
+import pytest
+import yaml
+from juju.client._definitions import DetailedStatus
+
+from juju_spell.cli.formatters import (
+    FORMATTERS,
+    CsvFormatter,
+    Formatter,
+    JsonFormatter,
+    MessageStream,
+    NdjsonFormatter,
+    TableFormatter,
+    YamlFormatter,
+    register_formatter,
+)
+
+RESULTS = [
+    {
+        "context": {"uuid": "uuid-1", "name": "controller-1", "customer": "a"},
+        "success": True,
+        "output": {"models": ["default", "test"]},
+        "error": None,
+    },
+    {
+        "context": {"uuid": "uuid-2", "name": "controller-2", "customer": "b"},
+        "success": False,
+        "output": None,
+        "error": ValueError("multiline\nerror"),
+    },
+]
+
+
+def _format(formatter_cls, results, **kwargs):
+    """Format results to string."""
+    stream = io.StringIO()
+    formatter = formatter_cls(stream, **kwargs)
+    formatter.start()
+    for result in results:
+        formatter.write(result)
+
+    formatter.end()
+    return stream.getvalue()
+
+
+@mock.patch("juju_spell.cli.formatters.emit")
+def test_message_stream(mock_emit):
+    """Test printing whole lines once chunk size is reached."""
+    with MessageStream(chunk_size=10) as stream:
+        stream.write("line-1\nli")
+        mock_emit.message.assert_not_called()
+
+        stream.write("ne-2\nline")
+        mock_emit.message.assert_called_once_with("line-1\nline-2")
+
+        stream.flush()
+        mock_emit.message.assert_called_once()
+
+    mock_emit.message.assert_called_with("line")
+    assert mock_emit.message.call_count == 2
+
+
+def test_register_formatter():
+    """Test registering new formatter."""
+
+    @register_formatter
+    class TestFormatter(Formatter):
+        name = "test"
+
+        def _write(self, result):
+            self.stream.write(result["context"]["name"])
+
+    try:
+        assert FORMATTERS["test"] is TestFormatter
+        assert _format(TestFormatter, RESULTS) == "controller-1controller-2"
+    finally:
+        del FORMATTERS["test"]
+
+
+@pytest.mark.parametrize("results", [RESULTS, RESULTS[:1], []])
+def test_json_formatter(results):
+    """Test json formatter output is same as dumped list."""
+    exp_output = json.dumps(results, default=str, indent=1)
+    exp_output = exp_output.replace(
+        '"multiline\\nerror"', '"ValueError: multiline\\nerror"'
+    )
+
+    assert _format(JsonFormatter, results) == exp_output
+
+
+def test_ndjson_formatter():
+    """Test ndjson formatter."""
+    lines = _format(NdjsonFormatter, RESULTS).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        RESULTS[0],
+        {**RESULTS[1], "error": "ValueError: multiline\nerror"},
+    ]
+
+
+@pytest.mark.parametrize("results", [RESULTS, []])
+def test_yaml_formatter(results):
+    """Test yaml formatter."""
+    output = _format(YamlFormatter, results)
+
+    assert yaml.safe_load(output) == json.loads(_format(JsonFormatter, results))
+
+
+@pytest.mark.parametrize("name", ["json", "ndjson", "yaml", "table", "csv"])
+@pytest.mark.parametrize(
+    "kwargs, exp_dropped",
+    [
+        ({}, []),
+        ({"drop_empty": True}, ["info", "unknown_fields"]),  # no unknown fields
+        ({"drop_unknown": True}, ["unknown_fields"]),
+        ({"drop_empty": True, "drop_unknown": True}, ["info", "unknown_fields"]),
+    ],
+)
+@mock.patch("juju_spell.cli.formatters.DEFAULT_TABLE_COLUMN_WIDTH", new=1000)
+def test_formatter_drop_fields(name, kwargs, exp_dropped):
+    """Test formatters drop empty and unknown fields of juju objects."""
+    result = {**RESULTS[0], "output": DetailedStatus(status="active", info="")}
+
+    output = _format(FORMATTERS[name], [result], **kwargs)
+
+    assert "active" in output
+    for field in ["info", "unknown_fields"]:
+        assert (field in output) is (field not in exp_dropped)
+
+
+def test_table_formatter():
+    """Test table formatter, the widths are taken from the first row."""
+    output = _format(TableFormatter, [*RESULTS, {"context": {"name": "x" * 15}}])
+
+    assert output.splitlines() == [
+        "context.name  context.customer  context.uuid  success  error  output",
+        (
+            'controller-1  a                 uuid-1        True            {"models": '
+            '["default", "test"]}'
+        ),
+        "controller-2  b                 uuid-2        False    Valu…",
+        "xxxxxxxxxxx…",
+    ]
+
+
+@mock.patch("juju_spell.cli.formatters.DEFAULT_TABLE_COLUMN_WIDTH", new=10)
+def test_table_formatter_max_width():
+    """Test table formatter truncates values to maximum column width."""
+    output = _format(TableFormatter, RESULTS)
+
+    assert output.splitlines() == [
+        "context.n…  context.c…  context.u…  success  error  output",
+        'controlle…  a           uuid-1      True            {"models"…',
+        "controlle…  b           uuid-2      False    Valu…",
+    ]
+
+
+def test_table_formatter_no_results():
+    """Test table formatter without results."""
+    assert (
+        _format(TableFormatter, [])
+        == "context.name  context.customer  context.uuid  success  error  output\n"
+    )
+
+
+def test_csv_formatter():
+    """Test csv formatter."""
+    output = _format(CsvFormatter, RESULTS)
+
+    assert list(csv.reader(io.StringIO(output))) == [
+        [
+            "context.name",
+            "context.customer",
+            "context.uuid",
+            "success",
+            "error",
+            "output",
+        ],
+        ["controller-1", "a", "uuid-1", "True", "", '{"models": ["default", "test"]}'],
+        ["controller-2", "b", "uuid-2", "False", "ValueError: multiline\nerror", ""],
+    ]
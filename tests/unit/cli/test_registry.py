@@ -0,0 +1,78 @@
+from unittest import mock
+
+import pytest
+
+from juju_spell import cli
+from juju_spell.cli.base import JujuReadCMD, JujuWriteCMD
+from juju_spell.cli.registry import (
+    COMMANDS,
+    READ_ONLY,
+    READ_WRITE,
+    CommandInfo,
+    get_lazy_command,
+    get_lazy_commands,
+    load_command,
+)
+
+
+@pytest.mark.parametrize("info", COMMANDS)
+def test_registry(info):
+    """Test that registry is consistent with commands."""
+    command = load_command(info)
+
+    assert command.name == info.name
+    assert command.help_msg == info.help_msg
+    assert getattr(cli, info.class_name) is command
+    if info.group == READ_ONLY:
+        assert issubclass(command, JujuReadCMD)
+    elif info.group == READ_WRITE:
+        assert issubclass(command, JujuWriteCMD)
+
+
+def test_registry_all_commands():
+    """Test that all exported commands are in registry."""
+    assert sorted(cli.__all__) == sorted(info.class_name for info in COMMANDS)
+    with pytest.raises(AttributeError):
+        cli.UnknownCMD
+
+
+def test_get_lazy_command():
+    """Test lazy command."""
+    info = CommandInfo("ping", "help", READ_ONLY, "juju_spell.cli.ping", "PingCMD")
+    lazy_command = get_lazy_command(info)
+
+    assert lazy_command.name == "ping"
+    assert lazy_command.help_msg == "help"
+
+    command = lazy_command(None)
+
+    assert isinstance(command, cli.PingCMD)
+    assert isinstance(command, lazy_command)
+
+
+@mock.patch("juju_spell.cli.registry.load_command")
+def test_get_lazy_command_not_loaded(mock_load_command):
+    """Test that lazy command is imported only when it's used."""
+    info = CommandInfo("ping", "help", READ_ONLY, "juju_spell.cli.ping", "PingCMD")
+    lazy_command = get_lazy_command(info)
+
+    assert not isinstance(mock.MagicMock(), lazy_command)  # different name
+    mock_load_command.assert_not_called()
+
+    command = lazy_command(None, 1, a=2)
+
+    mock_load_command.assert_called_once_with(info)
+    mock_load_command.return_value.assert_called_once_with(None, 1, a=2)
+    assert command == mock_load_command.return_value.return_value
+
+
+def test_get_lazy_commands():
+    """Test getting lazy commands by group."""
+    groups = get_lazy_commands()
+
+    assert list(groups) == ["ReadOnly", "ReadWrite", "Other"]
+    assert [command.name for command in groups["ReadWrite"]] == [
+        "add-user",
+        "grant",
+        "remove-user",
+    ]
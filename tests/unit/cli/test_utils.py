@@ -2,12 +2,18 @@ from argparse import ArgumentTypeError
 from unittest import mock
 
 import pytest
+from craft_cli import EmitterMode
 
 from juju_spell.cli.utils import (
     _get_value_from_prompt,
     confirm,
+    emit_debug,
+    emit_trace,
     parse_comma_separated_str,
+    parse_fields,
     parse_filter,
+    parse_positive_int,
+    parse_ratio,
 )
 from juju_spell.exceptions import Abort, JujuSpellError
 
@@ -93,8 +99,41 @@ def test_parse_comma_separated_str(string, exp_list):
     assert result == exp_list
 
 
+@pytest.mark.parametrize("value, exp_value", [("1", 1), ("42", 42)])
+def test_parse_positive_int(value, exp_value):
+    """Test parse_positive_int with valid value."""
+    assert parse_positive_int(value) == exp_value
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "one", "1.5"])
+def test_parse_positive_int_exception(value):
+    """Test parse_positive_int raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_positive_int(value)
+
+
+@pytest.mark.parametrize("value, exp_value", [("0", 0), ("0.25", 0.25), ("1", 1)])
+def test_parse_ratio(value, exp_value):
+    """Test parse_ratio with valid value."""
+    assert parse_ratio(value) == exp_value
+
+
+@pytest.mark.parametrize("value", ["-0.1", "1.1", "half"])
+def test_parse_ratio_exception(value):
+    """Test parse_ratio raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_ratio(value)
+
+
 @pytest.mark.parametrize(
-    "value", ["a=1", "a=1,b=2,c='Gandalf'", "a=v1,v2,v3 b=v4,v5,v6"]
+    "value",
+    [
+        "",
+        "a=1",
+        "a=1,b=2,c='Gandalf'",
+        "a=v1,v2,v3 b=v4,v5,v6",
+        "name!=prod-* tags&=a,b risk<=3",
+    ],
 )
 def test_parse_filter(value):
     """Test parse_filter with valid format."""
@@ -103,8 +142,61 @@ def test_parse_filter(value):
     assert result == value
 
 
-@pytest.mark.parametrize("value", ["1=2", "1", "22='Gandalf'"])
+@pytest.mark.parametrize(
+    "value", ["1=2", "1", "22='Gandalf'", " ", "name<=3", "risk>=high", "owner&=a"]
+)
 def test_parse_filter_exception(value):
     """Test parse_filter raising exception."""
     with pytest.raises(ArgumentTypeError):
         parse_filter(value)
+
+
+@mock.patch("juju_spell.cli.utils.emit")
+def test_emit_debug(mock_emit):
+    """Test emitting debug message with preview."""
+    emit_debug("output of {}: {}", "cmd", "x" * 10000)
+
+    mock_emit.debug.assert_called_once()
+    message = mock_emit.debug.call_args[0][0]
+    assert message.startswith("output of cmd: xxx")
+    assert len(message) < 3000
+    assert message.endswith("...<truncated>")
+
+
+@pytest.mark.parametrize(
+    "mode, exp_emitted",
+    [
+        (EmitterMode.QUIET, False),
+        (EmitterMode.BRIEF, False),
+        (EmitterMode.DEBUG, False),
+        (EmitterMode.TRACE, True),
+    ],
+)
+@mock.patch("juju_spell.cli.utils.Preview")
+@mock.patch("juju_spell.cli.utils.emit")
+def test_emit_trace(mock_emit, mock_preview, mode, exp_emitted):
+    """Test emitting trace message only in trace mode."""
+    mock_emit.get_mode.return_value = mode
+    mock_preview.return_value = "preview"
+
+    emit_trace("output: {}", "value")
+
+    if exp_emitted:
+        mock_preview.assert_called_once_with("value")
+        mock_emit.trace.assert_called_once_with("output: preview")
+    else:
+        mock_preview.assert_not_called()  # message was not rendered
+        mock_emit.trace.assert_not_called()
+
+
+@pytest.mark.parametrize("value", ["a", "applications.*.units.*.machine,model.name"])
+def test_parse_fields(value):
+    """Test parse_fields with valid format."""
+    assert parse_fields(value) == value
+
+
+@pytest.mark.parametrize("value", ["", "a,", "a..b"])
+def test_parse_fields_exception(value):
+    """Test parse_fields raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_fields(value)
@@ -1,7 +1,8 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from juju_spell.cache import CachedModel, ModelsCache
 from juju_spell.commands.base import BaseJujuCommand
 
 
@@ -15,3 +16,51 @@ def test_juju_command():
     command = TestJujuCommand()
     command.execute.reset_mock()
     yield command
+
+
+@pytest.fixture(autouse=True)
+def models_cache(tmp_path):
+    """Use models cache in temporary directory."""
+    cache = ModelsCache(tmp_path / "models")
+    with patch("juju_spell.commands.base.models_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def mock_model_cls():
+    """Mock juju model class, each model is AsyncMock with its uuid."""
+
+    def _create_model():
+        model = AsyncMock()
+
+        def _connect(**kwargs):
+            model.uuid = kwargs["uuid"]
+
+        model._connector.connect.side_effect = _connect
+        model._connect_direct.side_effect = _connect
+        return model
+
+    with patch("juju_spell.commands.base.Model") as mock_model_cls:
+        mock_model_cls.side_effect = _create_model
+        yield mock_model_cls
+
+
+@pytest.fixture
+def mock_list_models():
+    """Mock listing models in controller."""
+    with patch("juju_spell.commands.base.list_models") as mock_list_models:
+        yield mock_list_models
+
+
+def create_controller(model_names):
+    """Create mocked controller with models."""
+    controller = MagicMock()
+    controller.controller_uuid = "controller-uuid"
+    controller.connection.return_value.connect_params.return_value = {
+        "endpoint": "localhost:17070",
+        "uuid": "controller-uuid",
+    }
+    controller.models = [
+        CachedModel(name, f"uuid-{name}", "admin") for name in model_names
+    ]
+    return controller
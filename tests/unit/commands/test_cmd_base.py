@@ -1,7 +1,12 @@
-from unittest.mock import AsyncMock, MagicMock, call
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
+from juju_spell.cache import CachedModel
+from juju_spell.commands.base import ModelSummary, list_models
+from tests.unit.commands.conftest import create_controller
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
@@ -16,24 +21,29 @@ import pytest
     ],
 )
 async def test_get_filtered_models(
-    all_models, args_models, exp_models, test_juju_command
+    all_models,
+    args_models,
+    exp_models,
+    test_juju_command,
+    mock_list_models,
+    mock_model_cls,
 ):
     """Test async models generator."""
-    mock_controller = AsyncMock()
-    mock_controller.get_models.return_value = all_models
-    mock_controller.get_model.return_value = mock_model = AsyncMock()
+    controller = create_controller(all_models)
+    mock_list_models.return_value = controller.models
 
-    models_generator = test_juju_command.get_filtered_models(
-        mock_controller, args_models
-    )
-    models = [name async for name, _ in models_generator]
+    models_generator = test_juju_command.get_filtered_models(controller, args_models)
+    models = [(name, model) async for name, model in models_generator]
 
     # check returned models
-    assert models == exp_models
-    # check that model was get from controller
-    mock_controller.get_model.assert_has_awaits(calls=[call(name) for name in models])
-    # check that model was disconnected
-    assert mock_model.disconnect.await_count == len(models)
+    assert [name for name, _ in models] == exp_models
+    for name, model in models:
+        # check that model was connected with AllWatcher by uuid
+        model._connect_direct.assert_awaited_once_with(
+            endpoint="localhost:17070", uuid=f"uuid-{name}"
+        )
+        # check that model was disconnected
+        model.disconnect.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -49,3 +59,238 @@ async def test_run(test_juju_command):
 def test_need_shuttle(test_juju_command):
     """Test default return value for need_shuttle property."""
     assert test_juju_command.need_sshuttle is False
+
+
+@pytest.mark.asyncio
+async def test_run_on_models(test_juju_command, mock_list_models, mock_model_cls):
+    """Test running function on models concurrently with limit."""
+    model_names = [f"model{i}" for i in range(6)]
+    controller = create_controller(reversed(model_names))
+    mock_list_models.return_value = controller.models
+    running, max_running = 0, 0
+
+    async def _func(name, model):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # first models are the slowest, so they are finished last
+        await asyncio.sleep(0.01 * (len(model_names) - int(name[-1])))
+        running -= 1
+        return name.upper(), model.uuid
+
+    outputs = await test_juju_command.run_on_models(controller, _func, model_parallel=2)
+
+    assert list(outputs.items()) == [
+        (name, (name.upper(), f"uuid-{name}")) for name in model_names
+    ]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_run_on_models_exception(
+    test_juju_command, mock_list_models, mock_model_cls
+):
+    """Test failure of function cancels other models and disconnects them."""
+    controller = create_controller(["model1", "model2"])
+    mock_list_models.return_value = controller.models
+    cancelled = asyncio.Event()
+    models = []
+
+    async def _func(name, model):
+        models.append(model)
+        if name == "model1":
+            raise ValueError("failed")
+
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(ValueError):
+        await test_juju_command.run_on_models(controller, _func)
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)  # let cancelled model to be disconnected
+    for model in models:
+        model.disconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "models, exp_model_uuids",
+    [
+        (None, {"model1": "uuid-model1", "model2": "uuid-model2"}),
+        (["model2", "test-model"], {"model2": "uuid-model2"}),
+    ],
+)
+async def test_get_filtered_model_uuids(
+    models, exp_model_uuids, test_juju_command, mock_list_models, models_cache
+):
+    """Test getting filtered names and uuids of models."""
+    controller = create_controller(["model2", "model1"])
+    mock_list_models.return_value = controller.models
+
+    model_uuids = await test_juju_command.get_filtered_model_uuids(controller, models)
+
+    assert list(model_uuids.items()) == list(exp_model_uuids.items())
+    mock_list_models.assert_awaited_once_with(controller)
+    assert models_cache.get("controller-uuid") == {
+        model.name: model for model in controller.models
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "models, exp_listed", [(None, False), (["model1"], False), (["model3"], True)]
+)
+async def test_get_filtered_model_uuids_cached(
+    models, exp_listed, test_juju_command, mock_list_models, models_cache
+):
+    """Test getting models from cache."""
+    controller = create_controller(["model1", "model2"])
+    models_cache.set("controller-uuid", controller.models)
+    mock_list_models.return_value = controller.models
+
+    await test_juju_command.get_filtered_model_uuids(controller, models)
+
+    # controller is asked only if requested model is not in cache
+    assert mock_list_models.await_count == int(exp_listed)
+
+
+@pytest.mark.asyncio
+async def test_connect_model_lightweight(test_juju_command, mock_model_cls):
+    """Test connecting model without AllWatcher."""
+    controller = create_controller([])
+    test_juju_command.lightweight_models = True
+
+    model = await test_juju_command.connect_model(controller, "model-uuid")
+
+    model._connector.connect.assert_awaited_once_with(
+        endpoint="localhost:17070", uuid="model-uuid"
+    )
+    model._connect_direct.assert_not_called()
+    model._after_connect.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_connect_model_failed(test_juju_command, mock_model_cls, models_cache):
+    """Test failed connection to model invalidates models cache."""
+    controller = create_controller(["model1"])
+    models_cache.set("controller-uuid", controller.models)
+    mock_model_cls.side_effect = None
+    mock_model_cls.return_value._connect_direct.side_effect = ValueError
+
+    with pytest.raises(ValueError):
+        await test_juju_command.connect_model(controller, "uuid-model1")
+
+    assert models_cache.get("controller-uuid") is None
+
+
+@pytest.mark.asyncio
+@patch("juju_spell.commands.base.client")
+async def test_list_models(mock_client):
+    """Test listing models in controller."""
+    controller = MagicMock()
+    controller.get_current_username.return_value = "admin"
+    facade = mock_client.ModelManagerFacade.from_connection.return_value
+    facade.ListModels = AsyncMock()
+    facade.ListModels.return_value.user_models = [
+        MagicMock(model=MagicMock(uuid="uuid-1", owner_tag="user-admin")),
+        MagicMock(model=MagicMock(uuid="uuid-2", owner_tag="user-bob")),
+    ]
+    for name, user_model in zip(["a", "b"], facade.ListModels.return_value.user_models):
+        user_model.model.name = name
+
+    models = await list_models(controller)
+
+    facade.ListModels.assert_awaited_once_with(tag="user-admin")
+    assert models == [
+        CachedModel("a", "uuid-1", "admin"),
+        CachedModel("b", "uuid-2", "bob"),
+    ]
+    mock_client.ModelManagerFacade.from_connection.assert_has_calls(
+        [call(controller.connection.return_value)]
+    )
+
+
+@pytest.mark.asyncio
+@patch("juju_spell.commands.base.client")
+async def test_get_model_summaries(
+    mock_client, test_juju_command, mock_list_models, models_cache
+):
+    """Test getting summaries of models by bulk calls to controller."""
+    controller = create_controller(["model2", "model1", "model3"])
+    mock_list_models.return_value = controller.models
+    model_manager_facade = mock_client.ModelManagerFacade.from_connection.return_value
+    model_manager_facade.ModelInfo = AsyncMock()
+    model_manager_facade.ModelInfo.return_value.results = [
+        MagicMock(
+            error=None,
+            result=MagicMock(
+                owner_tag="user-admin",
+                life="alive",
+                status=MagicMock(status="available", info=""),
+                agent_version="2.9.37",
+            ),
+        ),
+        MagicMock(error=MagicMock(message="model not found"), result=None),
+    ]
+    controller_facade = mock_client.ControllerFacade.from_connection.return_value
+    controller_facade.ModelStatus = AsyncMock()
+    controller_facade.ModelStatus.return_value.models = [
+        MagicMock(
+            error=None,
+            hosted_machine_count=3,
+            application_count=2,
+            unit_count=5,
+        ),
+        MagicMock(error=MagicMock(message="model not found")),
+    ]
+
+    summaries = await test_juju_command.get_model_summaries(
+        controller, ["model3", "model1"]
+    )
+
+    mock_client.Entity.assert_has_calls(
+        [call("model-uuid-model1"), call("model-uuid-model3")]
+    )
+    entities = [mock_client.Entity.return_value] * 2
+    model_manager_facade.ModelInfo.assert_awaited_once_with(entities=entities)
+    controller_facade.ModelStatus.assert_awaited_once_with(entities=entities)
+    assert summaries == {
+        "model1": ModelSummary(
+            name="model1",
+            uuid="uuid-model1",
+            owner="admin",
+            life="alive",
+            status="available",
+            status_message="",
+            agent_version="2.9.37",
+            machine_count=3,
+            application_count=2,
+            unit_count=5,
+        ),
+        "model3": ModelSummary(
+            name="model3",
+            uuid="uuid-model3",
+            error="model not found; model not found",
+        ),
+    }
+    # model could be removed
+    assert models_cache.get("controller-uuid") is None
+
+
+@pytest.mark.asyncio
+@patch("juju_spell.commands.base.client")
+async def test_get_model_summaries_no_models(
+    mock_client, test_juju_command, mock_list_models
+):
+    """Test getting summaries of models if no model was selected."""
+    controller = create_controller(["model1"])
+    mock_list_models.return_value = controller.models
+
+    summaries = await test_juju_command.get_model_summaries(controller, ["model2"])
+
+    assert summaries == {}
+    mock_client.ModelManagerFacade.from_connection.assert_not_called()
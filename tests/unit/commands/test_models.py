@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from juju_spell.commands.base import ModelSummary
+from juju_spell.commands.models import ModelsCommand, is_healthy
+
+HEALTHY = ModelSummary("healthy", "uuid-1", "admin", "alive", "available")
+BUSY = ModelSummary("busy", "uuid-2", "admin", "alive", "busy")
+DYING = ModelSummary("dying", "uuid-3", "admin", "dying", "available")
+FAILED = ModelSummary("failed", "uuid-4", error="model not found")
+
+
+@pytest.mark.parametrize(
+    "summary, exp_healthy",
+    [(HEALTHY, True), (BUSY, False), (DYING, False), (FAILED, False)],
+)
+def test_is_healthy(summary, exp_healthy):
+    """Test checking if model is healthy."""
+    assert is_healthy(summary) is exp_healthy
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "unhealthy, exp_models",
+    [
+        (False, ["healthy", "busy", "dying", "failed"]),
+        (True, ["busy", "dying", "failed"]),
+    ],
+)
+async def test_execute(unhealthy, exp_models):
+    """Test execute function for ModelsCommand."""
+    controller = MagicMock()
+    summaries = {summary.name: summary for summary in [HEALTHY, BUSY, DYING, FAILED]}
+    models = ModelsCommand()
+    models.get_model_summaries = AsyncMock(return_value=summaries)
+
+    results = await models.execute(controller, models=["a"], unhealthy=unhealthy)
+
+    models.get_model_summaries.assert_awaited_once_with(controller, ["a"])
+    assert list(results) == exp_models
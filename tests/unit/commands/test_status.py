@@ -1,28 +1,152 @@
-from typing import AsyncGenerator, List
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from juju.client._definitions import FullStatus, StorageDetails
+from juju.errors import JujuError
 
-from juju_spell.commands.status import StatusCommand
-
-
-async def _async_generator(values: List) -> AsyncGenerator:
-    """Async generator."""
-    for value in values:
-        yield value
+from juju_spell.commands.status import (
+    StatusCommand,
+    drop_sections,
+    get_status_patterns,
+    get_storage,
+)
+from juju_spell.serializer import dumps
+from tests.unit.commands.conftest import create_controller
 
 
 @pytest.mark.asyncio
-@patch("juju_spell.commands.base.BaseJujuCommand.get_filtered_models")
-async def test_execute(mocked_models):
+@pytest.mark.parametrize("model_parallel", [1, 5])
+async def test_execute(model_parallel, mock_list_models, mock_model_cls):
     """Test execute function for StatusCommand."""
-    models = [("model1", AsyncMock()), ("model2", AsyncMock())]
-    mocked_models.return_value = _async_generator(models)
+    controller = create_controller(["model3", "model1", "model2"])
+    mock_list_models.return_value = controller.models
+    create_model, created_models = mock_model_cls.side_effect, []
+    mock_model_cls.side_effect = lambda: created_models.append(create_model()) or (
+        created_models[-1]
+    )
     status = StatusCommand()
 
-    results = await status.execute(MagicMock())
+    results = await status.execute(
+        controller, models=["model1", "model3"], model_parallel=model_parallel
+    )
 
-    assert len(results) == len(models)
-    for name, model in models:
+    assert list(results) == ["model1", "model3"]  # sorted by name
+    models = {model.uuid: model for model in created_models}
+    assert len(models) == 2
+    for name in ["model1", "model3"]:
+        model = models[f"uuid-{name}"]
         assert results[name] == model.get_status.return_value
-        model.get_status.assert_awaited_once()
+        model.get_status.assert_awaited_once_with(filters=None)
+        model.disconnect.assert_awaited_once()
+        # models were connected without AllWatcher
+        model._connect_direct.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "kwargs, exp_patterns",
+    [
+        ({}, None),
+        ({"apps": [], "units": None}, None),
+        (
+            {"apps": ["nova-*"], "machines": ["0", "1/lxd/*"]},
+            ["nova-*", "0", "1/lxd/*"],
+        ),
+        ({"units": ["ceph-osd/0"]}, ["ceph-osd/0"]),
+    ],
+)
+def test_get_status_patterns(kwargs, exp_patterns):
+    """Test getting patterns for status."""
+    assert get_status_patterns(**kwargs) == exp_patterns
+
+
+@pytest.mark.parametrize(
+    "requested, exp_dropped",
+    [
+        ({}, ["relations", "offers", "remote_applications"]),
+        ({"relations": True}, ["offers", "remote_applications"]),
+        ({"relations": True, "offers": True}, []),
+    ],
+)
+def test_drop_sections(requested, exp_dropped):
+    """Test dropping of sections, which were not requested."""
+    status = FullStatus(
+        applications={},
+        machines={},
+        offers={},
+        relations=[],
+        remote_applications={},
+    )
+
+    drop_sections(status, **requested)
+
+    for section in ["relations", "offers", "remote_applications"]:
+        if section in exp_dropped:
+            assert getattr(status, section) is None
+        else:
+            assert getattr(status, section) is not None
+
+    assert status.applications == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("drop_empty", [True, False])
+@pytest.mark.parametrize("drop_unknown", [True, False])
+@patch("juju_spell.commands.status.get_storage")
+async def test_execute_storage_serialized(mock_get_storage, drop_empty, drop_unknown):
+    """Test storage of status is kept in output with dropped fields."""
+    model = AsyncMock()
+    model.get_status.return_value = FullStatus(applications={})
+    mock_get_storage.return_value = [StorageDetails(storage_tag="storage-data-0")]
+    status = StatusCommand()
+    status.run_on_models = AsyncMock()
+
+    await status.execute(MagicMock(), storage=True)
+
+    _, get_status, _, _ = status.run_on_models.call_args.args
+    result = await get_status("model1", model)
+    output = dumps(result, True, drop_empty=drop_empty, drop_unknown=drop_unknown)
+
+    assert '"storage": [{' in output
+    assert '"storage_tag": "storage-data-0"' in output
+
+
+@pytest.mark.asyncio
+@patch("juju_spell.commands.status.get_storage")
+@patch("juju_spell.commands.status.drop_sections")
+async def test_execute_filtered(mock_drop_sections, mock_get_storage):
+    """Test execute function for StatusCommand with patterns and sections."""
+    model = AsyncMock()
+    status = StatusCommand()
+    status.run_on_models = AsyncMock()
+
+    await status.execute(
+        MagicMock(), apps=["nova-*"], units=["ceph-osd/0"], offers=True, storage=True
+    )
+
+    # call function passed to run_on_models for single model
+    _, get_status, _, _ = status.run_on_models.call_args.args
+    result = await get_status("model1", model)
+
+    model.get_status.assert_awaited_once_with(filters=["nova-*", "ceph-osd/0"])
+    mock_drop_sections.assert_called_once_with(
+        model.get_status.return_value, relations=False, offers=True
+    )
+    mock_get_storage.assert_awaited_once_with(model)
+    assert result.storage == mock_get_storage.return_value
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, exp_error", [(None, None), ("failed", JujuError)])
+@patch("juju_spell.commands.status.client")
+async def test_get_storage(mock_client, error, exp_error):
+    """Test getting storage details of model."""
+    facade = mock_client.StorageFacade.from_connection.return_value
+    facade.ListStorageDetails = AsyncMock()
+    result = facade.ListStorageDetails.return_value.results[0]
+    result.error = None if error is None else MagicMock(message=error)
+
+    if exp_error:
+        with pytest.raises(exp_error):
+            await get_storage(MagicMock())
+    else:
+        assert await get_storage(MagicMock()) == result.result
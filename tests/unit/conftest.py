@@ -1,5 +1,6 @@
 import io
 from pathlib import Path
+from unittest import mock
 
 import pytest
 import yaml
@@ -100,6 +101,14 @@ controllers:
 """
 
 
+@pytest.fixture(autouse=True)
+def config_cache_path(tmp_path) -> Path:
+    """Store compiled config in temporary directory."""
+    path = tmp_path / "cache" / "config.pickle"
+    with mock.patch("juju_spell.config.CONFIG_CACHE_PATH", path):
+        yield path
+
+
 @pytest.fixture
 def test_config_path(tmp_path) -> Path:
     """Return path to test global config."""
@@ -1,3 +1,5 @@
+import asyncio
+import dataclasses
 import io
 import unittest
 from unittest import mock
@@ -80,6 +82,65 @@ async def test_controller_direct_connection_timeout():
         )
 
 
+@pytest.mark.asyncio
+async def test_controller_direct_connection_tunnel_died():
+    """Test direct connection fails fast if tunnel died after it was ready."""
+    from juju_spell.connections.manager import controller_direct_connection
+    from juju_spell.connections.network import SshPortForwardSubprocess
+    from juju_spell.exceptions import ConnectionProcessError
+
+    mock_controller = AsyncMock()
+    mock_controller._connector.connect.side_effect = JujuConnectionError
+    tunnel = SshPortForwardSubprocess("localhost:1234", "10.1.1.99:17070", "site")
+    tunnel.process = MagicMock(returncode=255)
+    tunnel.process.poll.return_value = 255  # ssh exited after it was ready
+    tunnel.process.stderr.read.return_value = b"Connection reset by peer"
+
+    with pytest.raises(ConnectionProcessError, match="Connection reset by peer"):
+        await controller_direct_connection(
+            mock_controller,
+            uuid4(),
+            "test",
+            "localhost:1234",
+            "user",
+            "password",
+            "ca_cert",
+            connection_process=tunnel,
+        )
+
+    mock_controller._connector.connect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_controller_direct_connection_ready_probed():
+    """Test direct connection is not retried if tunnel probed endpoint is ready."""
+    from juju_spell.connections.manager import controller_direct_connection
+    from juju_spell.connections.network import SshPortForwardSubprocess
+
+    mock_controller = AsyncMock()
+    mock_controller._connector.connect.side_effect = JujuConnectionError
+    tunnel = SshPortForwardSubprocess("localhost:1234", "10.1.1.99:17070", "site")
+    tunnel.process = MagicMock()
+    tunnel.process.poll.return_value = None  # ssh is running, but target is dead
+
+    with pytest.raises(JujuConnectionError):
+        await asyncio.wait_for(
+            controller_direct_connection(
+                mock_controller,
+                uuid4(),
+                "test",
+                "localhost:1234",
+                "user",
+                "password",
+                "ca_cert",
+                connection_process=tunnel,
+            ),
+            timeout=1,
+        )
+
+    mock_controller._connector.connect.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_controller_direct_connection_exception():
     """Test direct connection to controller with reties."""
@@ -141,6 +202,7 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
     def tearDown(self) -> None:
         """Clean up after tests."""
         self.connect_manager.connections.clear()
+        self.connect_manager._connecting.clear()
 
     def test_new_object(self):
         """Test get new object."""
@@ -165,11 +227,14 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
         with mock.patch(
             "juju_spell.connections.manager.get_connection"
         ) as mock_get_connection:
-            mock_get_connection.return_value = exp_endpoint, MagicMock()
+            mock_connection_process = MagicMock(wait_ready=AsyncMock())
+            mock_get_connection.return_value = exp_endpoint, mock_connection_process
             controller = await self.connect_manager._connect(config, port_range)
             mock_get_connection.assert_called_once_with(config, port_range, False)
 
         assert controller == mocked_controller
+        mock_connection_process.connect.assert_called_once()
+        mock_connection_process.wait_ready.assert_awaited_once()
         mock_controller_direct_connection.assert_called_once_with(
             mocked_controller,
             uuid=config.uuid,
@@ -178,9 +243,64 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
             username=config.user,
             password=config.password,
             cacert=config.ca_cert,
+            connection_process=mock_connection_process,
         )
         assert config.name in self.connect_manager.connections
 
+    @mock.patch("juju_spell.connections.manager.juju.Controller")
+    @mock.patch("juju_spell.connections.manager.controller_direct_connection")
+    @mock.patch("juju_spell.connections.manager.get_connection")
+    async def test_connect_stale_connection(self, mock_get_connection, _, __):
+        """Test stale connection is closed before it's replaced."""
+        from juju_spell.connections.manager import Connection
+
+        stale_connection = Connection(AsyncMock(), MagicMock())
+        self.connect_manager.connections[
+            self.controller_config_2.name
+        ] = stale_connection
+        mock_connection_process = MagicMock(wait_ready=AsyncMock())
+        mock_get_connection.return_value = "localhost:17071", mock_connection_process
+
+        await self.connect_manager._connect(self.controller_config_2, range(1, 2))
+
+        stale_connection.controller.disconnect.assert_awaited_once()
+        stale_connection.connection_process.clean.assert_called_once()
+        connection = self.connect_manager.connections[self.controller_config_2.name]
+        assert connection.connection_process == mock_connection_process
+
+    @mock.patch("juju_spell.connections.manager.juju.Controller")
+    @mock.patch("juju_spell.connections.manager.controller_direct_connection")
+    @mock.patch("juju_spell.connections.manager.get_connection")
+    async def test_connect_timings(self, mock_get_connection, _, __):
+        """Test connection phases are measured in timings of controller."""
+        from juju_spell.timings import start_timings
+
+        mock_connection_process = MagicMock(wait_ready=AsyncMock())
+        mock_get_connection.return_value = "localhost:17071", mock_connection_process
+        timings = start_timings()
+
+        await self.connect_manager._connect(self.controller_config_2, range(1, 2))
+
+        assert set(timings) == {"handshake_wait", "port_allocation", "tunnel"}
+
+    @mock.patch("juju_spell.connections.manager.juju.Controller")
+    @mock.patch("juju_spell.connections.manager.controller_direct_connection")
+    @mock.patch("juju_spell.connections.manager.get_connection")
+    async def test_connect_tunnel_failed(
+        self, mock_get_connection, mock_controller_direct_connection, _
+    ):
+        """Test connection is not logged in if the tunnel failed."""
+        from juju_spell.exceptions import ConnectionProcessError
+
+        mock_connection_process = MagicMock(wait_ready=AsyncMock())
+        mock_connection_process.wait_ready.side_effect = ConnectionProcessError
+        mock_get_connection.return_value = "localhost:17071", mock_connection_process
+
+        with self.assertRaises(ConnectionProcessError):
+            await self.connect_manager._connect(self.controller_config_2, range(1, 2))
+
+        mock_controller_direct_connection.assert_not_called()
+
     async def test_clean(self):
         """Test clean function."""
         from juju_spell.connections.manager import Connection
@@ -201,6 +321,54 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
             connection.controller.disconnect.assert_called_once()
             connection.connection_process.clean.assert_called_once()
 
+    async def test_clean_connecting(self):
+        """Test clean awaits cancelled connections before closing connections."""
+        from juju_spell.connections.manager import Connection
+
+        late_connection = Connection(AsyncMock(), MagicMock())
+
+        async def _connect(controller_config, *_):
+            try:
+                await asyncio.sleep(60)
+            finally:  # connection is stored while it's being cancelled
+                self.connect_manager.connections[
+                    controller_config.name
+                ] = late_connection
+
+        with mock.patch.object(self.connect_manager, "_connect", _connect):
+            task = asyncio.ensure_future(
+                self.connect_manager.get_controller(self.controller_config_1)
+            )
+            await asyncio.sleep(0.01)
+
+            await self.connect_manager.clean()
+
+        assert len(self.connect_manager.connections) == 0
+        late_connection.connection_process.clean.assert_called_once()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    @mock.patch("juju_spell.connections.manager.DEFAULT_DISCONNECT_TIMEOUT", new=0.05)
+    async def test_clean_timeout(self):
+        """Test clean function with hung and failing disconnects."""
+        from juju_spell.connections.manager import Connection
+
+        async def _hung_disconnect():
+            await asyncio.sleep(60)
+
+        hung_connection = Connection(AsyncMock(), MagicMock())
+        hung_connection.controller.disconnect.side_effect = _hung_disconnect
+        failed_connection = Connection(AsyncMock(), MagicMock())
+        failed_connection.controller.disconnect.side_effect = ConnectionError
+        self.connect_manager.connections["hung"] = hung_connection
+        self.connect_manager.connections["failed"] = failed_connection
+
+        await asyncio.wait_for(self.connect_manager.clean(), timeout=1)
+
+        assert len(self.connect_manager.connections) == 0
+        hung_connection.connection_process.clean.assert_called_once()
+        failed_connection.connection_process.clean.assert_called_once()
+
     async def test_get_controller_invalid_controller_config(self):
         """Test function to get controller with invalid controller config."""
         with pytest.raises(AssertionError):
@@ -225,7 +393,6 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
 
         controller = await self.connect_manager.get_controller(config, reconnect=True)
 
-        mocked_connection.controller.disconnect.assert_called_once()
         mock_connect.assert_called_once_with(config, range(17071, 17170), False)
         assert controller == mock_connect.return_value
 
@@ -252,3 +419,77 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
         controller = await self.connect_manager.get_controller(config)
 
         assert controller == mocked_connection.controller
+
+    async def test_get_controller_single_flight(self):
+        """Test concurrent calls for same controller share one connection."""
+        config = self.controller_config_1
+
+        async def _connect(*args):
+            await asyncio.sleep(0.01)
+            return mocked_controller
+
+        mocked_controller = MagicMock()
+        self.connect_manager._connect = mock_connect = AsyncMock(side_effect=_connect)
+
+        controllers = await asyncio.gather(
+            *(self.connect_manager.get_controller(config) for _ in range(5))
+        )
+
+        mock_connect.assert_awaited_once_with(config, range(17071, 17170), False)
+        assert all(controller == mocked_controller for controller in controllers)
+        assert config.uuid not in self.connect_manager._connecting
+
+    async def test_get_controller_single_flight_failure(self):
+        """Test concurrent calls for same controller share connection failure."""
+        config = self.controller_config_1
+
+        async def _connect(*args):
+            await asyncio.sleep(0.01)
+            raise JujuConnectionError("unreachable")
+
+        self.connect_manager._connect = mock_connect = AsyncMock(side_effect=_connect)
+
+        results = await asyncio.gather(
+            *(self.connect_manager.get_controller(config) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        mock_connect.assert_awaited_once()
+        assert all(isinstance(result, JujuConnectionError) for result in results)
+        assert config.uuid not in self.connect_manager._connecting
+
+    @mock.patch("juju_spell.connections.manager.DEFAULT_MAX_HANDSHAKES", new=2)
+    @mock.patch("juju_spell.connections.manager.juju.Controller")
+    @mock.patch("juju_spell.connections.manager.get_connection")
+    @mock.patch("juju_spell.connections.manager.controller_direct_connection")
+    async def test_connect_handshakes_limit(
+        self, mock_controller_direct_connection, mock_get_connection, _
+    ):
+        """Test limit of connections established at the same time."""
+        running, max_running = 0, 0
+
+        async def _direct_connection(*args, **kwargs):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(running, max_running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        mock_controller_direct_connection.side_effect = _direct_connection
+        mock_get_connection.return_value = "localhost:17071", MagicMock(
+            wait_ready=AsyncMock()
+        )
+        configs = [
+            dataclasses.replace(self.controller_config_2, name=f"test-{i}")
+            for i in range(6)
+        ]
+
+        await asyncio.gather(
+            *(
+                self.connect_manager._connect(config, range(17071, 17170))
+                for config in configs
+            )
+        )
+
+        assert mock_controller_direct_connection.await_count == 6
+        assert max_running == 2
@@ -1,58 +1,121 @@
+import asyncio
 import socket
 import subprocess
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest import mock
 
 import pytest
 
-from juju_spell.config import Connection
+from juju_spell.config import Connection, Controller
 
 
-@pytest.mark.parametrize("return_code, exp_result", [(1, True), (0, False)])
+@pytest.mark.parametrize("bind_error, exp_result", [(None, True), (OSError, False)])
 @mock.patch("juju_spell.connections.network.socket.socket")
-def test_is_port_free(mock_socket, return_code, exp_result):
+def test_is_port_free(mock_socket, bind_error, exp_result):
     """Test function checking if port is free."""
     from juju_spell.connections.network import _is_port_free
 
     test_port = 17070
-    mock_socket.return_value = tcp = mock.MagicMock()
-    tcp.connect_ex.return_value = return_code
+    tcp = mock_socket.return_value.__enter__.return_value
+    tcp.bind.side_effect = bind_error
 
     result = _is_port_free(test_port)
 
     assert result == exp_result
     mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_STREAM)
-    tcp.connect_ex.assert_called_once_with(("localhost", test_port))
-    tcp.close.assert_called_once()
+    tcp.setsockopt.assert_called_once_with(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    tcp.bind.assert_called_once_with(("localhost", test_port))
 
 
-@mock.patch("juju_spell.connections.network._is_port_free")
-@mock.patch("juju_spell.connections.network.random.shuffle")
-def test_get_free_tcp_port(mock_random_shuffle, mock_is_port_free):
-    """Test getting free TCP port."""
-    from juju_spell.connections.network import get_free_tcp_port
+def test_is_port_free_bound():
+    """Test function checking if port is free with bound port."""
+    from juju_spell.connections.network import _is_port_free
 
-    exp_port = 17073
-    mock_is_port_free.side_effect = [False, False, True, False]
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
+        tcp.bind(("localhost", 0))
+        tcp.listen()
+        assert _is_port_free(tcp.getsockname()[1]) is False
 
-    port = get_free_tcp_port(range(17071, 17075))
 
-    mock_random_shuffle.assert_called_once_with([17071, 17072, 17073, 17074])
-    mock_is_port_free.assert_has_calls(
-        [mock.call(17071), mock.call(17072), mock.call(17073)]
-    )
-    assert port == exp_port
+@pytest.fixture
+def port_allocator(tmp_path):
+    """Port allocator with lock files in temporary directory."""
+    from juju_spell.connections.network import PortAllocator
+
+    return PortAllocator(tmp_path / "ports")
 
 
 @mock.patch("juju_spell.connections.network._is_port_free")
-def test_get_free_tcp_port_exception(mock_is_port_free):
-    """Test getting free TCP port raising an Error."""
-    from juju_spell.connections.network import get_free_tcp_port
+@mock.patch("juju_spell.connections.network.random.randrange", return_value=1)
+def test_port_allocator_reserve(_, mock_is_port_free, port_allocator):
+    """Test reserving free TCP port."""
+    mock_is_port_free.side_effect = [False, True]
+
+    port = port_allocator.reserve(range(17071, 17075))
+
+    mock_is_port_free.assert_has_calls([mock.call(17072), mock.call(17073)])
+    assert port == 17073
+    assert (port_allocator.lock_dir / "17073.lock").exists()
+
+
+@mock.patch("juju_spell.connections.network._is_port_free", return_value=True)
+def test_port_allocator_reserve_reserved(_, port_allocator):
+    """Test reserved and excluded ports are not reserved again."""
+    port_range = range(17071, 17075)
+
+    ports = {port_allocator.reserve(port_range, exclude={17074}) for _ in range(3)}
+
+    assert ports == {17071, 17072, 17073}
+    with pytest.raises(ValueError):
+        port_allocator.reserve(port_range, exclude={17074})
 
-    mock_is_port_free.return_value = False
+    port_allocator.release(17072)
+    port_allocator.release(17072)  # releasing port twice is not an issue
+    assert port_allocator.reserve(port_range, exclude={17074}) == 17072
 
+
+@mock.patch("juju_spell.connections.network._is_port_free", return_value=True)
+def test_port_allocator_reserve_locked(_, port_allocator):
+    """Test port locked by other process is not reserved."""
+    from juju_spell.connections.network import PortAllocator
+
+    other_allocator = PortAllocator(port_allocator.lock_dir)
+    port_range = range(17071, 17073)
+
+    port = other_allocator.reserve(port_range)
+    assert port_allocator.reserve(port_range) != port
+    with pytest.raises(ValueError):
+        port_allocator.reserve(port_range)
+
+    other_allocator.release(port)
+    assert port_allocator.reserve(port_range) == port
+
+
+@mock.patch("juju_spell.connections.network._is_port_free", return_value=True)
+def test_port_allocator_without_lock_dir(_, tmp_path):
+    """Test port is reserved in process if lock file could not be created."""
+    from juju_spell.connections.network import PortAllocator
+
+    (tmp_path / "file").touch()
+    port_allocator = PortAllocator(tmp_path / "file" / "ports")
+
+    assert port_allocator.reserve(range(17071, 17072)) == 17071
     with pytest.raises(ValueError):
-        get_free_tcp_port(range(17071, 17075))
+        port_allocator.reserve(range(17071, 17072))
+
+
+@mock.patch("juju_spell.connections.network.port_allocator")
+def test_get_free_tcp_port(mock_port_allocator):
+    """Test getting free TCP port."""
+    from juju_spell.connections.network import get_free_tcp_port
+
+    port = get_free_tcp_port(range(17071, 17075), exclude={17071})
+
+    mock_port_allocator.reserve.assert_called_once_with(range(17071, 17075), {17071})
+    assert port == mock_port_allocator.reserve.return_value
 
 
 def test_empty_connection():
@@ -117,6 +180,54 @@ class BaseSubprocessConnectionTestCase(unittest.TestCase):
         self.connection.process = mocked_process = mock.MagicMock()
         self.connection.clean()
         mocked_process.terminate.assert_called_once()
+        mocked_process.wait.assert_called_once_with(timeout=5)
+        mocked_process.kill.assert_not_called()
+
+    def test_clean_kill(self):
+        """Test clean function killing process, which was not terminated."""
+        self.connection.process = mocked_process = mock.MagicMock()
+        mocked_process.wait.side_effect = [subprocess.TimeoutExpired("ssh", 5), 0]
+        self.connection.clean()
+        mocked_process.terminate.assert_called_once()
+        mocked_process.kill.assert_called_once()
+        self.assertEqual(mocked_process.wait.call_count, 2)
+
+    def test_clean_without_process(self):
+        """Test clean function without process."""
+        self.connection.clean()
+        self.assertIsNone(self.connection.process)
+
+    def test_raise_for_exit(self):
+        """Test raising error of process, which exited."""
+        from juju_spell.exceptions import ConnectionProcessError
+
+        self.connection.raise_for_exit()  # process was not created
+        self.connection.process = mocked_process = mock.MagicMock()
+        mocked_process.poll.return_value = None
+        self.connection.raise_for_exit()  # process is running
+
+        mocked_process.poll.return_value = mocked_process.returncode = 255
+        mocked_process.stderr.read.return_value = b"Permission denied (publickey).\n"
+        with pytest.raises(ConnectionProcessError, match="Permission denied"):
+            self.connection.raise_for_exit()
+
+
+def test_clean_subprocess_connections():
+    """Test cleaning of all running subprocess connections before exit."""
+    from juju_spell.connections.network import (
+        BaseSubprocessConnection,
+        _clean_subprocess_connections,
+    )
+
+    running, finished = BaseSubprocessConnection(), BaseSubprocessConnection()
+    running.process, finished.process = mock.MagicMock(), mock.MagicMock()
+    running.process.poll.return_value = None
+    finished.process.poll.return_value = 0
+
+    _clean_subprocess_connections()
+
+    running.process.terminate.assert_called_once()
+    finished.process.terminate.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -124,13 +235,23 @@ class BaseSubprocessConnectionTestCase(unittest.TestCase):
     [
         (
             ("localhost:1234", "10.1.1.99:17070", "bastion"),
-            ["ssh", "bastion", "-N", "-L", "localhost:1234:10.1.1.99:17070"],
+            [
+                "ssh",
+                "bastion",
+                "-o",
+                "ExitOnForwardFailure=yes",
+                "-N",
+                "-L",
+                "localhost:1234:10.1.1.99:17070",
+            ],
         ),
         (
             ("localhost:1234", "10.1.1.99:17070", "bastion", ["bastion1", "bastion2"]),
             [
                 "ssh",
                 "bastion",
+                "-o",
+                "ExitOnForwardFailure=yes",
                 "-N",
                 "-L",
                 "localhost:1234:10.1.1.99:17070",
@@ -139,7 +260,15 @@ class BaseSubprocessConnectionTestCase(unittest.TestCase):
         ),
         (
             ("1234", "10.1.1.99:17070", "ubuntu@bastion"),
-            ["ssh", "ubuntu@bastion", "-N", "-L", "1234:10.1.1.99:17070"],
+            [
+                "ssh",
+                "ubuntu@bastion",
+                "-o",
+                "ExitOnForwardFailure=yes",
+                "-N",
+                "-L",
+                "1234:10.1.1.99:17070",
+            ],
         ),
     ],
 )
@@ -232,3 +361,436 @@ def test_get_connection(
     else:
         mocked_port_forward.assert_not_called()
         mocked_sshuttle.assert_not_called()
+
+
+@mock.patch("juju_spell.connections.network.subprocess.Popen")
+def test_ssh_port_forwarding_multiple_forwards(mock_popen):
+    """Test ssh tunnel with multiple port-forwards."""
+    from juju_spell.connections.network import SshPortForwardSubprocess
+
+    tunnel = SshPortForwardSubprocess("localhost:1234", "10.1.1.99:17070", "bastion")
+    tunnel.add_forward("localhost:1235", "10.1.1.100:17070")
+    tunnel.connect()
+
+    mock_popen.assert_called_once_with(
+        [
+            "ssh",
+            "bastion",
+            "-o",
+            "ExitOnForwardFailure=yes",
+            "-N",
+            "-L",
+            "localhost:1234:10.1.1.99:17070",
+            "-L",
+            "localhost:1235:10.1.1.100:17070",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    with pytest.raises(RuntimeError):
+        tunnel.add_forward("localhost:1236", "10.1.1.101:17070")
+
+
+def _create_controller(uuid: str, endpoint: str, destination: str) -> Controller:
+    """Create test controller behind destination."""
+    return Controller(
+        uuid=uuid,
+        name=f"controller-{uuid}",
+        customer="test-customer",
+        owner="test-owner",
+        endpoint=endpoint,
+        ca_cert="ca-cert",
+        user="test-user",
+        password="test-password",
+        model_mapping={},
+        connection=Connection(destination, jumps=["bastion"]),
+    )
+
+
+class SshTunnelRegistryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        """Set up test cases."""
+        from juju_spell.connections.network import PortAllocator, SshTunnelRegistry
+
+        self.registry = SshTunnelRegistry()
+        self.controller_1 = _create_controller("1", "10.1.1.1:17070", "site-a")
+        self.controller_2 = _create_controller("2", "10.1.1.2:17070", "site-a")
+        self.controller_3 = _create_controller("3", "10.2.1.1:17070", "site-b")
+        self.registry.register(
+            [self.controller_1, self.controller_2, self.controller_3]
+        )
+        popen_patcher = mock.patch("juju_spell.connections.network.subprocess.Popen")
+        self.mock_popen = popen_patcher.start()
+        self.mock_popen.return_value.poll.return_value = None  # process is running
+        self.addCleanup(popen_patcher.stop)
+        port_patcher = mock.patch(
+            "juju_spell.connections.network._is_port_free", return_value=True
+        )
+        port_patcher.start()
+        self.addCleanup(port_patcher.stop)
+        lock_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(lock_dir.cleanup)
+        self.port_allocator = PortAllocator(Path(lock_dir.name))
+        allocator_patcher = mock.patch(
+            "juju_spell.connections.network.port_allocator", self.port_allocator
+        )
+        allocator_patcher.start()
+        self.addCleanup(allocator_patcher.stop)
+
+    def test_get_forward_shared_tunnel(self):
+        """Test controllers behind same destination share ssh tunnel."""
+        forward_1 = self.registry.get_forward(self.controller_1)
+        forward_2 = self.registry.get_forward(self.controller_2)
+        forward_3 = self.registry.get_forward(self.controller_3)
+
+        self.assertIs(forward_1.tunnel, forward_2.tunnel)
+        self.assertIsNot(forward_1.tunnel, forward_3.tunnel)
+        self.assertNotEqual(forward_1.port, forward_2.port)
+        self.assertEqual(
+            forward_1.tunnel.forwards,
+            [
+                (forward_1.local_target, "10.1.1.1:17070"),
+                (forward_2.local_target, "10.1.1.2:17070"),
+            ],
+        )
+
+    def test_connect_and_clean(self):
+        """Test shared ssh tunnel is started once and terminated by last user."""
+        forward_1 = self.registry.get_forward(self.controller_1)
+        forward_2 = self.registry.get_forward(self.controller_2)
+
+        forward_1.connect()
+        forward_2.connect()
+        self.mock_popen.assert_called_once()
+
+        forward_1.clean()
+        self.mock_popen.return_value.terminate.assert_not_called()
+        forward_2.clean()
+        self.mock_popen.return_value.terminate.assert_called_once()
+        self.assertEqual(self.port_allocator._reserved, {})
+
+        # new tunnel is created after the previous one was terminated
+        self.assertIsNot(self.registry.get_forward(self.controller_1), forward_1)
+
+    def test_clean_concurrently(self):
+        """Test shared ssh tunnel is terminated once if cleaned from executor."""
+        controllers = [
+            _create_controller(str(i), f"10.1.2.{i}:17070", "site-c") for i in range(20)
+        ]
+        self.registry.register(controllers)
+        forwards = [self.registry.get_forward(controller) for controller in controllers]
+        for forward in forwards:
+            forward.connect()
+
+        with ThreadPoolExecutor(max_workers=len(forwards)) as executor:
+            list(executor.map(lambda forward: forward.clean(), forwards))
+
+        self.mock_popen.return_value.terminate.assert_called_once()
+        self.assertEqual(self.registry._users, {})
+        self.assertEqual(self.port_allocator._reserved, {})
+
+    def test_get_forward_dead_tunnel(self):
+        """Test new tunnel is created if the shared one died."""
+        forward = self.registry.get_forward(self.controller_1)
+        forward.connect()
+        self.mock_popen.return_value.poll.return_value = 255  # ssh failed
+
+        new_forward = self.registry.get_forward(self.controller_2)
+
+        self.assertIsNot(new_forward.tunnel, forward.tunnel)
+
+    def test_get_forward_control_master_exited(self):
+        """Test tunnel is kept if ssh client exited after master was started."""
+        self.registry.register([self.controller_1], control_persist=60)
+        forward = self.registry.get_forward(self.controller_1)
+        with mock.patch(
+            "juju_spell.connections.network.JUJUSPELL_RUNTIME_DIR",
+            self.port_allocator.lock_dir,
+        ):
+            forward.connect()
+
+        forward.tunnel.process = self.mock_popen.return_value
+        forward.tunnel.process.poll.return_value = 0  # master in background
+
+        self.assertIs(self.registry.get_forward(self.controller_1), forward)
+        self.assertIs(
+            self.registry.get_forward(self.controller_2).tunnel, forward.tunnel
+        )
+        self.assertEqual(len(self.port_allocator._reserved), 2)
+
+        forward.tunnel.process.poll.return_value = 255  # master failed to start
+        self.assertIsNot(self.registry.get_forward(self.controller_1), forward)
+
+    def test_get_forward_control_master(self):
+        """Test tunnel is created through ssh master connection."""
+        from juju_spell.connections.network import (
+            SshControlMasterPortForward,
+            SshPortForwardSubprocess,
+        )
+
+        forward = self.registry.get_forward(self.controller_1)
+        self.assertNotIsInstance(forward.tunnel, SshControlMasterPortForward)
+
+        self.registry.register([self.controller_3], control_persist=60)
+        forward = self.registry.get_forward(self.controller_3)
+
+        self.assertIsInstance(forward.tunnel, SshControlMasterPortForward)
+        self.assertIsInstance(forward.tunnel, SshPortForwardSubprocess)
+        self.assertEqual(forward.tunnel.control_persist, 60)
+
+
+def _control_cmd(control_path, command, *args):
+    """Get ssh command controlling master connection."""
+    return mock.call(
+        "ssh",
+        "site-a",
+        "-S",
+        str(control_path),
+        "-O",
+        command,
+        *args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+
+def _control_process(returncode, stderr=b""):
+    """Get finished process of ssh control command."""
+    process = mock.MagicMock(returncode=returncode)
+    process.communicate = mock.AsyncMock(return_value=(None, stderr))
+    return process
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network._is_target_ready", return_value=True)
+@mock.patch("juju_spell.connections.network.subprocess.run")
+@mock.patch("juju_spell.connections.network.subprocess.Popen")
+@mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+async def test_ssh_control_master_port_forward(
+    mock_exec, mock_popen, mock_run, _, tmp_path
+):
+    """Test ssh port-forward through new master connection.
+
+    The ssh client exits with code 0 once the master is forked to background.
+    """
+    from juju_spell.connections.network import SshControlMasterPortForward
+
+    mock_exec.side_effect = [
+        _control_process(255),  # check: master is not running
+        _control_process(0),  # forward
+    ]
+    mock_popen.return_value.poll.side_effect = [None, 0, 0, 0, 0]
+    mock_popen.return_value.returncode = 0
+    with mock.patch("juju_spell.connections.network.JUJUSPELL_RUNTIME_DIR", tmp_path):
+        tunnel = SshControlMasterPortForward(
+            "localhost:1234", "10.1.1.99:17070", "site-a", ["bastion", "gateway"], 60
+        )
+        control_path = tunnel.control_path
+        tunnel.connect()
+        await tunnel.wait_ready(timeout=1)
+        assert tunnel.is_running()
+        tunnel.clean()
+
+    assert control_path.parent == tmp_path
+    assert (
+        tunnel.control_path
+        != SshControlMasterPortForward(
+            "localhost:1234", "10.1.1.99:17070", "site-a"
+        ).control_path
+    )
+    mock_popen.assert_called_once_with(
+        [
+            "ssh",
+            "site-a",
+            "-S",
+            str(control_path),
+            "-o",
+            "ControlMaster=yes",
+            "-o",
+            "ControlPersist=60",
+            "-f",
+            "-N",
+            "-J",
+            "bastion,gateway",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert mock_exec.call_args_list == [
+        _control_cmd(control_path, "check"),
+        _control_cmd(control_path, "forward", "-L", "localhost:1234:10.1.1.99:17070"),
+    ]
+    mock_run.assert_called_once_with(
+        [
+            "ssh",
+            "site-a",
+            "-S",
+            str(control_path),
+            "-O",
+            "cancel",
+            "-L",
+            "localhost:1234:10.1.1.99:17070",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=mock.ANY,
+        check=False,
+    )
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network._is_target_ready", return_value=True)
+@mock.patch("juju_spell.connections.network.subprocess.Popen")
+@mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+async def test_ssh_control_master_port_forward_running_master(
+    mock_exec, mock_popen, _, tmp_path
+):
+    """Test ssh port-forwards of controllers through running master connection."""
+    from juju_spell.connections.network import SshControlMasterPortForward
+
+    mock_exec.side_effect = lambda *args, **kwargs: _control_process(0)
+    with mock.patch("juju_spell.connections.network.JUJUSPELL_RUNTIME_DIR", tmp_path):
+        tunnel = SshControlMasterPortForward(
+            "localhost:1234", "10.1.1.99:17070", "site-a"
+        )
+        tunnel.add_forward("localhost:1235", "10.1.1.98:17070")
+        control_path = tunnel.control_path
+        tunnel.connect()
+        await asyncio.gather(
+            tunnel.wait_ready(timeout=1),
+            tunnel.wait_ready(timeout=1, local_target="localhost:1235"),
+        )
+
+    mock_popen.assert_not_called()
+    assert mock_exec.call_args_list == [
+        _control_cmd(control_path, "check"),
+        _control_cmd(control_path, "forward", "-L", "localhost:1234:10.1.1.99:17070"),
+        _control_cmd(control_path, "forward", "-L", "localhost:1235:10.1.1.98:17070"),
+        _control_cmd(control_path, "check"),  # forwards are added only once
+    ]
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network.subprocess.Popen")
+@mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+async def test_ssh_control_master_port_forward_failed(mock_exec, mock_popen, tmp_path):
+    """Test ssh port-forward fails with error of ssh."""
+    from juju_spell.connections.network import SshControlMasterPortForward
+    from juju_spell.exceptions import ConnectionProcessError
+
+    mock_exec.side_effect = [
+        _control_process(255),  # check: master is not running
+        _control_process(255, b"Port forwarding failed"),
+    ]
+    mock_popen.return_value.poll.return_value = 0
+    with mock.patch("juju_spell.connections.network.JUJUSPELL_RUNTIME_DIR", tmp_path):
+        tunnel = SshControlMasterPortForward(
+            "localhost:1234", "10.1.1.99:17070", "site-a"
+        )
+        tunnel.connect()
+        with pytest.raises(ConnectionProcessError, match="Port forwarding failed"):
+            await tunnel.wait_ready(timeout=1)
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network.subprocess.Popen")
+@mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+async def test_ssh_control_master_port_forward_exited(mock_exec, mock_popen, tmp_path):
+    """Test ssh port-forward fails if master connection could not be started."""
+    from juju_spell.connections.network import SshControlMasterPortForward
+    from juju_spell.exceptions import ConnectionProcessError
+
+    mock_exec.side_effect = [_control_process(255)]  # master is not running
+    mock_popen.return_value.poll.return_value = 255
+    mock_popen.return_value.returncode = 255
+    mock_popen.return_value.stderr.read.return_value = b"Permission denied"
+    with mock.patch("juju_spell.connections.network.JUJUSPELL_RUNTIME_DIR", tmp_path):
+        tunnel = SshControlMasterPortForward(
+            "localhost:1234", "10.1.1.99:17070", "site-a"
+        )
+        tunnel.connect()
+        with pytest.raises(ConnectionProcessError, match="Permission denied"):
+            await tunnel.wait_ready(timeout=1)
+
+    assert not tunnel.is_running()
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network.DEFAULT_TERMINATE_TIMEOUT", new=0.01)
+@mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+async def test_ssh_control_master_check_timeout(mock_exec):
+    """Test hung `ssh -O check` is killed and master is not running."""
+    from juju_spell.connections.network import SshControlMasterPortForward
+
+    async def _hung_communicate():
+        await asyncio.sleep(60)
+
+    process = mock_exec.return_value = _control_process(None)
+    process.communicate.side_effect = _hung_communicate
+    process.wait = mock.AsyncMock()
+    tunnel = SshControlMasterPortForward("localhost:1234", "10.1.1.99:17070", "site")
+
+    assert not await tunnel.is_master_running()
+    process.kill.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "local_target, exp_result",
+    [("localhost:1234", ("localhost", 1234)), ("1234", ("localhost", 1234))],
+)
+def test_split_local_target(local_target, exp_result):
+    """Test splitting local target to host and port."""
+    from juju_spell.connections.network import _split_local_target
+
+    assert _split_local_target(local_target) == exp_result
+
+
+@pytest.mark.asyncio
+async def test_ssh_port_forward_wait_ready():
+    """Test waiting for port-forward, which accepts connections."""
+    from juju_spell.connections.network import SshPortForwardSubprocess
+
+    server = await asyncio.start_server(lambda *_: None, "localhost", 0)
+    port = server.sockets[0].getsockname()[1]
+    tunnel = SshPortForwardSubprocess(f"localhost:{port}", "10.1.1.99:17070", "site")
+    tunnel.process = mock.MagicMock()
+    tunnel.process.poll.return_value = None
+
+    async with server:
+        await tunnel.wait_ready(timeout=1)
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network._is_target_ready", return_value=False)
+async def test_ssh_port_forward_wait_ready_exited(_):
+    """Test waiting for port-forward fails fast if ssh exited."""
+    from juju_spell.connections.network import SshPortForwardSubprocess
+    from juju_spell.exceptions import ConnectionProcessError
+
+    tunnel = SshPortForwardSubprocess("localhost:1234", "10.1.1.99:17070", "site")
+    tunnel.process = mock.MagicMock()
+    tunnel.process.poll.side_effect = [None, None, 255]
+    tunnel.process.returncode = 255
+    tunnel.process.stderr.read.return_value = b"ssh: Could not resolve hostname site"
+
+    with pytest.raises(ConnectionProcessError, match="Could not resolve hostname"):
+        await tunnel.wait_ready(timeout=10)
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.network._is_target_ready", return_value=False)
+async def test_shared_ssh_port_forward_wait_ready_timeout(_):
+    """Test waiting for port-forward, which was not ready in time."""
+    from juju_spell.connections.network import (
+        SharedSshPortForward,
+        SshPortForwardSubprocess,
+    )
+    from juju_spell.exceptions import ConnectionProcessError
+
+    tunnel = SshPortForwardSubprocess("localhost:1234", "10.1.1.99:17070", "site")
+    tunnel.process = mock.MagicMock()
+    tunnel.process.poll.return_value = None
+    forward = SharedSshPortForward(mock.MagicMock(), tunnel, "localhost:1235", 1235)
+
+    with pytest.raises(ConnectionProcessError, match="localhost:1235 was not ready"):
+        await forward.wait_ready(timeout=0.1)
@@ -0,0 +1,79 @@
+import json
+import os
+import stat
+from unittest import mock
+
+import pytest
+
+from juju_spell.cache import CachedModel, ModelsCache, write_private_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Return models cache in temporary directory."""
+    return ModelsCache(tmp_path / "models", ttl=60)
+
+
+def test_write_private_file(tmp_path):
+    """Test writing file readable only by the user."""
+    path = tmp_path / "cache" / "file"
+
+    write_private_file(path, b"data")
+
+    assert path.read_bytes() == b"data"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+    assert os.listdir(path.parent) == ["file"]  # no temporary file left
+
+
+def test_write_private_file_failed(tmp_path):
+    """Test writing file, which failed."""
+    path = tmp_path / "file"
+
+    with mock.patch("juju_spell.cache.os.replace", side_effect=OSError):
+        with pytest.raises(OSError):
+            write_private_file(path, b"data")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_models_cache(cache):
+    """Test storing models in cache."""
+    models = [CachedModel("model1", "uuid-1", "admin"), CachedModel("m2", "2", "u")]
+
+    assert cache.get("controller-uuid") is None
+
+    cache.set("controller-uuid", models)
+
+    assert cache.get("controller-uuid") == {"model1": models[0], "m2": models[1]}
+    assert cache.get("other-controller-uuid") is None
+
+
+def test_models_cache_expired(cache):
+    """Test getting expired models from cache."""
+    cache.set("controller-uuid", [CachedModel("model1", "uuid-1", "admin")])
+
+    with mock.patch("juju_spell.cache.time.time", return_value=1e12):
+        assert cache.get("controller-uuid") is None
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not json", "{}", json.dumps({"timestamp": 1e12, "models": [{"name": "a"}]})],
+)
+def test_models_cache_invalid(cache, content):
+    """Test getting models from invalid cache file."""
+    cache.cache_dir.mkdir(parents=True)
+    (cache.cache_dir / "controller-uuid.json").write_text(content)
+
+    assert cache.get("controller-uuid") is None
+
+
+def test_models_cache_invalidate(cache):
+    """Test invalidating models cache."""
+    cache.set("controller-uuid", [CachedModel("model1", "uuid-1", "admin")])
+
+    cache.invalidate("controller-uuid")
+    cache.invalidate("controller-uuid")  # nothing happens if cache does not exist
+
+    assert cache.get("controller-uuid") is None
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from unittest import mock
 
 import pytest
@@ -18,7 +20,7 @@ from juju_spell.settings import APP_NAME, APP_VERSION, CONFIG_PATH, PERSONAL_CON
 )
 @mock.patch("juju_spell.cmd.sys")
 @mock.patch("juju_spell.cmd.emit")
-@mock.patch("juju_spell.cmd.load_config")
+@mock.patch("juju_spell.config.load_config")
 def test_run_dispatcher(mock_load_config, mock_emit, mock_sys, cli_args):
     """Test run dispatcher."""
     mock_sys.argv = ["juju-spell", *cli_args]
@@ -46,3 +48,18 @@ def test_run_dispatcher(mock_load_config, mock_emit, mock_sys, cli_args):
 
         dispatcher.load_command.assert_called_once_with(mock_load_config.return_value)
         dispatcher.run.assert_called_once()
+
+
+def test_get_command_groups_lazy():
+    """Test that building the dispatcher does not import commands."""
+    code = (
+        "import sys; from craft_cli import Dispatcher; "
+        "from juju_spell.cmd import get_command_groups; "
+        "Dispatcher('juju-spell', get_command_groups()); "
+        "print(' '.join(sorted(sys.modules)))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    modules = output.split()
+
+    for module in ["juju", "confuse", "juju_spell.config", "juju_spell.cli.base"]:
+        assert module not in modules
@@ -13,14 +13,23 @@ from juju_spell.config import (
     SUBNET_REGEX,
     UUID_REGEX,
     Config,
+    Controller,
     String,
+    _get_config_hash,
+    _load_compiled_config,
+    _store_compiled_config,
     _validate_config,
+    get_index_values,
     load_config,
     load_config_file,
     merge_configs,
 )
 from juju_spell.exceptions import JujuSpellError
-from tests.unit.conftest import TEST_CONFIG, TEST_PERSONAL_CONFIG
+from tests.unit.conftest import (
+    TEST_COMPLETE_CONFIG,
+    TEST_CONFIG,
+    TEST_PERSONAL_CONFIG,
+)
 
 
 @pytest.mark.parametrize(
@@ -110,6 +119,21 @@ def _update_test_config(
                 },  # controller 1
             ],
         ),
+        (
+            {},  # extra configuration
+            {"max-parallel": 10},  # connection
+            [],
+        ),
+        (
+            {"connection": {"max-parallel": 50}},  # extra configuration
+            {"max-parallel": 50},  # connection
+            [],
+        ),
+        (
+            {"connection": {"ssh-control-persist": 600}},  # extra configuration
+            {"ssh-control-persist": 600},  # connection
+            [],
+        ),
         (
             {"connection": {"port-range": "18000:1900"}},  # extra configuration
             {"port-range": range(18000, 1900)},  # connection
@@ -180,6 +204,9 @@ def test_validate_config(
     [
         {"connection": {"port-range": "17070"}},
         {"connection": {"port-range": "1:100000"}},
+        {"connection": {"max-parallel": 0}},
+        {"connection": {"max-parallel": "many"}},
+        {"connection": {"ssh-control-persist": -1}},
         {"controllers": [{"name": 1}]},
         {"controllers": [{"customer": None}]},
         {"controllers": [{"owner": None}]},
@@ -330,3 +357,138 @@ def test_load_config(
     mock_merge_configs.assert_called_once_with(exp_config, exp_config)
     mock_validate_config.assert_called_once_with(mock_merge_configs.return_value)
     assert config == mock_validate_config.return_value
+
+
+def test_get_config_hash(tmp_path):
+    """Test hash of config files content."""
+    config_path, personal_config_path = tmp_path / "a.yaml", tmp_path / "b.yaml"
+    config_path.write_text("a: 1")
+    personal_config_path.write_text("b: 2")
+
+    config_hash = _get_config_hash([config_path, personal_config_path])
+
+    assert config_hash == _get_config_hash([config_path, personal_config_path])
+    assert config_hash != _get_config_hash([config_path])
+    personal_config_path.write_text("b: 3")
+    assert config_hash != _get_config_hash([config_path, personal_config_path])
+    assert _get_config_hash([tmp_path / "missing.yaml"]) is None
+
+
+def test_load_config_compiled(tmp_path, config_cache_path):
+    """Test loading compiled config if config files did not change."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(TEST_COMPLETE_CONFIG)
+
+    config = load_config(config_path)
+
+    assert config_cache_path.stat().st_mode & 0o777 == 0o600
+    with mock.patch("juju_spell.config._validate_config") as mock_validate_config:
+        compiled_config = load_config(config_path)
+        assert compiled_config == config
+        assert compiled_config._is_indexed()  # indexes were stored too
+        mock_validate_config.assert_not_called()
+
+        # config is validated again after change
+        config_path.write_text(TEST_COMPLETE_CONFIG + "\n")
+        assert load_config(config_path) == mock_validate_config.return_value
+        mock_validate_config.assert_called_once()
+
+
+def test_load_compiled_config(config_cache_path, test_config):
+    """Test loading compiled config."""
+    _store_compiled_config("hash", test_config)
+
+    assert _load_compiled_config("hash") == test_config
+    assert _load_compiled_config("other-hash") is None
+
+
+@pytest.mark.parametrize("content", [b"", b"invalid pickle", b"\x80\x05N."])
+def test_load_compiled_config_invalid(config_cache_path, content):
+    """Test loading invalid compiled config."""
+    config_cache_path.parent.mkdir(parents=True)
+    config_cache_path.write_bytes(content)
+
+    assert _load_compiled_config("hash") is None
+
+
+def test_load_compiled_config_not_owned(config_cache_path, test_config):
+    """Test loading compiled config not owned by user."""
+    _store_compiled_config("hash", test_config)
+
+    with mock.patch("juju_spell.config.os.getuid", return_value=12345):
+        assert _load_compiled_config("hash") is None
+
+
+def test_load_compiled_config_missing(config_cache_path):
+    """Test loading compiled config, which does not exist."""
+    assert _load_compiled_config("hash") is None
+
+
+def test_store_compiled_config_failed(config_cache_path):
+    """Test storing config, which could not be pickled."""
+    _store_compiled_config("hash", mock.MagicMock())
+
+    assert not config_cache_path.exists()
+
+
+@pytest.mark.parametrize(
+    "value, exp_values",
+    [
+        (None, set()),
+        ("", set()),
+        ([], set()),
+        ("a", {"a"}),
+        (["a", "b"], {"a", "b"}),
+        (3, {"3"}),
+    ],
+)
+def test_get_index_values(value, exp_values):
+    """Test getting values of controller attribute stored in index."""
+    assert get_index_values(value) == exp_values
+
+
+def _get_controller(name, customer, tags=None, risk=5):
+    """Get controller for index tests."""
+    return Controller(
+        uuid=f"uuid-{name}",
+        name=name,
+        customer=customer,
+        owner="owner",
+        endpoint="localhost:17070",
+        ca_cert="",
+        user="admin",
+        password="pwd",
+        model_mapping={},
+        tags=tags,
+        risk=risk,
+    )
+
+
+def test_config_get_index():
+    """Test building inverted indexes of controllers."""
+    config = Config(
+        controllers=[
+            _get_controller("a", "customer-1", ["prod", "eu"], risk=1),
+            _get_controller("b", "customer-2", ["prod"]),
+            _get_controller("c", "customer-1"),
+        ]
+    )
+
+    assert config.get_index("customer") == {"customer-1": [0, 2], "customer-2": [1]}
+    assert config.get_index("tags") == {"prod": [0, 1], "eu": [0]}
+    assert config.get_index("risk") == {"1": [0], "5": [1, 2]}
+    assert config.get_index("uuid") == {"uuid-a": [0], "uuid-b": [1], "uuid-c": [2]}
+    with pytest.raises(KeyError):
+        config.get_index("password")
+
+
+def test_config_get_index_rebuild():
+    """Test building indexes again if controllers changed."""
+    config = Config(controllers=[_get_controller("a", "customer-1")])
+    assert config.get_index("name") == {"a": [0]}
+
+    config.controllers.append(_get_controller("b", "customer-1"))
+    assert config.get_index("name") == {"a": [0], "b": [1]}
+
+    config.controllers = [_get_controller("c", "customer-1")]
+    assert config.get_index("name") == {"c": [0]}
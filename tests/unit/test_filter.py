@@ -1,9 +1,15 @@
 """Test for filter."""
+from unittest import mock
 
 import pytest
 
 from juju_spell.config import Config, Controller
-from juju_spell.filter import get_filtered_config, make_controllers_filter
+from juju_spell.filter import (
+    Condition,
+    get_filtered_config,
+    make_controllers_filter,
+    parse_filter_expression,
+)
 
 
 @pytest.mark.parametrize(
@@ -364,3 +370,126 @@ def test_get_filtered_config(filter_expression, controllers, result_controllers)
     original_config = Config(controllers=controllers)
     config = get_filtered_config(original_config, filter_expression)
     assert config == Config(controllers=result_controllers)
+
+
+def test_parse_filter_expression():
+    """Test parsing filter expression."""
+    conditions = parse_filter_expression(
+        "name=a,b customer!=Big Corp tags&=d,e,d risk<=3 owner=x*"
+    )
+
+    assert conditions == [
+        Condition("name", "=", frozenset({"a", "b"})),
+        Condition("customer", "!=", frozenset({"Big Corp"})),
+        Condition("tags", "&=", frozenset({"d", "e"})),
+        Condition("risk", "<=", frozenset({"3"})),
+        Condition("owner", "=", frozenset({"x*"})),
+    ]
+    assert [condition.has_globs for condition in conditions] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+@pytest.mark.parametrize(
+    "filter_expression",
+    ["1=2", "name", "name<=3", "risk<=a", "risk>1,2", "customer&=a", "a b=1"],
+)
+def test_parse_filter_expression_invalid(filter_expression):
+    """Test parsing invalid filter expression."""
+    with pytest.raises(ValueError):
+        parse_filter_expression(filter_expression)
+
+
+@pytest.mark.parametrize(
+    "filter_expression, exp_match",
+    [
+        ("name=controller-a,controller-b", True),
+        ("name=controller-b", False),
+        ("tags=x,b", True),
+        ("tags=x,y", False),
+        ("description=notes", False),  # attribute is not set
+        ("unknown=value", False),  # controller has no such attribute
+        ("name=controller-a tags=x", False),
+        ("name!=controller-b", True),
+        ("name!=controller-*", False),
+        ("name=contr*-[ab]", True),
+        ("customer=*-b", False),
+        ("tags!=x,y", True),
+        ("tags!=a", False),
+        ("description!=notes", True),  # attribute is not set
+        ("tags&=a,b", True),
+        ("tags&=a,x", False),
+        ("tags&=a,b*", True),
+        ("risk<=3", True),
+        ("risk<3", False),
+        ("risk>=3", True),
+        ("risk>2 risk<4", True),
+        ("risk>3", False),
+        ("risk=3", True),
+        ("risk=4,5", False),
+    ],
+)
+def test_make_controller_filter_attributes(filter_expression, exp_match):
+    """Test filtering controller by its attributes without copying it."""
+    controller = Controller(
+        uuid="fc51ceb1-1fec-41b7-a7b0-5f7eee6d06dc",
+        name="controller-a",
+        customer="customer-a",
+        owner="owner-a",
+        endpoint="localhost:17070",
+        ca_cert="",
+        user="admin",
+        password="pwd",
+        model_mapping={},
+        tags=["a", "b"],
+        risk=3,
+    )
+    controller_filter = make_controllers_filter(filter_expression)
+
+    with mock.patch("dataclasses.asdict") as mock_asdict:
+        assert controller_filter(controller) is exp_match
+
+    mock_asdict.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "filter_expression, exp_names",
+    [
+        ("customer=customer-a,customer-c", ["controller-0", "controller-2"]),
+        ("customer=customer-a,customer-b tags=prod", ["controller-0", "controller-1"]),
+        ("tags=prod risk=2,3", ["controller-1"]),
+        ("name=controller-2 owner=owner-a", ["controller-2"]),
+        ("uuid=uuid-0,uuid-1 endpoint=localhost:17071", ["controller-1"]),
+        ("endpoint=localhost:17070,localhost:17072", ["controller-0", "controller-2"]),
+        ("tags&=prod,eu", ["controller-0"]),
+        ("tags!=eu risk<3", ["controller-1"]),
+        ("name=*-[12] customer!=customer-b", ["controller-2"]),
+    ],
+)
+def test_get_filtered_config_indexes(filter_expression, exp_names):
+    """Test filtering config with indexed and not indexed keys."""
+    controllers = [
+        Controller(
+            uuid=f"uuid-{i}",
+            name=f"controller-{i}",
+            customer=f"customer-{'abc'[i]}",
+            owner="owner-a",
+            endpoint=f"localhost:1707{i}",
+            ca_cert="",
+            user="admin",
+            password="pwd",
+            model_mapping={},
+            tags=tags,
+            risk=i + 1,
+        )
+        for i, tags in enumerate([["prod", "eu"], ["prod"], None])
+    ]
+    config = Config(controllers=controllers)
+
+    config = get_filtered_config(config, filter_expression)
+
+    assert [controller.name for controller in config.controllers] == exp_names
@@ -0,0 +1,57 @@
+import dataclasses
+from unittest import mock
+
+import pytest
+
+from juju_spell.utils import Preview
+
+
+@dataclasses.dataclass
+class Item:
+    name: str
+    values: list
+
+
+@pytest.mark.parametrize(
+    "obj, exp_text",
+    [
+        ("text", "text"),
+        ({"a": 1, "b": [1, 2]}, "{'a': 1, 'b': [1, 2]}"),
+        (Item("a", [1]), "Item({'name': 'a', 'values': [1]})"),
+        (list(range(20)), "[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...]"),
+        (
+            {i: i for i in range(20, 0, -1)},
+            (
+                "{20: 20, 19: 19, 18: 18, 17: 17, 16: 16, 15: 15, 14: 14, 13: 13, 12:"
+                " 12, 11: 11, ...}"
+            ),
+        ),
+        ([[[[["deep"]]]]], "[[[[[...]]]]]"),
+    ],
+)
+def test_preview(obj, exp_text):
+    """Test preview of object."""
+    assert str(Preview(obj)) == exp_text
+
+
+@pytest.mark.parametrize("obj", ["x" * 100, [Item("x" * 50, [])] * 10])
+def test_preview_truncated(obj):
+    """Test preview truncated to size."""
+    text = str(Preview(obj, size=20))
+
+    assert len(text) == 20 + len("...<truncated>")
+    assert text.endswith("...<truncated>")
+
+
+def test_preview_lazy():
+    """Test that preview is rendered only when it's formatted."""
+    obj = mock.MagicMock(spec=["__dict__"])
+
+    with mock.patch("juju_spell.utils._preview_repr") as mock_preview_repr:
+        mock_preview_repr.repr.return_value = "preview"
+        preview = Preview(obj)
+        mock_preview_repr.repr.assert_not_called()
+
+        assert str(preview) == "preview"
+
+    mock_preview_repr.repr.assert_called_once_with(obj)
@@ -0,0 +1,117 @@
+import pytest
+from juju.client._definitions import (
+    ApplicationStatus,
+    DetailedStatus,
+    FullStatus,
+    UnitStatus,
+)
+
+from juju_spell.commands.base import ModelSummary
+from juju_spell.projection import compile_projection, parse_fields_expression
+
+
+@pytest.fixture
+def status():
+    """Return juju status with two units."""
+    return FullStatus(
+        applications={
+            "app": ApplicationStatus(
+                charm="cs:app",
+                units={
+                    f"app/{i}": UnitStatus(
+                        machine=str(i),
+                        workload_status=DetailedStatus(status="active", info="ready"),
+                    )
+                    for i in range(2)
+                },
+            )
+        },
+        model={"name": "test"},
+    )
+
+
+@pytest.mark.parametrize(
+    "fields_expression, exp_paths",
+    [
+        ("a", [("a",)]),
+        ("a.*.b, c", [("a", "*", "b"), ("c",)]),
+        ("workload_status.status", [("workload_status", "status")]),
+    ],
+)
+def test_parse_fields_expression(fields_expression, exp_paths):
+    """Test parsing fields expression."""
+    assert parse_fields_expression(fields_expression) == exp_paths
+
+
+@pytest.mark.parametrize("fields_expression", ["", "a,", "a..b", ".a", "a b"])
+def test_parse_fields_expression_exception(fields_expression):
+    """Test parsing invalid fields expression."""
+    with pytest.raises(ValueError):
+        parse_fields_expression(fields_expression)
+
+
+def test_compile_projection(status):
+    """Test projecting juju status to fields of units."""
+    projection = compile_projection(
+        "applications.*.units.*.workload_status.status,"
+        "applications.*.units.*.machine,model.name,missing"
+    )
+
+    assert projection(status) == {
+        "applications": {
+            "app": {
+                "units": {
+                    "app/0": {"machine": "0", "workload_status": {"status": "active"}},
+                    "app/1": {"machine": "1", "workload_status": {"status": "active"}},
+                }
+            }
+        },
+        "model": {"name": "test"},
+    }
+
+
+def test_compile_projection_cached():
+    """Test fields expression is compiled only once."""
+    assert compile_projection("a.b") is compile_projection("a.b")
+
+
+def test_compile_projection_whole_value(status):
+    """Test the whole value is selected by shorter path."""
+    projection = compile_projection("applications.app,applications.app.charm")
+
+    assert projection(status) == {"applications": {"app": status.applications["app"]}}
+
+
+def test_compile_projection_wildcard_and_name(status):
+    """Test the fields selected by name are also selected by wildcard."""
+    projection = compile_projection(
+        "applications.*.charm,applications.app.units.app/1.machine"
+    )
+
+    assert projection(status) == {
+        "applications": {
+            "app": {"charm": "cs:app", "units": {"app/1": {"machine": "1"}}}
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "output, exp_output",
+    [
+        (
+            [ModelSummary("a", "1"), ModelSummary("b", "2")],
+            [{"name": "a"}, {"name": "b"}],
+        ),
+        ({"a": {"name": "a"}, "b": None}, {"a": {"name": "a"}}),
+        ("accessible", None),
+        ({"name": None}, {"name": None}),
+        ({"other": {"uuid": "1"}}, None),
+        ({"a": {"name": "a"}, "b": {"uuid": "1"}}, {"a": {"name": "a"}}),
+        ([{"uuid": "1"}], None),
+        ([], []),
+        ({}, {}),
+    ],
+)
+def test_compile_projection_outputs(output, exp_output):
+    """Test projecting lists, dataclasses and primitive outputs."""
+    assert compile_projection("*.name,name")(output) == exp_output
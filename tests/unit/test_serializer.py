@@ -0,0 +1,102 @@
+import json
+from argparse import Namespace
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pytest
+from juju.client._definitions import ApplicationStatus, FullStatus, UnitStatus
+
+from juju_spell.serializer import _default, dumps, to_primitive
+
+
+@dataclass
+class Summary:
+    name: str
+    tags: Optional[List[str]] = None
+    count: int = 0
+
+
+@pytest.fixture
+def status():
+    """Return juju status with single application."""
+    return FullStatus(
+        applications={
+            "app": ApplicationStatus(
+                charm="cs:app", units={"app/0": UnitStatus(machine="0")}
+            )
+        },
+        model={"name": "test"},
+    )
+
+
+@pytest.mark.parametrize(
+    "obj, exp_result",
+    [
+        (ValueError("wrong value"), "ValueError: wrong value"),
+        (Namespace(a=1), {"a": 1}),
+        ({1, 2}, "{1, 2}"),
+    ],
+)
+def test_default(obj, exp_result):
+    """Test serialization of objects, which are not juju type or dataclass."""
+    assert _default(obj) == exp_result
+
+
+def test_to_primitive(status):
+    """Test converting juju type to primitive types."""
+    result = to_primitive([{"output": status}])
+
+    assert result == json.loads(json.dumps([{"output": status}], default=vars))
+    assert result[0]["output"]["unknown_fields"] == {}
+
+
+def test_to_primitive_drop_empty_and_unknown(status):
+    """Test converting juju type without empty and unknown fields."""
+    result = to_primitive(status, drop_empty=True, drop_unknown=True)
+
+    assert result == {
+        "applications": {
+            "app": {"charm": "cs:app", "units": {"app/0": {"machine": "0"}}}
+        },
+        "model": {"name": "test"},
+    }
+
+
+@pytest.mark.parametrize("drop_empty", [True, False])
+@pytest.mark.parametrize("drop_unknown", [True, False])
+def test_to_primitive_extra_attributes(status, drop_empty, drop_unknown):
+    """Test attributes set on juju type, which are not its fields, are kept."""
+    status.storage = [{"storage_tag": "storage-data-0"}]
+
+    result = to_primitive(status, drop_empty, drop_unknown)
+
+    assert result["storage"] == [{"storage_tag": "storage-data-0"}]
+    assert list(result)[-1] == "storage"
+
+
+def test_to_primitive_dataclass():
+    """Test converting dataclass, False and zero values are not empty."""
+    summary = Summary("test", tags=[])
+
+    assert to_primitive((summary,)) == [{"name": "test", "tags": [], "count": 0}]
+    assert to_primitive(summary, drop_empty=True) == {"name": "test", "count": 0}
+
+
+def test_to_primitive_exception():
+    """Test converting exception to its message."""
+    assert to_primitive({"error": KeyError("test")}) == {"error": "KeyError: 'test'"}
+
+
+@pytest.mark.parametrize("drop_empty", [True, False])
+@pytest.mark.parametrize("drop_unknown", [True, False])
+def test_dumps(status, drop_empty, drop_unknown):
+    """Test compact and indented output are the same."""
+    data = [{"context": {"name": "test"}, "output": status, "error": None}]
+    exp_result = to_primitive(data, drop_empty, drop_unknown)
+
+    indented = dumps(data, drop_empty=drop_empty, drop_unknown=drop_unknown)
+    compact = dumps(data, True, drop_empty=drop_empty, drop_unknown=drop_unknown)
+
+    assert json.loads(indented) == json.loads(compact) == exp_result
+    assert indented == json.dumps(exp_result, indent=1)
+    assert "\n" not in compact
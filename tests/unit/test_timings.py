@@ -0,0 +1,67 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from juju_spell.timings import percentile, start_timings, summarize, timed
+
+
+def test_timed():
+    """Test measuring phases to current timings."""
+    timings = start_timings()
+
+    with mock.patch("juju_spell.timings.time.perf_counter", side_effect=[1, 1.5]):
+        with timed("connect"):
+            pass
+
+    with mock.patch("juju_spell.timings.time.perf_counter", side_effect=[2, 2.25]):
+        with pytest.raises(ValueError):
+            with timed("connect"):  # failed attempt is measured too
+                raise ValueError
+
+    assert timings == {"connect": 0.75}
+
+
+@pytest.mark.asyncio
+async def test_timed_tasks():
+    """Test each task measures phases to its own timings."""
+
+    async def _run(phases):
+        timings = start_timings()
+        for phase in phases:
+            with timed(phase):
+                await asyncio.sleep(0)
+
+        return timings
+
+    results = await asyncio.gather(_run(["a", "b"]), _run(["c"]))
+
+    assert [set(timings) for timings in results] == [{"a", "b"}, {"c"}]
+
+
+@pytest.mark.parametrize("percent, exp_value", [(0, 1), (50, 5), (95, 10), (100, 10)])
+def test_percentile(percent, exp_value):
+    """Test percentile by nearest-rank method."""
+    assert percentile(list(range(1, 11)), percent) == exp_value
+
+
+def test_summarize():
+    """Test summary of timings of controllers."""
+    timings = [
+        (f"controller-{i}", {"connect": i / 10, "execute": 1.0, "total": i / 10 + 1})
+        for i in range(1, 11)
+    ]
+    timings.append(("controller-failed", {"tunnel": 5.0, "total": 5.0}))
+
+    lines = summarize(timings, slowest=2)
+
+    assert lines == [
+        "phase                 p50      p95      max",
+        "tunnel              5.000    5.000    5.000",
+        "connect             0.500    1.000    1.000",
+        "execute             1.000    1.000    1.000",
+        "total               1.600    5.000    5.000",
+        "slowest controllers (total time in seconds):",
+        "  controller-failed: 5.000",
+        "  controller-10: 2.000",
+    ]